@@ -0,0 +1,171 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, time
+from decimal import Decimal
+from uuid import UUID
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-пагинация: следующая страница выбирается условием по ключу сортировки
+    последней строки (WHERE (key, id) < (...)), а не OFFSET, поэтому страница N
+    стоит столько же, сколько первая.
+
+    Ключ - order_by() queryset, в конец добавляется id для уникальности.
+    Курсор - base64 от значений ключа и направления; в ответе next/previous.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    invalid_cursor_message = 'Неверный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        values, reverse = self.decode_cursor(request)
+        queryset = queryset.order_by(*(self._invert(self.ordering) if reverse else self.ordering))
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = has_more if not reverse else True
+        has_previous = values is not None if not reverse else has_more
+
+        self.next_values = self._key(rows[-1]) if rows and has_next else None
+        self.previous_values = self._key(rows[0]) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_link(self.next_values, reverse=False),
+            'previous': self.get_link(self.previous_values, reverse=True),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError, TypeError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def get_ordering(self, queryset) -> tuple:
+        ordering = []
+        for field in queryset.query.order_by or queryset.model._meta.ordering:
+            if isinstance(field, str) and field.lstrip('-') not in {f.lstrip('-') for f in ordering}:
+                ordering.append(field)
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append('-id' if descending else 'id')
+        return tuple(ordering)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            values, reverse = data['v'], bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, values, reverse: bool) -> str:
+        data = {'v': values, 'r': 1} if reverse else {'v': values}
+        return urlsafe_b64encode(json.dumps(data, default=_cursor_value).encode('utf-8')).decode('ascii')
+
+    def get_link(self, values, reverse: bool):
+        if values is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values, reverse))
+
+    def _key(self, row) -> list:
+        fields = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[field] for field in fields]
+        return [getattr(row, field) for field in fields]
+
+    def _after(self, values, reverse: bool) -> Q:
+        """(a, b, id) после курсора: a > x OR (a = x AND b > y) OR ... с учётом направлений."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            condition |= equal & Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _invert(ordering) -> tuple:
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+def _cursor_value(value):
+    # Полная точность: DjangoJSONEncoder обрезает микросекунды, и равенство по ключу не сработает
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f"Unsupported cursor value: {value!r}")
+
+
+class PageNumberOrKeysetPagination(PageNumberPagination):
+    """
+    Номерная пагинация (?page=N) по умолчанию, как раньше;
+    ?pagination=cursor или ?cursor=... - keyset-пагинация без OFFSET.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    @classmethod
+    def is_keyset_requested(cls, request) -> bool:
+        return (
+            request.query_params.get(cls.mode_query_param) == 'cursor'
+            or cls.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.is_keyset_requested(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
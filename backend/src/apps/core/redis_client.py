@@ -0,0 +1,26 @@
+from typing import Optional
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def get_redis_client() -> Optional["redis.Redis"]:
+    """
+    Клиент Redis из бэкенда кэша Django.
+
+    Нужен для структур, которых нет в cache API (sorted set, hash).
+    Возвращает None, если кэш работает не через Redis (тесты, LocMemCache) -
+    вызывающий код должен иметь запасной путь через БД.
+    """
+    backend = getattr(cache, '_cache', None)
+    get_client = getattr(backend, 'get_client', None)
+    if get_client is None:
+        return None
+
+    try:
+        return get_client(write=True)
+    except Exception as e:
+        logger.warning(f"Redis client is unavailable: {e}")
+        return None
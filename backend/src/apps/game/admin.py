@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import GameSession, GameRound, PlayerAnswer, PlayerGameStats
+from .models import GameSession, GameRound, PlayerAnswer, PlayerGameStats, DeadLetterEvent, OutboxEvent
 
 
 @admin.register(GameSession)
@@ -133,3 +133,18 @@ class PlayerGameStatsAdmin(admin.ModelAdmin):
             "classes": ("collapse",)
         }),
     )
+
+
+@admin.register(DeadLetterEvent)
+class DeadLetterEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "event_type", "handler", "attempts", "created_at")
+    list_filter = ("event_type", "handler")
+    readonly_fields = ("handler", "event_type", "payload", "error", "attempts", "created_at")
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "event_type", "idempotency_key", "attempts", "created_at", "processed_at")
+    list_filter = ("event_type",)
+    search_fields = ("idempotency_key",)
+    readonly_fields = ("event_type", "payload", "idempotency_key", "attempts", "last_error", "created_at", "processed_at")
@@ -1,96 +1,99 @@
 import logging
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
 
 from apps.game.domain.events import (
     QuestionAnsweredEvent,
     GameStartedEvent,
     GameFinishedEvent,
     RoundCompletedEvent,
+    PlayerJoinedGameEvent,
+    PlayerLeftGameEvent,
 )
-from apps.game.infrastructure.event_bus import EventHandler
+from apps.game.infrastructure.event_bus import BatchEventHandler, EventHandler
+from apps.game.infrastructure.redis_game_state_repository import game_state_repository
 from apps.game.models import PlayerGameStats, GameSession
 from apps.users.models import User, GameHistory
 
 logger = logging.getLogger(__name__)
 
 
-class UpdatePlayerStatsOnAnswerHandler(EventHandler):
+class UpdatePlayerStatsOnAnswerHandler(BatchEventHandler):
     """
     Обработчик: обновление статистики игрока при ответе на вопрос.
+
+    Ответы пачки суммируются по (сессия, игрок) и применяются
+    одним UPDATE через F() - без чтения строк и потери инкрементов.
     """
 
-    def handle(self, event: QuestionAnsweredEvent) -> None:
+    def handle_batch(self, events: List[QuestionAnsweredEvent]) -> None:
         """
-        Обновить статистику игрока.
+        Обновить статистику игроков.
         """
-        try:
-            stats = PlayerGameStats.objects.get(
-                session_id=event.session_id,
-                user_id=event.user_id
-            )
-
-            # Обновление счётчиков
-            if event.is_correct:
-                stats.correct_answers += 1
-            else:
-                stats.wrong_answers += 1
-
-            # Обновление очков
-            stats.total_points += event.points_earned
-
-            stats.save(update_fields=['total_points', 'correct_answers', 'wrong_answers'])
-
-            logger.info(
-                f"Updated stats for user {event.user_id} in session {event.session_id}: "
-                f"+{event.points_earned} points (total: {stats.total_points})"
+        deltas = defaultdict(lambda: {'total_points': 0, 'correct_answers': 0, 'wrong_answers': 0})
+        for event in events:
+            delta = deltas[(event.session_id, event.user_id)]
+            delta['total_points'] += event.points_earned
+            delta['correct_answers' if event.is_correct else 'wrong_answers'] += 1
+
+        keys = Q()
+        for session_id, user_id in deltas:
+            keys |= Q(session_id=session_id, user_id=user_id)
+
+        updated = PlayerGameStats.objects.filter(keys).update(**{
+            field: F(field) + _delta_case(
+                {Q(session_id=session_id, user_id=user_id): delta[field]
+                 for (session_id, user_id), delta in deltas.items()}
             )
+            for field in ('total_points', 'correct_answers', 'wrong_answers')
+        })
 
-        except PlayerGameStats.DoesNotExist:
-            logger.error(
-                f"PlayerGameStats not found for user {event.user_id} "
-                f"in session {event.session_id}"
-            )
-        except Exception as e:
+        if updated < len(deltas):
             logger.error(
-                f"Error updating player stats: {e}",
-                exc_info=True
+                f"PlayerGameStats not found for {len(deltas) - updated} of {len(deltas)} players"
             )
 
+        logger.info(f"Updated stats for {updated} players from {len(events)} answers")
 
-class UpdateGlobalUserStatsOnAnswerHandler(EventHandler):
+
+class UpdateGlobalUserStatsOnAnswerHandler(BatchEventHandler):
     """
     Обработчик: обновление глобальной статистики пользователя.
     """
 
-    def handle(self, event: QuestionAnsweredEvent) -> None:
+    def handle_batch(self, events: List[QuestionAnsweredEvent]) -> None:
         """
-        Обновить глобальную статистику пользователя.
+        Добавить очки пачки к общему счёту пользователей одним UPDATE.
         """
-        try:
-            user = User.objects.get(id=event.user_id)
+        points = defaultdict(int)
+        for event in events:
+            points[event.user_id] += event.points_earned
+
+        # Как User.add_points: счёт не опускается ниже нуля
+        updated = User.objects.filter(id__in=points).update(
+            total_points=Greatest(
+                F('total_points') + _delta_case({Q(id=user_id): delta for user_id, delta in points.items()}),
+                Value(0)
+            )
+        )
 
-            # Добавляем очки к общему счёту пользователя
-            user.add_points(event.points_earned)
-            user.save(update_fields=['total_points'])
+        if updated < len(points):
+            logger.error(f"{len(points) - updated} of {len(points)} users not found")
 
-            logger.info(
-                f"Updated global stats for user {event.user_id}: "
-                f"+{event.points_earned} points (total: {user.total_points})"
-            )
+        logger.info(f"Updated global stats for {updated} users from {len(events)} answers")
 
-        except User.DoesNotExist:
-            logger.error(f"User {event.user_id} not found")
-        except Exception as e:
-            logger.error(
-                f"Error updating global user stats: {e}",
-                exc_info=True
-            )
 
-    def can_handle_async(self) -> bool:
-        """
-        Этот обработчик может быть асинхронным.
-        """
-        return True
+def _delta_case(deltas: Dict[Q, int]) -> Case:
+    """CASE WHEN <ключ> THEN <приращение> ... ELSE 0."""
+    return Case(
+        *[When(condition, then=Value(delta)) for condition, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField()
+    )
 
 
 class SaveGameHistoryOnFinishHandler(EventHandler):
@@ -103,64 +106,84 @@ class SaveGameHistoryOnFinishHandler(EventHandler):
         Сохранить игру в историю.
         """
         try:
-            session = GameSession.objects.get(id=event.session_id)
-
-            # Получаем статистику всех игроков
-            player_stats = PlayerGameStats.objects.filter(
-                session_id=event.session_id
-            ).select_related('user')
-
-            # Определяем места игроков (ранжирование по очкам)
-            sorted_stats = sorted(
-                player_stats,
-                key=lambda s: s.total_points,
-                reverse=True
-            )
-
-            # Назначаем ранги
-            for rank, stats in enumerate(sorted_stats, start=1):
-                stats.rank = rank
-                stats.finalize()
-                stats.save(update_fields=['rank', 'completed_at'])
-
-            # Сохраняем в историю для каждого игрока
-            for stats in player_stats:
-                GameHistory.objects.create(
-                    user=stats.user,
-                    session=session,
-                    room=session.room,
-                    quiz=session.quiz,
-                    final_points=stats.total_points,
-                    correct_answers=stats.correct_answers,
-                    total_questions=stats.correct_answers + stats.wrong_answers,
-                    final_rank=stats.rank
+            # Одна транзакция: повтор после сбоя не создаст дубли истории
+            with transaction.atomic():
+                session = GameSession.objects.get(id=event.session_id)
+
+                # Получаем статистику всех игроков
+                player_stats = PlayerGameStats.objects.filter(
+                    session_id=event.session_id
+                ).select_related('user')
+
+                # Определяем места игроков (ранжирование по очкам)
+                sorted_stats = sorted(
+                    player_stats,
+                    key=lambda s: s.total_points,
+                    reverse=True
                 )
 
-                logger.info(
-                    f"Saved game history for user {stats.user_id}: "
-                    f"rank {stats.rank}, {stats.total_points} points"
-                )
-
-            # Обновляем счётчик побед у победителя
-            if event.winner_id:
-                winner = User.objects.get(id=event.winner_id)
-                winner.total_wins += 1
-                winner.save(update_fields=['total_wins'])
-
-                logger.info(f"User {event.winner_id} won the game! Total wins: {winner.total_wins}")
+                # Назначаем ранги
+                for rank, stats in enumerate(sorted_stats, start=1):
+                    stats.rank = rank
+                    stats.finalize()
+                    stats.save(update_fields=['rank', 'completed_at'])
+
+                # Сохраняем в историю для каждого игрока
+                for stats in player_stats:
+                    GameHistory.objects.create(
+                        user=stats.user,
+                        session=session,
+                        room=session.room,
+                        quiz=session.quiz,
+                        final_points=stats.total_points,
+                        correct_answers=stats.correct_answers,
+                        total_questions=stats.correct_answers + stats.wrong_answers,
+                        final_rank=stats.rank
+                    )
+
+                    logger.info(
+                        f"Saved game history for user {stats.user_id}: "
+                        f"rank {stats.rank}, {stats.total_points} points"
+                    )
+
+                # Обновляем счётчик побед у победителя
+                if event.winner_id:
+                    winner = User.objects.get(id=event.winner_id)
+                    winner.total_wins += 1
+                    winner.save(update_fields=['total_wins'])
+
+                    logger.info(f"User {event.winner_id} won the game! Total wins: {winner.total_wins}")
 
         except GameSession.DoesNotExist:
             logger.error(f"GameSession {event.session_id} not found")
-        except Exception as e:
-            logger.error(
-                f"Error saving game history: {e}",
-                exc_info=True
-            )
 
     def can_handle_async(self) -> bool:
         return True
 
 
+class UpdateParticipantsCountHandler(EventHandler):
+    """
+    Обработчик: поддержка счётчика участников сессии в Redis.
+    """
+
+    def handle(self, event) -> None:
+        """
+        Увеличить счётчик при входе игрока, уменьшить при выходе.
+        """
+        if isinstance(event, PlayerJoinedGameEvent):
+            delta = 1
+        elif isinstance(event, PlayerLeftGameEvent):
+            delta = -1
+        else:
+            return
+
+        count = game_state_repository.adjust_participants_count(event.session_id, delta)
+        if count is None:
+            logger.debug(
+                f"Participants counter for session {event.session_id} is not captured yet"
+            )
+
+
 class LogGameEventsHandler(EventHandler):
     """
     Обработчик: логирование всех игровых событий.
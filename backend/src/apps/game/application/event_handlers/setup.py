@@ -1,5 +1,7 @@
 import logging
 
+from django.conf import settings
+
 from apps.game.infrastructure.event_bus import event_bus
 from apps.game.domain.events import (
     QuestionAnsweredEvent,
@@ -9,11 +11,14 @@ from apps.game.domain.events import (
     RoundCompletedEvent,
     GamePausedEvent,
     GameResumedEvent,
+    PlayerJoinedGameEvent,
+    PlayerLeftGameEvent,
 )
 from apps.game.application.event_handlers import (
     UpdatePlayerStatsOnAnswerHandler,
     UpdateGlobalUserStatsOnAnswerHandler,
     SaveGameHistoryOnFinishHandler,
+    UpdateParticipantsCountHandler,
     LogGameEventsHandler,
     NotifyPlayersHandler,
 )
@@ -48,6 +53,12 @@ def setup_event_handlers() -> None:
         SaveGameHistoryOnFinishHandler()
     )
 
+    # Когда игрок входит в комнату или покидает её во время игры
+
+    participants_handler = UpdateParticipantsCountHandler()
+    event_bus.subscribe(PlayerJoinedGameEvent, participants_handler)
+    event_bus.subscribe(PlayerLeftGameEvent, participants_handler)
+
     # Логирование всех событий
 
     log_handler = LogGameEventsHandler()
@@ -58,6 +69,8 @@ def setup_event_handlers() -> None:
     event_bus.subscribe(RoundCompletedEvent, log_handler)
     event_bus.subscribe(GamePausedEvent, log_handler)
     event_bus.subscribe(GameResumedEvent, log_handler)
+    event_bus.subscribe(PlayerJoinedGameEvent, log_handler)
+    event_bus.subscribe(PlayerLeftGameEvent, log_handler)
 
     # ========== WebSocket уведомления ==========
     # TODO: Включить после подключения Django Channels
@@ -68,6 +81,9 @@ def setup_event_handlers() -> None:
     # event_bus.subscribe(QuestionAnsweredEvent, notify_handler)
     # event_bus.subscribe(GameFinishedEvent, notify_handler)
 
+    if settings.GAME_EVENT_BUS_METRICS_ENABLED:
+        event_bus.enable_metrics(settings.GAME_EVENT_BUS_SLOW_HANDLER_MS)
+
     logger.info("✅ Event handlers registered successfully")
     logger.info(f"📊 Total handlers: {_count_all_handlers()}")
 
@@ -5,6 +5,9 @@ from django.utils import timezone
 import logging
 
 from apps.game.infrastructure.redis_game_state_repository import game_state_repository
+from apps.game.application.services.session_participants_service import session_participants_service
+from apps.game.application.services.game_results_service import game_results_service
+from apps.users.application.services.global_leaderboard_service import global_leaderboard_service
 from apps.game.domain.services.game_session_service import GameSessionDomainService
 from apps.game.domain.services.round_timer_service import RoundTimerService
 from apps.questions.models import Quiz, AnswerOption
@@ -24,6 +27,7 @@ class GameCoordinatorService:
         self.game_state_repo = game_state_repository
         self.domain_service = GameSessionDomainService(game_state_repository)
         self.timer_service = RoundTimerService(game_state_repository)
+        self.participants_service = session_participants_service
 
     def start_game_session(self, session_id: int, user_id: int) -> dict:
         """
@@ -44,7 +48,7 @@ class GameCoordinatorService:
 
         # Получаем данные викторины
         quiz = session.quiz
-        total_questions = quiz.questions.count()
+        total_questions = quiz.question_count
 
         # Получаем список игроков
         participant_ids = list(
@@ -53,6 +57,7 @@ class GameCoordinatorService:
 
         # Инициализируем очки в Redis
         self.game_state_repo.initialize_player_scores(session_id, participant_ids)
+        self.participants_service.capture(session_id, len(participant_ids))
 
         # Генерируем событие через domain service
         game_started_event = self.domain_service.start_game(
@@ -138,13 +143,24 @@ class GameCoordinatorService:
             'question_id': question.id,
             'question_text': question.text,
             'options': options,
-            'total_questions': session.quiz.questions.count(),
+            'total_questions': session.quiz.question_count,
             'timer_duration': timer_duration
         }
 
-    def submit_answer(self, session_id: int, user_id: int, username: str, answer_option_id: int, time_taken: int = 0) -> dict:
+    def submit_answer(
+        self,
+        session_id: int,
+        user_id: int,
+        username: str,
+        answer_option_id: int,
+        time_taken: int = 0,
+        check_round_completion: bool = True
+    ) -> dict:
         """
         Отправить ответ игрока.
+
+        check_round_completion=False - решение о завершении раунда
+        принимает вызывающий (владелец сессии в режиме актора).
         """
         from apps.game.models import GameSession
 
@@ -187,7 +203,14 @@ class GameCoordinatorService:
             points_earned=points_earned
         )
 
-        total_participants = session.room.participants.count()
+        if not check_round_completion:
+            return {
+                'answer_submitted_event': answer_submitted_event,
+                'answer_checked_event': answer_checked_event,
+                'should_complete_round': False
+            }
+
+        total_participants = self.participants_service.get_participants_count(session)
         total_answers = self.game_state_repo.get_round_answers_count(session_id, current_round_number)
         should_complete_round = False
 
@@ -213,15 +236,68 @@ class GameCoordinatorService:
 
         return result
 
-    def complete_current_round(self, session_id: int) -> dict:
+    def complete_current_round(self, session_id: int, round_number: Optional[int] = None) -> dict:
         """
-        Завершить текущий раунд.
+        Завершить текущий раунд (или раунд round_number).
+
+        Завершение single-flight: работу выполняет только тот, кто занял
+        блокировку раунда в Redis. Остальные сразу получают сохранённый результат
+        с флагом duplicate=True и не должны повторно рассылать события.
+        Если результата ещё нет (раунд завершается прямо сейчас) - pending=True,
+        дождаться его можно через get_round_completion_result.
         """
         logger.info(f"[COMPLETE_ROUND] Starting for session {session_id}")
         session = get_object_or_404(GameSession, id=session_id)
-        current_round_number = session.current_question_index
+        current_round_number = round_number or session.current_question_index
         logger.info(f"[COMPLETE_ROUND] Current round number: {current_round_number}")
 
+        if not self.game_state_repo.acquire_round_completion(session_id, current_round_number):
+            logger.info(f"[COMPLETE_ROUND] Round {current_round_number} is already being completed")
+            return self._get_duplicate_result(session_id, current_round_number)
+
+        try:
+            result = self._complete_round(session, current_round_number)
+        except Exception:
+            self.game_state_repo.release_round_completion(session_id, current_round_number)
+            raise
+
+        self.game_state_repo.save_round_completion_result(session_id, current_round_number, result)
+        return result
+
+    def get_round_completion_result(self, session_id: int, round_number: int) -> Optional[dict]:
+        """
+        Сохранённый результат завершения раунда (None - ещё не завершён).
+
+        Не блокирует: ожидающий опрашивает его сам (актор - через asyncio.sleep).
+        """
+        result = self.game_state_repo.get_round_completion_result(session_id, round_number)
+        return {**result, 'duplicate': True} if result is not None else None
+
+    def _get_duplicate_result(self, session_id: int, round_number: int) -> dict:
+        result = self.get_round_completion_result(session_id, round_number)
+        if result is not None:
+            return result
+
+        logger.info(f"[COMPLETE_ROUND] Round {round_number} of session {session_id} is still being completed")
+        return {
+            'round_completed_event': None,
+            'has_next': None,
+            'next_question_data': None,
+            'duplicate': True,
+            'pending': True
+        }
+
+    def _complete_round(self, session, current_round_number: int) -> dict:
+        """
+        Завершение раунда: синхронизация в БД, событие и следующий вопрос.
+        """
+        session_id = session.id
+
+        if session.current_question_index != current_round_number:
+            session.current_question_index = current_round_number
+            session.save(update_fields=['current_question_index'])
+            logger.info(f"Set current round {current_round_number} for session {session_id}")
+
         current_round = session.rounds.filter(round_number=current_round_number).first()
 
         if not current_round:
@@ -249,7 +325,7 @@ class GameCoordinatorService:
         )
 
         # Проверяем, есть ли следующий вопрос
-        total_questions = session.quiz.questions.count()
+        total_questions = session.quiz.question_count
         has_next = current_round_number < total_questions
 
         logger.info(f"[COMPLETE_ROUND] has_next={has_next} (current={current_round_number}, total={total_questions})")
@@ -324,7 +400,7 @@ class GameCoordinatorService:
             stats.save(update_fields=['rank'])
 
         from apps.users.models import GameHistory
-        total_questions = session.quiz.questions.count()
+        total_questions = session.quiz.question_count
 
         for stats in session.player_stats.all():
             GameHistory.objects.create(
@@ -349,6 +425,9 @@ class GameCoordinatorService:
             winner.user.save(update_fields=['total_wins'])
             logger.info(f"Winner {winner.user.nickname} total_wins: {winner.user.total_wins}")
 
+        game_results_service.materialize(session)
+        global_leaderboard_service.refresh_session_players_on_commit(session.id)
+
         game_finished_event = self.domain_service.finish_game(
             session_id=session.id,
             room_id=session.room_id,
@@ -442,21 +521,13 @@ class GameCoordinatorService:
         """
         Автоматически завершить раунд
         """
-        from apps.game.models import GameSession
-
         logger.info(f"Автозавершение раунда {round_number} для сессии {session_id}, причина: {reason}")
 
         try:
-            session = get_object_or_404(GameSession, id=session_id)
-
-            session.current_question_index = round_number
-            session.save(update_fields=['current_question_index'])
-            logger.info(f"Set current round {round_number} for session {session_id}")
-
             self.timer_service.stop_timer(session_id, round_number, reason=reason)
             logger.info(f"Таймер остановлен для раунда {round_number}, причина: {reason}")
 
-            result = self.complete_current_round(session_id)
+            result = self.complete_current_round(session_id, round_number=round_number)
 
             logger.info(f"Таймер раунда {round_number} завершен успешно")
             return result
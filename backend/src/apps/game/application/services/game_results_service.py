@@ -0,0 +1,95 @@
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from apps.game.infrastructure.redis_game_results_repository import game_results_repository
+from apps.game.models import GameSession, GameRound
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GameResultsEntry:
+    """Материализованные итоги: JSON, его gzip и ETag."""
+    etag: str
+    blob: bytes
+
+    @property
+    def content(self) -> bytes:
+        return gzip.decompress(self.blob)
+
+
+class GameResultsService:
+    """
+    Итоги игры.
+
+    Для FINISHED сессий итоги собираются один раз при завершении
+    и дальше отдаются из Redis (и, опционально, из GameSession.results_snapshot).
+    """
+
+    def __init__(self):
+        self.repository = game_results_repository
+
+    def build_results(self, session: GameSession) -> dict:
+        """Собрать итоги из БД (как GameResultsSerializer)."""
+        from apps.game.serializers import GameResultsSerializer
+
+        leaderboard = session.player_stats.select_related('user').order_by('-total_points', 'completed_at')
+
+        total_rounds = session.rounds.count()
+        completed_rounds = session.rounds.filter(status=GameRound.Status.COMPLETED).count()
+
+        data = {
+            'session': session,
+            'leaderboard': leaderboard,
+            'total_rounds': total_rounds,
+            'completed_rounds': completed_rounds,
+        }
+
+        return GameResultsSerializer(data).data
+
+    def materialize(self, session: GameSession) -> GameResultsEntry:
+        """
+        Собрать и сохранить итоги завершённой сессии.
+        """
+        results = self.build_results(session)
+        entry = self._store(session.id, results)
+
+        if getattr(settings, 'GAME_RESULTS_STORE_IN_DB', True):
+            session.results_snapshot = json.loads(entry.content)
+            session.save(update_fields=['results_snapshot'])
+
+        return entry
+
+    def get_finished_results(self, session: GameSession) -> GameResultsEntry:
+        """
+        Итоги FINISHED сессии: Redis -> results_snapshot -> сборка из БД.
+        """
+        cached = self.repository.get(session.id)
+        if cached:
+            return GameResultsEntry(etag=cached['etag'], blob=cached['blob'])
+
+        if session.results_snapshot is not None:
+            return self._store(session.id, session.results_snapshot)
+
+        logger.info(f"Results for session {session.id} are not materialized yet, building")
+        return self.materialize(session)
+
+    def _store(self, session_id: int, results) -> GameResultsEntry:
+        content = json.dumps(results, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8')
+        etag = hashlib.sha1(content).hexdigest()
+        blob = gzip.compress(content)
+
+        # materialize() вызывается внутри транзакции завершения игры:
+        # в Redis итоги попадают только после коммита (вне транзакции - сразу)
+        transaction.on_commit(lambda: self.repository.save(session_id, etag, blob))
+        return GameResultsEntry(etag=etag, blob=blob)
+
+
+game_results_service = GameResultsService()
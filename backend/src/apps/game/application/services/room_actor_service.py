@@ -0,0 +1,471 @@
+import asyncio
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional, Set
+import logging
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.http import Http404
+
+from apps.game.infrastructure.redis_game_state_repository import game_state_repository
+from apps.game.infrastructure.redis_room_actor_repository import room_actor_repository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GameSessionActorState:
+    """Состояние сессии, которым владеет актор (хранится в памяти процесса)."""
+    session_id: int
+    room_id: int
+    round_number: int = 0
+    participants_count: int = 0
+    answered: Set[int] = field(default_factory=set)
+    round_completed: bool = False
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['answered'] = sorted(self.answered)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GameSessionActorState':
+        return cls(
+            session_id=data['session_id'],
+            room_id=data['room_id'],
+            round_number=data.get('round_number', 0),
+            participants_count=data.get('participants_count', 0),
+            answered=set(data.get('answered', [])),
+            round_completed=data.get('round_completed', False),
+        )
+
+
+class GameSessionActor:
+    """
+    Единственный владелец игровой сессии.
+
+    Команды выполняются строго по очереди, поэтому проверка
+    "все ответили" и завершение раунда не гоняются между процессами.
+    """
+
+    ROUND_RESULTS_DELAY = 3
+
+    # Ожидание результата, если раунд завершает другой вызывающий
+    COMPLETION_WAIT_SECONDS = 5
+    COMPLETION_POLL_INTERVAL = 0.1
+
+    def __init__(self, state: GameSessionActorState, coordinator, channel_layer, owner: Optional[str] = None):
+        self.state = state
+        self.coordinator = coordinator
+        self.channel_layer = channel_layer
+        # Канал-владелец аренды: чекпоинт пишется, только пока аренда наша
+        self.owner = owner
+        self.lock = asyncio.Lock()
+        self.finished = False
+
+    @property
+    def room_group_name(self) -> str:
+        return f"game_room_{self.state.room_id}"
+
+    async def handle(self, command: dict) -> None:
+        """Выполнить команду."""
+        async with self.lock:
+            action = command.get('action')
+            if action == 'submit_answer':
+                await self._submit_answer(command)
+            elif action == 'complete_round':
+                await self._complete_round(
+                    round_number=command.get('round_number'),
+                    reason=command.get('reason', 'time_expired')
+                )
+            elif action == 'next_question':
+                await self._next_question(command)
+            elif action in ('pause', 'resume'):
+                await self._pause_or_resume(action, command)
+            else:
+                logger.warning(f"Unknown actor command for session {self.state.session_id}: {action}")
+
+            saved = await sync_to_async(room_actor_repository.save_checkpoint)(
+                self.state.session_id, self.state.to_dict(), self.owner
+            )
+            if not saved:
+                logger.warning(f"Checkpoint of session {self.state.session_id} skipped: lease lost by {self.owner}")
+
+    async def _submit_answer(self, command: dict) -> None:
+        user_id = command['user_id']
+        reply_channel = command.get('reply_channel')
+
+        if self.state.round_completed:
+            await self._reply_error(reply_channel, "Раунд уже завершён")
+            return
+
+        if user_id in self.state.answered:
+            await self._reply_error(reply_channel, "Вы уже ответили на этот вопрос")
+            return
+
+        try:
+            result = await sync_to_async(self.coordinator.submit_answer)(
+                session_id=self.state.session_id,
+                user_id=user_id,
+                username=command.get('username', ''),
+                answer_option_id=command['answer_option_id'],
+                time_taken=command.get('time_taken', 0),
+                check_round_completion=False
+            )
+        except (ValueError, Http404) as e:
+            await self._reply_error(reply_channel, str(e))
+            return
+
+        self.state.answered.add(user_id)
+
+        await self._broadcast('answer_submitted', result['answer_submitted_event'])
+        if reply_channel:
+            await self.channel_layer.send(reply_channel, {
+                'type': 'answer_checked',
+                'data': _event_to_dict(result['answer_checked_event'])
+            })
+
+        total_answers = len(self.state.answered)
+        is_correct = result['answer_checked_event'].is_correct
+
+        if total_answers >= self.state.participants_count or (is_correct and total_answers == 1):
+            await self._complete_round(self.state.round_number, reason='all_answered')
+
+    async def _next_question(self, command: dict) -> None:
+        """Хост пропускает вопрос: идущий раунд завершается, до первого раунда - показывается вопрос."""
+        if self.state.round_number > 0:
+            await self._complete_round(self.state.round_number, reason='next_question')
+            return
+
+        try:
+            result = await sync_to_async(self.coordinator.get_next_question)(self.state.session_id)
+        except (ValueError, Http404) as e:
+            await self._reply_error(command.get('reply_channel'), str(e))
+            return
+        if not result:
+            return
+
+        await self._start_round(result['round_number'])
+        if result.get('question_revealed_event'):
+            await self._broadcast('question_revealed', result['question_revealed_event'])
+
+    async def _pause_or_resume(self, action: str, command: dict) -> None:
+        method = self.coordinator.pause_game_session if action == 'pause' else self.coordinator.resume_game_session
+        event_type = 'game_paused' if action == 'pause' else 'game_resumed'
+        try:
+            result = await sync_to_async(method)(session_id=self.state.session_id, user_id=command['user_id'])
+        except (PermissionError, ValueError, Http404) as e:
+            await self._reply_error(command.get('reply_channel'), str(e))
+            return
+
+        if result.get(f'{event_type}_event'):
+            await self._broadcast(event_type, result[f'{event_type}_event'])
+
+    async def _start_round(self, round_number: int) -> None:
+        self.state.round_number = round_number
+        self.state.answered = set()
+        self.state.round_completed = False
+        self.state.participants_count = await sync_to_async(_load_participants_count)(self.state.session_id)
+
+    async def _complete_round(self, round_number: Optional[int], reason: str) -> None:
+        if self.state.round_completed or round_number != self.state.round_number:
+            logger.info(
+                f"Skip completion of round {round_number} for session {self.state.session_id}: "
+                f"current round {self.state.round_number}, completed={self.state.round_completed}"
+            )
+            return
+
+        self.state.round_completed = True
+
+        if reason == 'time_expired':
+            result = await sync_to_async(self.coordinator.auto_complete_round)(
+                self.state.session_id, round_number, reason=reason
+            )
+        else:
+            result = await sync_to_async(self.coordinator.complete_current_round)(
+                session_id=self.state.session_id,
+                round_number=round_number
+            )
+
+        if result.get('pending'):
+            result = await self._wait_for_completion(round_number, result)
+
+        # duplicate - раунд завершили в обход актора, события уже разосланы
+        duplicate = result.get('duplicate', False)
+
+        if reason == 'time_expired' and not duplicate:
+            await self.channel_layer.group_send(self.room_group_name, {
+                'type': 'round.ended',
+                'session_id': self.state.session_id,
+                'round_number': round_number,
+                'reason': reason,
+                'message': 'Время вышло!'
+            })
+
+        if result.get('round_completed_event') and not duplicate:
+            await self._broadcast('round_completed', result['round_completed_event'])
+
+        next_question_data = result.get('next_question_data')
+        if result.get('has_next') and next_question_data:
+            await self._start_round(next_question_data['round_number'])
+            next_event = next_question_data.get('question_revealed_event')
+            if next_event and not duplicate:
+                asyncio.create_task(self._broadcast_later('question_revealed', next_event))
+        elif result.get('has_next') is False:
+            self.finished = True
+            if not duplicate:
+                asyncio.create_task(self._broadcast_game_finished_later())
+
+    async def _wait_for_completion(self, round_number: int, pending: dict) -> dict:
+        """
+        Дождаться результата раунда, который завершает другой вызывающий.
+
+        Опрос через asyncio.sleep: поток sync_to_async не занимается ожиданием.
+        """
+        deadline = asyncio.get_running_loop().time() + self.COMPLETION_WAIT_SECONDS
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(self.COMPLETION_POLL_INTERVAL)
+            result = await sync_to_async(self.coordinator.get_round_completion_result)(
+                self.state.session_id, round_number
+            )
+            if result is not None:
+                return result
+
+        logger.warning(f"Timed out waiting for round {round_number} of session {self.state.session_id}")
+        return pending
+
+    async def _broadcast(self, event_type: str, event_obj) -> None:
+        await self.channel_layer.group_send(self.room_group_name, {
+            'type': event_type,
+            'data': _event_to_dict(event_obj)
+        })
+
+    async def _broadcast_later(self, event_type: str, event_obj) -> None:
+        await asyncio.sleep(self.ROUND_RESULTS_DELAY)
+        await self._broadcast(event_type, event_obj)
+
+    async def _broadcast_game_finished_later(self) -> None:
+        await asyncio.sleep(self.ROUND_RESULTS_DELAY)
+        await self.channel_layer.group_send(self.room_group_name, {
+            'type': 'game_finished',
+            'session_id': self.state.session_id,
+            'message': 'Игра завершена! Спасибо за участие!'
+        })
+
+    async def _reply_error(self, reply_channel: Optional[str], message: str) -> None:
+        if not reply_channel:
+            logger.warning(f"Actor error for session {self.state.session_id}: {message}")
+            return
+        await self.channel_layer.send(reply_channel, {
+            'type': 'system_message',
+            'message': message,
+            'level': 'error'
+        })
+
+
+class RoomActorService:
+    """
+    Режим "актора комнаты" (settings.GAME_ROOM_ACTOR_ENABLED).
+
+    Каждой активной сессией владеет ровно один ASGI-процесс (аренда в Redis).
+    Команды для чужих сессий пересылаются владельцу через channel layer.
+    """
+
+    COMMAND_TYPE = 'game_actor.command'
+    CHANNEL_PREFIX = 'game-actor.'
+
+    # Пауза после ошибки чтения своей очереди (удваивается до максимума)
+    RECEIVE_RETRY_DELAY = 1
+    RECEIVE_RETRY_MAX_DELAY = 30
+
+    def __init__(self, repository=None):
+        self.repository = repository or room_actor_repository
+        self.actors: Dict[int, GameSessionActor] = {}
+        self.owner_channel: Optional[str] = None
+        self._channel_layer = None
+        self._tasks = []
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'GAME_ROOM_ACTOR_ENABLED', False)
+
+    @property
+    def lease_ttl(self) -> int:
+        return getattr(settings, 'GAME_ROOM_ACTOR_LEASE_SECONDS', 30)
+
+    @property
+    def channel_layer(self):
+        if self._channel_layer is None:
+            self._channel_layer = get_channel_layer()
+        return self._channel_layer
+
+    async def dispatch(self, session_id: int, room_id: int, command: dict) -> bool:
+        """
+        Выполнить команду у владельца сессии (локально или через пересылку).
+
+        Возвращает False, если аренду получить не удалось (например, недоступен Redis) -
+        тогда вызывающий выполняет команду сам, как в обычном режиме.
+        """
+        await self._ensure_started()
+
+        actor = self.actors.get(session_id)
+        if actor is None:
+            owner = await sync_to_async(self.repository.acquire_lease)(
+                session_id, self.owner_channel, self.lease_ttl
+            )
+            if owner is None:
+                logger.warning(f"No lease for session {session_id}, command {command.get('action')} runs without actor")
+                return False
+            if owner != self.owner_channel:
+                await self.channel_layer.send(owner, {
+                    'type': self.COMMAND_TYPE,
+                    'session_id': session_id,
+                    'room_id': room_id,
+                    'command': command
+                })
+                return True
+
+            actor = await self._create_actor(session_id, room_id)
+
+        await actor.handle(command)
+
+        if actor.finished:
+            await self._release(session_id)
+        return True
+
+    def dispatch_from_sync(self, session_id: int, command: dict) -> bool:
+        """
+        Переслать команду владельцу из синхронного кода (Celery).
+
+        Возвращает False, если у сессии нет владельца - тогда
+        вызывающий выполняет команду сам, как в обычном режиме.
+        """
+        if not self.enabled:
+            return False
+
+        owner = self.repository.get_owner(session_id)
+        if not owner:
+            return False
+
+        async_to_sync(self.channel_layer.send)(owner, {
+            'type': self.COMMAND_TYPE,
+            'session_id': session_id,
+            'room_id': command.get('room_id'),
+            'command': command
+        })
+        return True
+
+    async def _create_actor(self, session_id: int, room_id: int) -> GameSessionActor:
+        from apps.game.application.services.game_coordinator_service import game_coordinator_service
+
+        state = await sync_to_async(_load_actor_state)(session_id, room_id)
+        actor = GameSessionActor(state, game_coordinator_service, self.channel_layer, self.owner_channel)
+        self.actors[session_id] = actor
+        logger.info(f"Actor for session {session_id} started at {self.owner_channel}, round {state.round_number}")
+        return actor
+
+    async def _release(self, session_id: int) -> None:
+        self.actors.pop(session_id, None)
+        await sync_to_async(self.repository.release_lease)(session_id, self.owner_channel)
+        await sync_to_async(self.repository.delete_checkpoint)(session_id)
+
+    async def _ensure_started(self) -> None:
+        if self.owner_channel is not None:
+            return
+
+        self.owner_channel = await self.channel_layer.new_channel(self.CHANNEL_PREFIX)
+        self._tasks = [
+            asyncio.create_task(self._receive_loop()),
+            asyncio.create_task(self._renew_loop()),
+        ]
+        logger.info(f"Room actor owner channel: {self.owner_channel}")
+
+    async def _receive_loop(self) -> None:
+        """
+        Очередь команд, пересланных этому владельцу.
+
+        Ошибка чтения (например, обрыв связи с Redis) не останавливает цикл:
+        иначе аренды продлевались бы дальше, а пересланные команды терялись.
+        """
+        delay = self.RECEIVE_RETRY_DELAY
+        while True:
+            try:
+                message = await self.channel_layer.receive(self.owner_channel)
+            except Exception as e:
+                logger.error(f"Actor queue {self.owner_channel} receive failed, retry in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RECEIVE_RETRY_MAX_DELAY)
+                continue
+
+            delay = self.RECEIVE_RETRY_DELAY
+            if message.get('type') != self.COMMAND_TYPE:
+                continue
+            asyncio.create_task(self._handle_forwarded(message))
+
+    async def _handle_forwarded(self, message: dict) -> None:
+        try:
+            handled = await self.dispatch(message['session_id'], message.get('room_id'), message['command'])
+            if not handled:
+                logger.error(f"Forwarded command dropped for session {message['session_id']}: no lease")
+        except Exception as e:
+            logger.error(f"Actor command failed for session {message.get('session_id')}: {e}", exc_info=True)
+
+    async def _renew_loop(self) -> None:
+        """Продление аренды своих сессий; потерянные сессии выгружаются из памяти."""
+        while True:
+            await asyncio.sleep(max(self.lease_ttl // 3, 1))
+            for session_id in list(self.actors):
+                renewed = await sync_to_async(self.repository.renew_lease)(
+                    session_id, self.owner_channel, self.lease_ttl
+                )
+                if not renewed:
+                    logger.warning(f"Lease for session {session_id} lost by {self.owner_channel}")
+                    self.actors.pop(session_id, None)
+
+
+def _load_participants_count(session_id: int) -> int:
+    from apps.game.application.services.session_participants_service import session_participants_service
+    from apps.game.models import GameSession
+
+    session = GameSession.objects.only('id', 'room_id').get(id=session_id)
+    return session_participants_service.get_participants_count(session)
+
+
+def _load_actor_state(session_id: int, room_id: int) -> GameSessionActorState:
+    """
+    Восстановить состояние: из чекпоинта, если он актуален, иначе из Redis/БД.
+    """
+    from apps.game.application.services.session_participants_service import session_participants_service
+    from apps.game.models import GameSession
+
+    session = GameSession.objects.only('id', 'room_id', 'current_question_index').get(id=session_id)
+    round_number = session.current_question_index
+
+    checkpoint = room_actor_repository.get_checkpoint(session_id)
+    if checkpoint and checkpoint.get('round_number') == round_number:
+        return GameSessionActorState.from_dict(checkpoint)
+
+    round_data = game_state_repository.get_round_data(session_id, round_number) or {}
+    answers = game_state_repository.get_round_answers(session_id, round_number)
+
+    return GameSessionActorState(
+        session_id=session_id,
+        room_id=room_id or session.room_id,
+        round_number=round_number,
+        participants_count=session_participants_service.get_participants_count(session),
+        answered={int(user_id) for user_id in answers},
+        round_completed=round_data.get('status') == 'completed',
+    )
+
+
+def _event_to_dict(event_obj) -> dict:
+    data = asdict(event_obj)
+
+    if 'timestamp' in data and data['timestamp']:
+        data['timestamp'] = data['timestamp'].isoformat()
+
+    return data
+
+
+room_actor_service = RoomActorService()
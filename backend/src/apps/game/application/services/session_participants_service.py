@@ -0,0 +1,106 @@
+from typing import List
+from django.db import transaction
+import logging
+
+from apps.game.domain.events import PlayerJoinedGameEvent, PlayerLeftGameEvent
+from apps.game.infrastructure.event_bus import event_bus
+from apps.game.infrastructure.redis_game_state_repository import game_state_repository
+from apps.game.models import GameSession, PlayerAnswer, PlayerGameStats
+from apps.rooms.models import RoomParticipant
+
+logger = logging.getLogger(__name__)
+
+
+class SessionParticipantsService:
+    """
+    Счётчики участников и ответов для проверки завершения раунда.
+
+    Количество участников фиксируется в Redis при старте игры и
+    поддерживается событиями входа/выхода, поэтому на каждый ответ
+    не нужен COUNT в БД.
+
+    Участник сессии - игрок со строкой PlayerGameStats. Вошедшие после старта
+    не учитываются, пока не ответят (иначе раунд ждал бы их ответа вечно).
+    """
+
+    ACTIVE_STATUSES = [
+        GameSession.Status.WAITING,
+        GameSession.Status.PLAYING,
+        GameSession.Status.PAUSED,
+    ]
+
+    def __init__(self):
+        self.game_state_repo = game_state_repository
+
+    def capture(self, session_id: int, count: int) -> None:
+        """Зафиксировать количество участников на старте игры."""
+        self.game_state_repo.set_participants_count(session_id, count)
+
+    def get_participants_count(self, session: GameSession) -> int:
+        """
+        Количество участников сессии.
+
+        Если счётчика нет в Redis (истёк TTL, сессия запущена до деплоя) -
+        пересчитываем по БД (игроки со статистикой, ещё находящиеся в комнате)
+        и засеваем заново.
+        """
+        count = self.game_state_repo.get_participants_count(session.id)
+        if count is None:
+            count = PlayerGameStats.objects.filter(
+                session_id=session.id,
+                user_id__in=RoomParticipant.objects.filter(room_id=session.room_id).values('user_id'),
+            ).count()
+            self.game_state_repo.set_participants_count(session.id, count)
+        return count
+
+    def start_round(self, session_id: int, round_number: int) -> None:
+        """Обнулить счётчик ответов при старте раунда."""
+        self.game_state_repo.set_round_answers_count(session_id, round_number, 0)
+
+    def register_answer(self, session_id: int, round_id: int, round_number: int) -> int:
+        """
+        Учесть сохранённый ответ и вернуть количество ответов на раунд.
+        """
+        count = self.game_state_repo.increment_round_answers_count(session_id, round_number)
+        if count is None:
+            # Ответ уже в БД, поэтому COUNT учитывает и его
+            count = PlayerAnswer.objects.filter(round_id=round_id).count()
+            self.game_state_repo.set_round_answers_count(session_id, round_number, count)
+        return count
+
+    def add_player(self, session_id: int) -> None:
+        """Учесть игрока, вошедшего после старта, после его первого ответа."""
+        transaction.on_commit(lambda: self.game_state_repo.adjust_participants_count(session_id, 1))
+
+    def notify_joined(self, room_id: int, user_id: int) -> None:
+        """Опубликовать возвращение игрока для активных сессий комнаты."""
+        for session_id in self._get_active_session_ids(room_id, user_id):
+            event = PlayerJoinedGameEvent(session_id=session_id, room_id=room_id, user_id=user_id)
+            transaction.on_commit(lambda event=event: event_bus.publish(event))
+
+    def notify_left(self, room_id: int, user_id: int, reason: str = "left_voluntarily") -> None:
+        """
+        Опубликовать выход игрока для активных сессий комнаты.
+
+        reason позволяет различать добровольный выход и удаление
+        неактивных игроков (например, reason="reaped").
+        """
+        for session_id in self._get_active_session_ids(room_id, user_id):
+            event = PlayerLeftGameEvent(
+                session_id=session_id,
+                room_id=room_id,
+                user_id=user_id,
+                reason=reason
+            )
+            transaction.on_commit(lambda event=event: event_bus.publish(event))
+
+    def _get_active_session_ids(self, room_id: int, user_id: int) -> List[int]:
+        # Только сессии, где игрок учтён в счётчике (есть статистика)
+        return list(
+            GameSession.objects
+            .filter(room_id=room_id, status__in=self.ACTIVE_STATUSES, player_stats__user_id=user_id)
+            .values_list('id', flat=True)
+        )
+
+
+session_participants_service = SessionParticipantsService()
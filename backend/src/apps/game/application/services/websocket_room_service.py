@@ -191,7 +191,7 @@ class WebSocketRoomService:
                     'id': active_session.id,
                     'status': active_session.status,
                     'quiz_title': active_session.quiz.title,
-                    'total_questions': active_session.quiz.questions.count()
+                    'total_questions': active_session.quiz.question_count
                 }
 
                 # Если игра идет - получаем текущий вопрос из Redis
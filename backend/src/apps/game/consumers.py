@@ -293,6 +293,7 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
     async def handle_submit_answer(self, data):
         """Обработка отправки ответа игроком."""
         from apps.game.application.services.game_coordinator_service import game_coordinator_service
+        from apps.game.application.services.room_actor_service import room_actor_service
         import logging
 
         logger = logging.getLogger(__name__)
@@ -312,6 +313,20 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
                 await self.send_error('Активная игровая сессия не найдена')
                 return
 
+            # В режиме актора ответ обрабатывает владелец сессии
+            if room_actor_service.enabled:
+                handled = await room_actor_service.dispatch(session.id, session.room_id, {
+                    'action': 'submit_answer',
+                    'user_id': self.user_id,
+                    'username': self.username,
+                    'answer_option_id': answer_option_id,
+                    'time_taken': time_taken,
+                    'reply_channel': self.channel_name
+                })
+                # Без аренды (недоступен Redis) команда выполняется напрямую
+                if handled:
+                    return
+
             # Отправляем ответ через coordinator
             result = await sync_to_async(game_coordinator_service.submit_answer)(
                 session_id=session.id,
@@ -347,6 +362,7 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
     async def handle_next_question(self, data):
         """Обработка запроса следующего вопроса (только хост или авто)."""
         from apps.game.application.services.game_coordinator_service import game_coordinator_service
+        from apps.game.application.services.room_actor_service import room_actor_service
 
         try:
             session = await self._get_active_session()
@@ -354,6 +370,21 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
                 await self.send_error('Активная игровая сессия не найдена')
                 return
 
+            # В режиме актора раунд переключает владелец сессии
+            if room_actor_service.enabled:
+                handled = await room_actor_service.dispatch(session.id, session.room_id, {
+                    'action': 'next_question',
+                    'reply_channel': self.channel_name
+                })
+                if handled:
+                    return
+
+            # Идущий раунд завершаем через single-flight - следующий вопрос
+            # покажет тот, кто действительно завершил раунд
+            if session.current_question_index > 0:
+                await self._complete_round(session.id)
+                return
+
             # Получаем следующий вопрос
             result = await sync_to_async(game_coordinator_service.get_next_question)(
                 session_id=session.id
@@ -368,6 +399,7 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
     async def handle_pause_game(self, data):
         """Обработка паузы игры (только хост)."""
         from apps.game.application.services.game_coordinator_service import game_coordinator_service
+        from apps.game.application.services.room_actor_service import room_actor_service
         from apps.rooms.models import Room
 
         try:
@@ -380,6 +412,15 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
             if not session:
                 return
 
+            if room_actor_service.enabled:
+                handled = await room_actor_service.dispatch(session.id, session.room_id, {
+                    'action': 'pause',
+                    'user_id': self.user_id,
+                    'reply_channel': self.channel_name
+                })
+                if handled:
+                    return
+
             result = await sync_to_async(game_coordinator_service.pause_game_session)(
                 session_id=session.id,
                 user_id=self.user_id
@@ -396,6 +437,7 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
     async def handle_resume_game(self, data):
         """Обработка продолжения игры (только хост)."""
         from apps.game.application.services.game_coordinator_service import game_coordinator_service
+        from apps.game.application.services.room_actor_service import room_actor_service
         from apps.rooms.models import Room
 
         try:
@@ -408,6 +450,15 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
             if not session:
                 return
 
+            if room_actor_service.enabled:
+                handled = await room_actor_service.dispatch(session.id, session.room_id, {
+                    'action': 'resume',
+                    'user_id': self.user_id,
+                    'reply_channel': self.channel_name
+                })
+                if handled:
+                    return
+
             result = await sync_to_async(game_coordinator_service.resume_game_session)(
                 session_id=session.id,
                 user_id=self.user_id
@@ -460,6 +511,11 @@ class GameRoomConsumer(AsyncWebsocketConsumer):
 
             logger.info(f"[COMPLETE_ROUND] Coordinator returned: has_next={result.get('has_next')}")
 
+            # Раунд уже завершил другой вызывающий - события разосланы им
+            if result.get('duplicate'):
+                logger.info(f"[COMPLETE_ROUND] Round already completed elsewhere, skip broadcast")
+                return
+
             # Broadcast результаты раунда
             if result.get('round_completed_event'):
                 await self._broadcast_game_event('round_completed', result['round_completed_event'])
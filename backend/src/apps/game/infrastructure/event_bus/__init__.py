@@ -1,8 +1,16 @@
-from typing import Dict, List, Type, Callable, Any
+from typing import Dict, List, Type, Callable, Any, Optional
 from collections import defaultdict
+import atexit
 import logging
+import threading
 
 from apps.game.domain.events import DomainEvent
+from django.conf import settings
+from django.db import connections, transaction
+
+from .batching import EventBatcher
+from .executors import AsyncEventExecutor, build_async_executor, run_batch_with_retries
+from .metrics import event_bus_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +33,21 @@ class EventHandler:
         return False
 
 
+class BatchEventHandler(EventHandler):
+    """
+    Обработчик, получающий события пачками.
+
+    EventBus копит события в течение GAME_EVENT_BUS_BATCH_WINDOW секунд
+    (или до GAME_EVENT_BUS_BATCH_SIZE штук) и вызывает handle_batch один раз.
+    """
+
+    def handle(self, event: DomainEvent) -> None:
+        self.handle_batch([event])
+
+    def handle_batch(self, events: List[DomainEvent]) -> None:
+        raise NotImplementedError("Subclasses must implement handle_batch() method")
+
+
 class EventBus:
     """
     для публикации и обработки доменных событий
@@ -36,6 +59,8 @@ class EventBus:
         self._handlers: Dict[Type[DomainEvent], List[EventHandler]] = defaultdict(list)
         self._middlewares: List[Callable] = []
         self._is_enabled = True
+        self._async_executor: Optional[AsyncEventExecutor] = None
+        self._batchers: Dict[EventHandler, EventBatcher] = {}
 
     @classmethod
     def get_instance(cls) -> 'EventBus':
@@ -96,19 +121,21 @@ class EventBus:
             logger.debug(f"No handlers for event: {event_class.__name__}")
             return
 
-        logger.info(f"Publishing event: {event_class.__name__} with {len(handlers)} handlers")
+        logger.debug(f"Publishing event: {event_class.__name__} with {len(handlers)} handlers")
 
         processed_event = self._apply_middlewares(event)
 
         # Вызов всех обработчиков
         for handler in handlers:
             try:
-                if handler.can_handle_async():
-                    # Асинхронная обработка через Celery (будет реализовано позже)
+                if isinstance(handler, BatchEventHandler):
+                    self._handle_batched(handler, processed_event)
+                elif handler.can_handle_async():
                     self._handle_async(handler, processed_event)
                 else:
                     # Синхронная обработка
-                    handler.handle(processed_event)
+                    with event_bus_metrics.timed(handler):
+                        handler.handle(processed_event)
                     logger.debug(
                         f"Handler {handler.__class__.__name__} processed {event_class.__name__}"
                     )
@@ -120,6 +147,28 @@ class EventBus:
                     exc_info=True
                 )
 
+    def deliver(self, handler: EventHandler, events: List[DomainEvent]) -> None:
+        """
+        Передать события одному обработчику напрямую (outbox relay).
+
+        В отличие от publish() без буфера пачек и без перехвата ошибок:
+        вызывающий сам решает, повторять ли доставку.
+        """
+        if not self._is_enabled:
+            logger.debug(f"EventBus disabled, skipping delivery to {handler.__class__.__name__}")
+            return
+
+        if isinstance(handler, BatchEventHandler):
+            with event_bus_metrics.timed(handler):
+                handler.handle_batch(events)
+        elif handler.can_handle_async():
+            for event in events:
+                self._handle_async(handler, event)
+        else:
+            for event in events:
+                with event_bus_metrics.timed(handler):
+                    handler.handle(event)
+
     def publish_all(self, events: List[DomainEvent]) -> None:
         """
         Опубликовать несколько событий.
@@ -133,6 +182,14 @@ class EventBus:
         """
         self._middlewares.append(middleware)
 
+    def enable_metrics(self, slow_threshold_ms: Optional[int] = None) -> None:
+        """
+        Включить сбор метрик: счётчик публикаций (middleware) и замер обработчиков.
+        """
+        event_bus_metrics.enable(slow_threshold_ms)
+        if event_bus_metrics.record_publish not in self._middlewares:
+            self.add_middleware(event_bus_metrics.record_publish)
+
     def _apply_middlewares(self, event: DomainEvent) -> DomainEvent:
         """
         Применить все middleware к событию.
@@ -145,17 +202,73 @@ class EventBus:
                 logger.error(f"Error in middleware: {e}", exc_info=True)
         return result
 
+    def set_async_executor(self, executor: Optional[AsyncEventExecutor]) -> None:
+        """
+        Задать исполнитель асинхронных обработчиков (None - взять из настроек).
+        """
+        self._async_executor = executor
+
+    def _get_async_executor(self) -> AsyncEventExecutor:
+        if self._async_executor is None:
+            self._async_executor = build_async_executor()
+            logger.info(f"EventBus async executor: {self._async_executor.__class__.__name__}")
+        return self._async_executor
+
     def _handle_async(self, handler: EventHandler, event: DomainEvent) -> None:
         """
-        Асинхронная обработка события через Celery.
+        Передать обработчик исполнителю (пул потоков или Celery).
+
+        Публикатор не ждёт обработки: повторы и dead-letter
+        выполняются на стороне исполнителя.
+        """
+        self._get_async_executor().submit(handler, event)
+
+    def _handle_batched(self, handler: BatchEventHandler, event: DomainEvent) -> None:
+        """
+        Добавить событие в буфер пакетного обработчика после коммита.
 
-        TODO: Реализовать после подключения Celery.
+        При нулевом окне буферизация отключена: обработчик вызывается сразу.
         """
-        logger.warning(
-            f"Async handling not implemented yet. "
-            f"Falling back to sync for {handler.__class__.__name__}"
+        if getattr(settings, 'GAME_EVENT_BUS_BATCH_WINDOW', 0.5) <= 0:
+            self._run_batch(handler, [event])
+            return
+
+        batcher = self._get_batcher(handler)
+        transaction.on_commit(lambda: batcher.add(event))
+
+    def _get_batcher(self, handler: BatchEventHandler) -> EventBatcher:
+        batcher = self._batchers.get(handler)
+        if batcher is None:
+            batcher = self._batchers.setdefault(handler, EventBatcher(
+                batch_size=getattr(settings, 'GAME_EVENT_BUS_BATCH_SIZE', 500),
+                window=getattr(settings, 'GAME_EVENT_BUS_BATCH_WINDOW', 0.5),
+                on_flush=lambda events: self._flush_batch(handler, events),
+            ))
+        return batcher
+
+    def _flush_batch(self, handler: BatchEventHandler, events: List[DomainEvent]) -> None:
+        try:
+            self._run_batch(handler, events)
+        finally:
+            # Сброс идёт в потоке таймера - закрываем его подключения к БД
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+
+    def _run_batch(self, handler: BatchEventHandler, events: List[DomainEvent]) -> None:
+        run_batch_with_retries(
+            handler,
+            events,
+            max_retries=getattr(settings, 'GAME_EVENT_BUS_MAX_RETRIES', 3),
+            retry_backoff=getattr(settings, 'GAME_EVENT_BUS_RETRY_BACKOFF', 1.0),
         )
-        handler.handle(event)
+        logger.debug(f"Batch handler {handler.__class__.__name__} processed {len(events)} events")
+
+    def flush_batches(self) -> None:
+        """
+        Немедленно обработать все накопленные пачки (остановка процесса, тесты).
+        """
+        for batcher in list(self._batchers.values()):
+            batcher.flush()
 
     def disable(self) -> None:
         self._is_enabled = False
@@ -170,6 +283,7 @@ class EventBus:
         Очистить все обработчики.(тесты)
         """
         self._handlers.clear()
+        self._batchers.clear()
         logger.info("All handlers cleared")
 
     def get_handlers_count(self, event_class: Type[DomainEvent]) -> int:
@@ -178,6 +292,12 @@ class EventBus:
         """
         return len(self._handlers.get(event_class, []))
 
+    def get_handlers(self, event_class: Type[DomainEvent]) -> List[EventHandler]:
+        """
+        Получить обработчики события.
+        """
+        return list(self._handlers.get(event_class, []))
+
     def get_all_handlers(self) -> Dict[Type[DomainEvent], List[EventHandler]]:
         """
         Получить все зарегистрированные обработчики.
@@ -187,3 +307,6 @@ class EventBus:
 
 event_bus = EventBus.get_instance()
 
+# Не терять накопленные пачки при штатной остановке процесса
+atexit.register(event_bus.flush_batches)
+
@@ -0,0 +1,65 @@
+from typing import Callable, List, Optional
+import logging
+import threading
+
+from apps.game.domain.events import DomainEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventBatcher:
+    """
+    Буфер событий одного пакетного обработчика.
+
+    Пачка отдаётся в on_flush, когда набралось batch_size событий
+    или прошло window секунд с первого события в буфере. Сброс
+    выполняется в фоновом потоке, публикатор не ждёт записи в БД.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        window: float,
+        on_flush: Callable[[List[DomainEvent]], None]
+    ):
+        self.batch_size = batch_size
+        self.window = window
+        self._on_flush = on_flush
+        self._events: List[DomainEvent] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def add(self, event: DomainEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+
+            if len(self._events) >= self.batch_size:
+                self._schedule(0)
+            elif self._timer is None:
+                self._schedule(self.window)
+
+    def flush(self) -> None:
+        """Отдать накопленные события немедленно (в текущем потоке)."""
+        with self._lock:
+            events = self._take()
+
+        if events:
+            self._on_flush(events)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _take(self) -> List[DomainEvent]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        events, self._events = self._events, []
+        return events
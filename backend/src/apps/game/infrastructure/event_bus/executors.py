@@ -0,0 +1,210 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import logging
+import threading
+import time
+from typing import List
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from apps.game.domain.events import DomainEvent
+from .metrics import event_bus_metrics
+from .serialization import get_class_path, serialize_event
+
+logger = logging.getLogger(__name__)
+
+
+def dead_letter(handler_path: str, event, error: Exception, attempts: int) -> None:
+    """
+    Сохранить событие, которое обработчик так и не смог обработать.
+    """
+    from apps.game.models import DeadLetterEvent
+
+    if isinstance(event, dict):
+        event_data = event
+    else:
+        try:
+            event_data = serialize_event(event)
+        except TypeError:
+            event_data = {'event_type': get_class_path(event), 'payload': {'repr': str(event)}}
+
+    logger.error(
+        f"Handler {handler_path} failed {attempts} times for {event_data['event_type']}, "
+        f"moving event to dead-letter: {error}"
+    )
+
+    try:
+        DeadLetterEvent.objects.create(
+            handler=handler_path,
+            event_type=event_data['event_type'],
+            payload=event_data['payload'],
+            error=repr(error),
+            attempts=attempts,
+        )
+    except Exception as e:
+        logger.error(f"Failed to store dead-letter event: {e}", exc_info=True)
+
+
+def run_with_retries(handler, event: DomainEvent, max_retries: int, retry_backoff: float) -> bool:
+    """
+    Выполнить обработчик с повторами (экспоненциальная задержка).
+
+    После max_retries неудачных повторов событие уходит в dead-letter.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with event_bus_metrics.timed(handler):
+                handler.handle(event)
+            return True
+        except Exception as e:
+            if attempt > max_retries:
+                dead_letter(get_class_path(handler), event, e, attempts=attempt)
+                return False
+
+            delay = retry_backoff * 2 ** (attempt - 1)
+            logger.warning(
+                f"Handler {handler.__class__.__name__} failed (attempt {attempt}), "
+                f"retrying in {delay}s: {e}"
+            )
+            time.sleep(delay)
+
+
+def run_batch_with_retries(handler, events: List[DomainEvent], max_retries: int, retry_backoff: float) -> bool:
+    """
+    Выполнить пакетный обработчик с повторами.
+
+    Пачка применяется целиком, поэтому при окончательной
+    неудаче в dead-letter уходит каждое событие пачки.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with event_bus_metrics.timed(handler):
+                handler.handle_batch(events)
+            return True
+        except Exception as e:
+            if attempt > max_retries:
+                for event in events:
+                    dead_letter(get_class_path(handler), event, e, attempts=attempt)
+                return False
+
+            delay = retry_backoff * 2 ** (attempt - 1)
+            logger.warning(
+                f"Batch handler {handler.__class__.__name__} failed on {len(events)} events "
+                f"(attempt {attempt}), retrying in {delay}s: {e}"
+            )
+            time.sleep(delay)
+
+
+class AsyncEventExecutor:
+    """
+    Исполнитель обработчиков с can_handle_async() = True.
+    """
+
+    def __init__(self, max_retries: int = 3, retry_backoff: float = 1.0):
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def submit(self, handler, event: DomainEvent) -> None:
+        raise NotImplementedError("Subclasses must implement submit() method")
+
+    def shutdown(self) -> None:
+        pass
+
+
+class SyncEventExecutor(AsyncEventExecutor):
+    """
+    Выполняет обработчик сразу в потоке публикации (тесты, отладка).
+    """
+
+    def submit(self, handler, event: DomainEvent) -> None:
+        run_with_retries(handler, event, self.max_retries, self.retry_backoff)
+
+
+class ThreadPoolEventExecutor(AsyncEventExecutor):
+    """
+    Ограниченный пул потоков внутри процесса.
+
+    Задача ставится в пул после коммита транзакции, чтобы обработчик
+    видел данные публикатора. Если очередь заполнена - обработчик
+    выполняется в потоке публикации (backpressure вместо потери события).
+    """
+
+    def __init__(self, max_workers: int = 4, queue_size: int = 1000, **kwargs):
+        super().__init__(**kwargs)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="event-bus")
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+
+    def submit(self, handler, event: DomainEvent) -> None:
+        transaction.on_commit(partial(self._enqueue, handler, event))
+
+    def _enqueue(self, handler, event: DomainEvent) -> None:
+        if not self._slots.acquire(blocking=False):
+            logger.warning(
+                f"Event bus queue is full, running {handler.__class__.__name__} synchronously"
+            )
+            run_with_retries(handler, event, self.max_retries, self.retry_backoff)
+            return
+
+        future = self._pool.submit(self._run, handler, event)
+        future.add_done_callback(lambda _: self._slots.release())
+
+    def _run(self, handler, event: DomainEvent) -> None:
+        try:
+            run_with_retries(handler, event, self.max_retries, self.retry_backoff)
+        finally:
+            # У каждого потока пула своё подключение к БД
+            connections.close_all()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+class CeleryEventExecutor(AsyncEventExecutor):
+    """
+    Отправляет обработку в Celery: событие сериализуется,
+    воркер восстанавливает его и создаёт обработчик по пути класса.
+    """
+
+    def submit(self, handler, event: DomainEvent) -> None:
+        transaction.on_commit(partial(self._enqueue, handler, event))
+
+    def _enqueue(self, handler, event: DomainEvent) -> None:
+        from apps.game.tasks import handle_domain_event
+
+        try:
+            handle_domain_event.delay(get_class_path(handler), serialize_event(event))
+        except Exception as e:
+            logger.error(
+                f"Failed to enqueue {handler.__class__.__name__}, running synchronously: {e}",
+                exc_info=True
+            )
+            run_with_retries(handler, event, self.max_retries, self.retry_backoff)
+
+
+def build_async_executor() -> AsyncEventExecutor:
+    """
+    Создать исполнитель по настройке GAME_EVENT_BUS_EXECUTOR (sync | thread | celery).
+    """
+    name = getattr(settings, 'GAME_EVENT_BUS_EXECUTOR', 'thread')
+    options = {
+        'max_retries': getattr(settings, 'GAME_EVENT_BUS_MAX_RETRIES', 3),
+        'retry_backoff': getattr(settings, 'GAME_EVENT_BUS_RETRY_BACKOFF', 1.0),
+    }
+
+    if name == 'sync':
+        return SyncEventExecutor(**options)
+    if name == 'celery':
+        return CeleryEventExecutor(**options)
+    if name != 'thread':
+        logger.warning(f"Unknown GAME_EVENT_BUS_EXECUTOR '{name}', using thread pool")
+
+    return ThreadPoolEventExecutor(
+        max_workers=getattr(settings, 'GAME_EVENT_BUS_THREAD_WORKERS', 4),
+        queue_size=getattr(settings, 'GAME_EVENT_BUS_QUEUE_SIZE', 1000),
+        **options
+    )
@@ -0,0 +1,130 @@
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import bisect
+import logging
+import threading
+import time
+
+from apps.game.domain.events import DomainEvent
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограммы задержек, мс
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_DISABLED = nullcontext()
+
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    errors: int = 0
+    slow: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def as_dict(self) -> dict:
+        histogram = {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)}
+        histogram["le_inf"] = self.buckets[-1]
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.calls, 4) if self.calls else 0.0,
+            'slow': self.slow,
+            'avg_ms': round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'latency_histogram_ms': histogram,
+        }
+
+
+class _HandlerTimer:
+    def __init__(self, metrics: 'EventBusMetrics', handler_name: str):
+        self.metrics = metrics
+        self.handler_name = handler_name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        self.metrics.observe(self.handler_name, elapsed_ms, failed=exc_type is not None)
+        return False
+
+
+class EventBusMetrics:
+    """
+    Метрики EventBus внутри процесса: публикации по типам событий,
+    гистограммы задержек и ошибки по обработчикам.
+
+    Выключенные метрики не измеряют ничего: timed() возвращает
+    пустой контекст, middleware подсчёта публикаций не подключается.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_threshold_ms = 200
+        self._lock = threading.Lock()
+        self._published: Dict[str, int] = defaultdict(int)
+        self._handlers: Dict[str, HandlerStats] = defaultdict(HandlerStats)
+
+    def enable(self, slow_threshold_ms: Optional[int] = None) -> None:
+        if slow_threshold_ms is not None:
+            self.slow_threshold_ms = slow_threshold_ms
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def record_publish(self, event: DomainEvent) -> DomainEvent:
+        """Middleware EventBus: посчитать публикацию события."""
+        if self.enabled:
+            with self._lock:
+                self._published[type(event).__name__] += 1
+        return event
+
+    def timed(self, handler):
+        """Контекст замера одного вызова обработчика."""
+        if not self.enabled:
+            return _DISABLED
+        return _HandlerTimer(self, handler.__class__.__name__)
+
+    def observe(self, handler_name: str, elapsed_ms: float, failed: bool = False) -> None:
+        is_slow = elapsed_ms >= self.slow_threshold_ms
+
+        with self._lock:
+            stats = self._handlers[handler_name]
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            if failed:
+                stats.errors += 1
+            if is_slow:
+                stats.slow += 1
+
+        if is_slow:
+            logger.warning(
+                f"Slow event handler {handler_name}: {elapsed_ms:.1f}ms "
+                f"(threshold {self.slow_threshold_ms}ms)"
+            )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'slow_threshold_ms': self.slow_threshold_ms,
+                'published': dict(self._published),
+                'handlers': {name: stats.as_dict() for name, stats in self._handlers.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._published.clear()
+            self._handlers.clear()
+
+
+event_bus_metrics = EventBusMetrics()
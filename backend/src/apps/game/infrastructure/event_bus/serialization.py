@@ -0,0 +1,46 @@
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime
+from importlib import import_module
+from typing import Any, Dict
+
+from apps.game.domain.events import DomainEvent
+
+
+def get_class_path(obj: Any) -> str:
+    """Полный путь класса объекта: module.ClassName."""
+    cls = obj if isinstance(obj, type) else type(obj)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def import_class(path: str) -> type:
+    """Импортировать класс по пути module.ClassName."""
+    module_path, _, class_name = path.rpartition('.')
+    return getattr(import_module(module_path), class_name)
+
+
+def serialize_event(event: DomainEvent) -> Dict[str, Any]:
+    """
+    Сериализовать событие в JSON-совместимый словарь (для Celery и dead-letter).
+    """
+    if not is_dataclass(event):
+        raise TypeError(f"Event {type(event).__name__} is not a dataclass")
+
+    payload = {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in asdict(event).items()
+    }
+    return {'event_type': get_class_path(event), 'payload': payload}
+
+
+def deserialize_event(data: Dict[str, Any]) -> DomainEvent:
+    """
+    Восстановить событие из serialize_event().
+    """
+    event_class = import_class(data['event_type'])
+    payload = dict(data['payload'])
+
+    for f in fields(event_class):
+        if f.type is datetime and isinstance(payload.get(f.name), str):
+            payload[f.name] = datetime.fromisoformat(payload[f.name])
+
+    return event_class(**payload)
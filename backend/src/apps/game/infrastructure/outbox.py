@@ -0,0 +1,200 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Optional
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.game.domain.events import DomainEvent
+from apps.game.infrastructure.event_bus import event_bus
+from apps.game.infrastructure.event_bus.executors import dead_letter
+from apps.game.infrastructure.event_bus.serialization import deserialize_event, serialize_event
+
+logger = logging.getLogger(__name__)
+
+
+class EventOutbox:
+    """
+    Transactional outbox для доменных событий.
+
+    record() пишет событие в таблицу в транзакции вызывающего кода:
+    при откате событие исчезает вместе с данными. После коммита
+    relay() забирает пачку событий и передаёт их обработчикам event_bus
+    напрямую (пакетные обработчики получают пачку целиком).
+
+    Каждый обработчик вызывается в своей транзакции вместе с отметкой
+    в delivered_to: при ошибке событие повторяется только для обработчиков,
+    которые его ещё не получили, и F()-инкременты статистики не удваиваются.
+    """
+
+    RELAY_SCHEDULED_KEY = "game:outbox:relay_scheduled"
+
+    # Сколько пачка закреплена за relay (упавший relay не держит события вечно)
+    CLAIM_TIMEOUT = timedelta(minutes=5)
+
+    def __init__(self, bus=None):
+        self.bus = bus or event_bus
+
+    def record(self, event: DomainEvent, idempotency_key: Optional[str] = None) -> bool:
+        """
+        Записать событие в outbox. False - событие с таким ключом уже записано.
+        """
+        from apps.game.models import OutboxEvent
+
+        data = serialize_event(event)
+        key = idempotency_key or f"{data['event_type']}:{uuid.uuid4().hex}"
+
+        try:
+            with transaction.atomic():
+                OutboxEvent.objects.create(
+                    event_type=data['event_type'],
+                    payload=data['payload'],
+                    idempotency_key=key,
+                )
+        except IntegrityError:
+            logger.info(f"Outbox event {key} is already recorded, skipping")
+            return False
+
+        transaction.on_commit(self._schedule_relay)
+        return True
+
+    def relay(self, batch_size: Optional[int] = None) -> int:
+        """
+        Доставить одну пачку необработанных событий. Возвращает размер пачки.
+        """
+        from apps.game.models import OutboxEvent
+
+        max_attempts = getattr(settings, 'GAME_EVENT_OUTBOX_MAX_ATTEMPTS', 5)
+
+        rows = self._claim(batch_size or getattr(settings, 'GAME_EVENT_OUTBOX_BATCH_SIZE', 200))
+        if not rows:
+            return 0
+
+        errors: Dict[int, Exception] = {}
+        deliveries = defaultdict(list)
+        for row in rows:
+            try:
+                event = deserialize_event({'event_type': row.event_type, 'payload': row.payload})
+            except Exception as e:
+                errors[row.id] = e
+                continue
+            for handler in self.bus.get_handlers(type(event)):
+                if _handler_name(handler) not in row.delivered_to:
+                    deliveries[handler].append((row, event))
+
+        # Обработчики вызываются вне транзакции с select_for_update
+        for handler, items in deliveries.items():
+            name = _handler_name(handler)
+            try:
+                with transaction.atomic():
+                    self.bus.deliver(handler, [event for _, event in items])
+                    for row, _ in items:
+                        row.delivered_to = row.delivered_to + [name]
+                    OutboxEvent.objects.bulk_update([row for row, _ in items], ['delivered_to'])
+            except Exception as e:
+                for row, _ in items:
+                    row.delivered_to = [delivered for delivered in row.delivered_to if delivered != name]
+                    errors.setdefault(row.id, e)
+                logger.error(f"Failed to deliver {len(items)} outbox events to {name}: {e}", exc_info=True)
+
+        now = timezone.now()
+        for row in rows:
+            row.claimed_until = None
+            error = errors.get(row.id)
+            if error is None:
+                row.processed_at = now
+                continue
+
+            row.last_error = repr(error)
+            if row.attempts >= max_attempts:
+                dead_letter('outbox', {'event_type': row.event_type, 'payload': row.payload},
+                            error, attempts=row.attempts)
+                row.processed_at = now
+            else:
+                # Повтор не раньше, чем через паузу: relay_all не сожжёт попытки за одну серию пачек
+                row.claimed_until = now + self._retry_delay(row.attempts)
+
+        OutboxEvent.objects.bulk_update(rows, ['last_error', 'processed_at', 'claimed_until'])
+
+        logger.debug(f"Relayed {len(rows)} outbox events ({len(errors)} failed)")
+        return len(rows)
+
+    @staticmethod
+    def _retry_delay(attempts: int) -> timedelta:
+        """Экспоненциальная пауза перед повтором: backoff, 2*backoff, 4*backoff..."""
+        backoff = getattr(settings, 'GAME_EVENT_OUTBOX_RETRY_BACKOFF', 5)
+        return timedelta(seconds=backoff * 2 ** (attempts - 1))
+
+    def _claim(self, batch_size: int) -> list:
+        """
+        Закрепить пачку за этим relay: короткая транзакция с select_for_update
+        только на выборку и отметку claimed_until/attempts.
+        """
+        from apps.game.models import OutboxEvent
+
+        now = timezone.now()
+        with transaction.atomic():
+            # Несколько relay не получат одни и те же строки
+            rows = list(
+                OutboxEvent.objects
+                .select_for_update(skip_locked=True)
+                .filter(processed_at__isnull=True)
+                .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+                .order_by('id')[:batch_size]
+            )
+            for row in rows:
+                row.attempts += 1
+                row.claimed_until = now + self.CLAIM_TIMEOUT
+            OutboxEvent.objects.bulk_update(rows, ['attempts', 'claimed_until'])
+        return rows
+
+    def relay_all(self, max_batches: int = 50) -> int:
+        """Разбирать outbox пачками, пока он не опустеет."""
+        batch_size = getattr(settings, 'GAME_EVENT_OUTBOX_BATCH_SIZE', 200)
+        total = 0
+        for _ in range(max_batches):
+            relayed = self.relay(batch_size)
+            total += relayed
+            if relayed < batch_size:
+                break
+        return total
+
+    def purge_processed(self, older_than: timedelta = timedelta(days=7)) -> int:
+        """Удалить давно обработанные события."""
+        from apps.game.models import OutboxEvent
+
+        deleted, _ = OutboxEvent.objects.filter(
+            processed_at__lt=timezone.now() - older_than
+        ).delete()
+        return deleted
+
+    def _schedule_relay(self) -> None:
+        """
+        Запланировать relay после коммита.
+
+        Коммиты в пределах GAME_EVENT_OUTBOX_RELAY_DELAY секунд
+        обслуживает одна задача, запущенная в конце окна.
+        """
+        from apps.game.tasks import relay_outbox_events
+
+        delay = getattr(settings, 'GAME_EVENT_OUTBOX_RELAY_DELAY', 1)
+        if delay > 0 and not cache.add(self.RELAY_SCHEDULED_KEY, 1, timeout=delay):
+            return
+
+        try:
+            relay_outbox_events.apply_async(countdown=delay)
+        except Exception as e:
+            # Событие уже в таблице - его подберёт периодический relay
+            logger.warning(f"Failed to schedule outbox relay: {e}")
+
+
+def _handler_name(handler) -> str:
+    return f"{handler.__class__.__module__}.{handler.__class__.__qualname__}"
+
+
+event_outbox = EventOutbox()
@@ -0,0 +1,43 @@
+from typing import Optional
+from django.core.cache import cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RedisGameResultsRepository:
+    """
+    Итоги завершённых сессий: gzip-сжатый JSON + ETag.
+
+    Завершённая сессия больше не меняется, поэтому запись
+    не инвалидируется - только истекает по TTL.
+    """
+
+    RESULTS_KEY_TEMPLATE = "game:session:{id}:results"
+
+    TTL = 3600 * 24 * 7
+
+    def _get_results_key(self, session_id: int) -> str:
+        return self.RESULTS_KEY_TEMPLATE.format(id=session_id)
+
+    def save(self, session_id: int, etag: str, blob: bytes) -> None:
+        """Сохранить сжатые итоги."""
+        cache.set(
+            self._get_results_key(session_id),
+            {'etag': etag, 'blob': blob},
+            timeout=self.TTL
+        )
+        logger.info(f"Cached results for session {session_id} ({len(blob)} bytes, etag {etag})")
+
+    def get(self, session_id: int) -> Optional[dict]:
+        """Получить {'etag', 'blob'} или None."""
+        entry = cache.get(self._get_results_key(session_id))
+        if not isinstance(entry, dict) or 'blob' not in entry:
+            return None
+        return entry
+
+    def delete(self, session_id: int) -> None:
+        cache.delete(self._get_results_key(session_id))
+
+
+game_results_repository = RedisGameResultsRepository()
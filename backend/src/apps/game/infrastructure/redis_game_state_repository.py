@@ -20,9 +20,14 @@ class RedisGameStateRepository:
     ANSWERS_KEY_TEMPLATE = "game:session:{id}:answers:{round}"
     SCORES_KEY_TEMPLATE = "game:session:{id}:scores"
     PROGRESS_KEY_TEMPLATE = "game:session:{id}:progress"
+    PARTICIPANTS_KEY_TEMPLATE = "game:session:{id}:participants"
+    ANSWERS_COUNT_KEY_TEMPLATE = "game:session:{id}:answers_count:{round}"
+    COMPLETION_LOCK_KEY_TEMPLATE = "game:session:{id}:round:{num}:completion_lock"
+    COMPLETION_RESULT_KEY_TEMPLATE = "game:session:{id}:round:{num}:completion"
 
     # Настройки
     TTL = 3600 * 48
+    COMPLETION_LOCK_TTL = 60
     MAX_QUESTIONS = 1000
 
     def _get_state_key(self, session_id: int) -> str:
@@ -43,6 +48,12 @@ class RedisGameStateRepository:
     def _get_progress_key(self, session_id: int) -> str:
         return self.PROGRESS_KEY_TEMPLATE.format(id=session_id)
 
+    def _get_participants_key(self, session_id: int) -> str:
+        return self.PARTICIPANTS_KEY_TEMPLATE.format(id=session_id)
+
+    def _get_answers_count_key(self, session_id: int, round_number: int) -> str:
+        return self.ANSWERS_COUNT_KEY_TEMPLATE.format(id=session_id, round=round_number)
+
     def save_game_state(self, session_id: int, state_data: dict) -> None:
         """
         Сохранить общее состояние игровой сессии.
@@ -137,6 +148,31 @@ class RedisGameStateRepository:
             logger.info(f"✅ Round {round_number} completed for session {session_id}")
 
 
+    def acquire_round_completion(self, session_id: int, round_number: int) -> bool:
+        """
+        Атомарно занять завершение раунда (SET NX).
+
+        True получает ровно один вызывающий, остальные ждут готовый результат.
+        """
+        key = self.COMPLETION_LOCK_KEY_TEMPLATE.format(id=session_id, num=round_number)
+        return cache.add(key, 1, timeout=self.COMPLETION_LOCK_TTL)
+
+    def release_round_completion(self, session_id: int, round_number: int) -> None:
+        """Снять блокировку (если завершение упало с ошибкой)."""
+        cache.delete(self.COMPLETION_LOCK_KEY_TEMPLATE.format(id=session_id, num=round_number))
+
+    def save_round_completion_result(self, session_id: int, round_number: int, result: dict) -> None:
+        """Сохранить результат завершения раунда для повторных вызовов."""
+        key = self.COMPLETION_RESULT_KEY_TEMPLATE.format(id=session_id, num=round_number)
+        cache.set(key, result, timeout=self.TTL)
+
+    def get_round_completion_result(self, session_id: int, round_number: int) -> Optional[dict]:
+        """Получить результат завершения раунда (None - раунд ещё не завершён)."""
+        key = self.COMPLETION_RESULT_KEY_TEMPLATE.format(id=session_id, num=round_number)
+        result = cache.get(key)
+        return result if isinstance(result, dict) else None
+
+
     def save_player_answer(
         self,
         session_id: int,
@@ -202,6 +238,49 @@ class RedisGameStateRepository:
         return count
 
 
+    def set_participants_count(self, session_id: int, count: int) -> None:
+        """Зафиксировать количество участников сессии."""
+        cache.set(self._get_participants_key(session_id), count, timeout=self.TTL)
+        logger.info(f"Participants count for session {session_id}: {count}")
+
+    def get_participants_count(self, session_id: int) -> Optional[int]:
+        """Получить количество участников (None - счётчик не зафиксирован)."""
+        return cache.get(self._get_participants_key(session_id))
+
+    def adjust_participants_count(self, session_id: int, delta: int) -> Optional[int]:
+        """
+        Изменить количество участников на delta (атомарный INCRBY).
+
+        Если счётчик не зафиксирован - ничего не делает и возвращает None.
+        """
+        key = self._get_participants_key(session_id)
+        try:
+            count = cache.incr(key, delta)
+        except ValueError:
+            return None
+
+        if count < 0:
+            count = 0
+            cache.set(key, count, timeout=self.TTL)
+
+        logger.info(f"Participants count for session {session_id}: {count} ({delta:+d})")
+        return count
+
+    def increment_round_answers_count(self, session_id: int, round_number: int) -> Optional[int]:
+        """
+        Увеличить счётчик ответов на раунд.
+
+        Возвращает None, если счётчика ещё нет (его нужно засеять из БД).
+        """
+        try:
+            return cache.incr(self._get_answers_count_key(session_id, round_number))
+        except ValueError:
+            return None
+
+    def set_round_answers_count(self, session_id: int, round_number: int, count: int) -> None:
+        """Установить счётчик ответов на раунд."""
+        cache.set(self._get_answers_count_key(session_id, round_number), count, timeout=self.TTL)
+
     def initialize_player_scores(self, session_id: int, user_ids: List[int]) -> None:
         """Инициализировать очки для всех игроков (0 баллов)."""
         scores_key = self._get_scores_key(session_id)
@@ -348,6 +427,7 @@ class RedisGameStateRepository:
         cache.delete(self._get_current_key(session_id))
         cache.delete(self._get_scores_key(session_id))
         cache.delete(self._get_progress_key(session_id))
+        cache.delete(self._get_participants_key(session_id))
 
         # Очистить раунды (до 1000 вопросов)
         for round_num in range(1, self.MAX_QUESTIONS + 1):
@@ -356,6 +436,9 @@ class RedisGameStateRepository:
                 break
             cache.delete(round_key)
             cache.delete(self._get_answers_key(session_id, round_num))
+            cache.delete(self._get_answers_count_key(session_id, round_num))
+            cache.delete(self.COMPLETION_LOCK_KEY_TEMPLATE.format(id=session_id, num=round_num))
+            cache.delete(self.COMPLETION_RESULT_KEY_TEMPLATE.format(id=session_id, num=round_num))
 
         logger.info(f"🗑️ Cleared all data for session {session_id}")
 
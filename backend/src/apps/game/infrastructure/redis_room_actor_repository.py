@@ -0,0 +1,172 @@
+from typing import Optional
+from django.core.cache import cache
+import json
+import logging
+
+from apps.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class RedisRoomActorRepository:
+    """
+    Аренда (lease) игровой сессии и чекпоинт состояния её владельца.
+
+    Значение аренды - имя канала владельца в channel layer,
+    по нему остальные процессы пересылают команды.
+
+    В Redis проверка владельца и продление/удаление/запись чекпоинта
+    выполняются одним Lua-скриптом, поэтому процесс, у которого аренда
+    истекла и перешла другому, не продлит и не затрёт чужую аренду.
+    Без Redis (LocMemCache) используется cache API.
+    """
+
+    LEASE_KEY_TEMPLATE = "game:session:{id}:owner"
+    CHECKPOINT_KEY_TEMPLATE = "game:session:{id}:actor"
+
+    CHECKPOINT_TTL = 3600 * 48
+
+    # KEYS[1] - аренда, ARGV[1] - владелец, ARGV[2] - TTL
+    RENEW_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('EXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+
+    # KEYS[1] - аренда, ARGV[1] - владелец
+    RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    # KEYS[1] - аренда, KEYS[2] - чекпоинт, ARGV[1] - владелец, ARGV[2] - состояние, ARGV[3] - TTL
+    CHECKPOINT_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, client_factory=get_redis_client):
+        self._client_factory = client_factory
+
+    @property
+    def client(self):
+        return self._client_factory()
+
+    def _get_lease_key(self, session_id: int) -> str:
+        return self.LEASE_KEY_TEMPLATE.format(id=session_id)
+
+    def _get_checkpoint_key(self, session_id: int) -> str:
+        return self.CHECKPOINT_KEY_TEMPLATE.format(id=session_id)
+
+    def acquire_lease(self, session_id: int, owner: str, ttl: int) -> Optional[str]:
+        """
+        Попытаться занять сессию. Возвращает текущего владельца
+        (owner, если аренда досталась нам).
+        """
+        key = self._get_lease_key(session_id)
+        client = self.client
+
+        # Две попытки: аренда могла истечь между add и get
+        for _ in range(2):
+            if client is not None:
+                acquired = client.set(key, owner, nx=True, ex=ttl)
+            else:
+                acquired = cache.add(key, owner, timeout=ttl)
+            if acquired:
+                logger.info(f"Session {session_id} leased by {owner}")
+                return owner
+
+            current = self.get_owner(session_id)
+            if current is not None:
+                return current
+
+        return None
+
+    def renew_lease(self, session_id: int, owner: str, ttl: int) -> bool:
+        """Продлить аренду, если она всё ещё принадлежит owner."""
+        key = self._get_lease_key(session_id)
+        client = self.client
+        if client is not None:
+            return bool(client.eval(self.RENEW_SCRIPT, 1, key, owner, ttl))
+
+        if cache.get(key) != owner:
+            return False
+        return cache.touch(key, ttl)
+
+    def get_owner(self, session_id: int) -> Optional[str]:
+        """Получить текущего владельца сессии."""
+        key = self._get_lease_key(session_id)
+        client = self.client
+        if client is None:
+            return cache.get(key)
+
+        owner = client.get(key)
+        return owner.decode('utf-8') if isinstance(owner, bytes) else owner
+
+    def release_lease(self, session_id: int, owner: str) -> None:
+        """Освободить аренду (только своего владельца)."""
+        key = self._get_lease_key(session_id)
+        client = self.client
+        if client is not None:
+            released = bool(client.eval(self.RELEASE_SCRIPT, 1, key, owner))
+        else:
+            released = cache.get(key) == owner
+            if released:
+                cache.delete(key)
+
+        if released:
+            logger.info(f"Session {session_id} released by {owner}")
+
+    def save_checkpoint(self, session_id: int, state: dict, owner: Optional[str] = None) -> bool:
+        """
+        Сохранить чекпоинт состояния владельца.
+
+        Если передан owner - только пока аренда принадлежит ему
+        (False - аренда потеряна, чекпоинт не записан).
+        """
+        key = self._get_checkpoint_key(session_id)
+        client = self.client
+
+        if client is None:
+            if owner is not None and cache.get(self._get_lease_key(session_id)) != owner:
+                return False
+            cache.set(key, state, timeout=self.CHECKPOINT_TTL)
+            return True
+
+        payload = json.dumps(state)
+        if owner is None:
+            client.set(key, payload, ex=self.CHECKPOINT_TTL)
+            return True
+
+        saved = client.eval(
+            self.CHECKPOINT_SCRIPT, 2, self._get_lease_key(session_id), key, owner, payload, self.CHECKPOINT_TTL
+        )
+        return bool(saved)
+
+    def get_checkpoint(self, session_id: int) -> Optional[dict]:
+        """Получить последний чекпоинт."""
+        key = self._get_checkpoint_key(session_id)
+        client = self.client
+        if client is None:
+            state = cache.get(key)
+        else:
+            raw = client.get(key)
+            state = json.loads(raw) if raw else None
+        return state if isinstance(state, dict) else None
+
+    def delete_checkpoint(self, session_id: int) -> None:
+        key = self._get_checkpoint_key(session_id)
+        client = self.client
+        if client is None:
+            cache.delete(key)
+        else:
+            client.delete(key)
+
+
+room_actor_repository = RedisRoomActorRepository()
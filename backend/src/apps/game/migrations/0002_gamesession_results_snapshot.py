@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='results_snapshot',
+            field=models.JSONField(blank=True, editable=False, help_text='Итоги завершённой игры (материализуются при завершении)', null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0002_gamesession_results_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadLetterEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('handler', models.CharField(help_text='Путь класса обработчика', max_length=255)),
+                ('event_type', models.CharField(help_text='Путь класса события', max_length=255)),
+                ('payload', models.JSONField(help_text='Сериализованное событие')),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
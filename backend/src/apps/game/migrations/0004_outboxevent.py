@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0003_deadletterevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(help_text='Путь класса события', max_length=255)),
+                ('payload', models.JSONField(help_text='Сериализованное событие')),
+                ('idempotency_key', models.CharField(help_text='Ключ идемпотентности: одно логическое событие записывается один раз', max_length=255, unique=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['processed_at', 'id'], name='game_outbox_process_0ae4d7_idx')],
+            },
+        ),
+    ]
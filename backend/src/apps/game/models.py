@@ -42,6 +42,12 @@ class GameSession(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
+    results_snapshot = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Итоги завершённой игры (материализуются при завершении)"
+    )
 
     class Meta:
         ordering = ["-created_at"]
@@ -223,8 +229,14 @@ class PlayerAnswer(models.Model):
         return self.points_earned
 
     def publish_answered_event(self):
+        """
+        Записать QuestionAnsweredEvent в outbox (в текущей транзакции).
+
+        Обработчики получат событие только после коммита; при откате
+        транзакции событие исчезает вместе с ответом.
+        """
         from apps.game.domain.events import QuestionAnsweredEvent
-        from apps.game.infrastructure.event_bus import event_bus
+        from apps.game.infrastructure.outbox import event_outbox
 
         event = QuestionAnsweredEvent(
             session_id=self.round.session_id,
@@ -237,7 +249,7 @@ class PlayerAnswer(models.Model):
             is_first_answer=(self.user_id == self.round.first_answer_user_id)
         )
 
-        event_bus.publish(event)
+        event_outbox.record(event, idempotency_key=f"answer:{self.pk}")
 
 
 class PlayerGameStats(models.Model):
@@ -291,6 +303,20 @@ class PlayerGameStats(models.Model):
     def __str__(self):
         return f"{self.user} in Game #{self.session_id}: {self.total_points} pts (Rank: {self.rank or 'TBD'})"
 
+    @classmethod
+    def apply_answer(cls, session_id: int, user_id: int, answer: PlayerAnswer) -> bool:
+        """
+        Учесть ответ одним UPDATE через F() (без чтения строки).
+
+        Возвращает False, если статистики игрока ещё нет.
+        """
+        updated = cls.objects.filter(session_id=session_id, user_id=user_id).update(
+            total_points=models.F("total_points") + answer.points_earned,
+            correct_answers=models.F("correct_answers") + int(answer.is_correct),
+            wrong_answers=models.F("wrong_answers") + int(not answer.is_correct),
+        )
+        return updated > 0
+
     def update_from_answer(self, answer: PlayerAnswer):
         if answer.is_correct:
             self.correct_answers += 1
@@ -304,3 +330,59 @@ class PlayerGameStats(models.Model):
         self.completed_at = timezone.now()
         self.save(update_fields=["completed_at"])
 
+
+
+class DeadLetterEvent(models.Model):
+    """Событие, которое асинхронный обработчик не смог обработать после всех повторов."""
+
+    handler = models.CharField(max_length=255, help_text="Путь класса обработчика")
+    event_type = models.CharField(max_length=255, help_text="Путь класса события")
+    payload = models.JSONField(help_text="Сериализованное событие")
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.event_type} -> {self.handler} ({self.attempts} attempts)"
+
+
+class OutboxEvent(models.Model):
+    """
+    Доменное событие в outbox: пишется в той же транзакции, что и изменения,
+    и публикуется relay после коммита (at-least-once).
+    """
+
+    event_type = models.CharField(max_length=255, help_text="Путь класса события")
+    payload = models.JSONField(help_text="Сериализованное событие")
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Ключ идемпотентности: одно логическое событие записывается один раз"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    delivered_to = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Обработчики, уже получившие событие: при повторе они пропускаются"
+    )
+    claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Событие разбирает relay до этого момента"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["processed_at", "id"]),
+        ]
+
+    def __str__(self):
+        state = "processed" if self.processed_at else "pending"
+        return f"{self.event_type} [{self.idempotency_key}] ({state})"
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from .models import GameSession, GameRound, PlayerAnswer, PlayerGameStats
+from apps.questions.models import AnswerOption
 from apps.users.serializers import MeSerializer as UserSerializer
 from apps.questions.serializers import QuestionSerializer
+from apps.game.application.services.session_participants_service import session_participants_service
 
 
 class GameSessionSerializer(serializers.ModelSerializer):
@@ -9,7 +11,7 @@ class GameSessionSerializer(serializers.ModelSerializer):
 
     room_name = serializers.CharField(source='room.name', read_only=True)
     quiz_title = serializers.CharField(source='quiz.title', read_only=True)
-    total_questions = serializers.SerializerMethodField()
+    total_questions = serializers.IntegerField(source='quiz.question_count', read_only=True)
     current_round = serializers.SerializerMethodField()
     players_count = serializers.SerializerMethodField()
 
@@ -32,11 +34,14 @@ class GameSessionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'started_at', 'finished_at']
 
-    def get_total_questions(self, obj):
-        return obj.quiz.questions.count()
-
     def get_current_round(self, obj):
         if obj.status in [GameSession.Status.PLAYING, GameSession.Status.PAUSED]:
+            # Списки подгружают текущий раунд через Prefetch(to_attr='current_rounds')
+            if hasattr(obj, 'current_rounds'):
+                if not obj.current_rounds:
+                    return None
+                return GameRoundSerializer(obj.current_rounds[0]).data
+
             try:
                 current_round = obj.rounds.get(round_number=obj.current_question_index + 1)
                 return GameRoundSerializer(current_round).data
@@ -45,6 +50,8 @@ class GameSessionSerializer(serializers.ModelSerializer):
         return None
 
     def get_players_count(self, obj):
+        if hasattr(obj, 'players_total'):
+            return obj.players_total
         return obj.player_stats.count()
 
 
@@ -73,6 +80,8 @@ class GameRoundSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'started_at', 'completed_at']
 
     def get_answers_count(self, obj):
+        if hasattr(obj, 'answers_total'):
+            return obj.answers_total
         return obj.answers.count()
 
     def get_time_remaining(self, obj):
@@ -107,24 +116,23 @@ class PlayerAnswerSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_correct', 'points_earned', 'answered_at']
 
 
-class PlayerAnswerCreateSerializer(serializers.ModelSerializer):
-    """Сериализатор для создания ответа игрока"""
+class PlayerAnswerCreateSerializer(serializers.Serializer):
+    """
+    Сериализатор для создания ответа игрока.
 
-    class Meta:
-        model = PlayerAnswer
-        fields = ['selected_option']
+    Ожидает в context раунд с аннотациями выбранного варианта
+    (option_question_id, option_is_correct, option_text), поэтому
+    create() делает один INSERT и одно UPDATE статистики.
+    """
 
-    def validate_selected_option(self, value):
-        round_id = self.context.get('round_id')
-        if not round_id:
-            raise serializers.ValidationError("Round ID not provided in context")
+    selected_option = serializers.IntegerField(min_value=1)
 
-        try:
-            game_round = GameRound.objects.get(id=round_id)
-        except GameRound.DoesNotExist:
-            raise serializers.ValidationError("Round not found")
+    def validate_selected_option(self, value):
+        game_round = self.context.get('round')
+        if game_round is None:
+            raise serializers.ValidationError("Round not provided in context")
 
-        if value.question_id != game_round.question_id:
+        if game_round.option_question_id != game_round.question_id:
             raise serializers.ValidationError(
                 "Selected option does not belong to the current question"
             )
@@ -132,38 +140,48 @@ class PlayerAnswerCreateSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        """Создаем ответ с автоматическим расчетом очков"""
+        """Создаем ответ с заранее рассчитанными очками"""
         from django.utils import timezone
 
         round_obj = self.context['round']
         user = self.context['user']
-        selected_option = validated_data['selected_option']
 
         if round_obj.started_at:
             time_taken = (timezone.now() - round_obj.started_at).total_seconds()
         else:
             time_taken = 0
 
-        answer = PlayerAnswer.objects.create(
+        answer = PlayerAnswer(
             round=round_obj,
             user=user,
-            selected_option=selected_option,
-            is_correct=selected_option.is_correct,
+            selected_option=AnswerOption(
+                id=validated_data['selected_option'],
+                question_id=round_obj.question_id,
+                text=round_obj.option_text,
+                is_correct=round_obj.option_is_correct,
+            ),
+            is_correct=round_obj.option_is_correct,
             time_taken=time_taken
         )
-
         answer.calculate_points()
-        answer.save()
+        answer.save(force_insert=True)
 
-        if answer.is_correct and not round_obj.first_answer_user:
+        if answer.is_correct and not round_obj.first_answer_user_id:
+            GameRound.objects.filter(
+                id=round_obj.id,
+                first_answer_user__isnull=True
+            ).update(first_answer_user=user)
             round_obj.first_answer_user = user
-            round_obj.save(update_fields=['first_answer_user'])
 
-        stats, _ = PlayerGameStats.objects.get_or_create(
-            session=round_obj.session,
-            user=user
-        )
-        stats.update_from_answer(answer)
+        if not PlayerGameStats.apply_answer(round_obj.session_id, user.id, answer):
+            stats, created = PlayerGameStats.objects.get_or_create(
+                session_id=round_obj.session_id,
+                user=user
+            )
+            stats.update_from_answer(answer)
+            if created:
+                # Вошёл после старта: с этого ответа раунд ждёт и его
+                session_participants_service.add_player(round_obj.session_id)
 
         return answer
 
@@ -219,7 +237,7 @@ class GameStartSerializer(serializers.Serializer):
         if quiz.status != Quiz.Status.PUBLISHED:
             raise serializers.ValidationError("Quiz is not published")
 
-        if quiz.questions.count() == 0:
+        if quiz.question_count == 0:
             raise serializers.ValidationError("Quiz has no questions")
 
         return value
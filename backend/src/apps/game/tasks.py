@@ -112,9 +112,25 @@ def start_round_timer(self, session_id: int, room_id: int, round_number: int, du
 
         logger.info(f"Время раунда {round_number} истекло, автозавершение...")
 
+        # В режиме актора раунд завершает владелец сессии
+        from apps.game.application.services.room_actor_service import room_actor_service
+        dispatched = room_actor_service.dispatch_from_sync(session_id, {
+            'action': 'complete_round',
+            'room_id': room_id,
+            'round_number': round_number,
+            'reason': 'time_expired'
+        })
+        if dispatched:
+            logger.info(f"Автозавершение раунда {round_number} передано владельцу сессии {session_id}")
+            return
+
         coordinator = GameCoordinatorService()
         result = coordinator.auto_complete_round(session_id, round_number, reason='time_expired')
 
+        if result and result.get('duplicate'):
+            logger.info(f"Раунд {round_number} уже завершен другим обработчиком")
+            return
+
         async_to_sync(channel_layer.group_send)(
             room_group_name,
             {
@@ -221,3 +237,57 @@ def notify_inactive_players():
     logger.info(f"Отправлено {notified_count} уведомлений о неактивности")
     return notified_count
 
+
+
+@shared_task(bind=True, max_retries=None)
+def handle_domain_event(self, handler_path: str, event_data: dict):
+    """
+    Выполнить обработчик доменного события (CeleryEventExecutor).
+
+    После GAME_EVENT_BUS_MAX_RETRIES неудачных повторов событие уходит в dead-letter.
+    """
+    from django.conf import settings
+    from apps.game.infrastructure.event_bus.executors import dead_letter
+    from apps.game.infrastructure.event_bus.metrics import event_bus_metrics
+    from apps.game.infrastructure.event_bus.serialization import deserialize_event, import_class
+
+    handler = import_class(handler_path)()
+    event = deserialize_event(event_data)
+
+    try:
+        with event_bus_metrics.timed(handler):
+            handler.handle(event)
+    except Exception as e:
+        max_retries = getattr(settings, 'GAME_EVENT_BUS_MAX_RETRIES', 3)
+        if self.request.retries >= max_retries:
+            dead_letter(handler_path, event_data, e, attempts=self.request.retries + 1)
+            return
+
+        backoff = getattr(settings, 'GAME_EVENT_BUS_RETRY_BACKOFF', 1.0)
+        raise self.retry(exc=e, countdown=backoff * 2 ** self.request.retries)
+
+
+@shared_task
+def relay_outbox_events():
+    """
+    Опубликовать накопленные события outbox.
+
+    Запускается после коммитов и периодически (подбирает события,
+    relay которых не удалось запланировать).
+    """
+    from apps.game.infrastructure.outbox import event_outbox
+
+    relayed = event_outbox.relay_all()
+    if relayed:
+        logger.info(f"Relayed {relayed} outbox events")
+    return relayed
+
+
+@shared_task
+def purge_outbox_events():
+    """Удалить обработанные события outbox старше недели."""
+    from apps.game.infrastructure.outbox import event_outbox
+
+    deleted = event_outbox.purge_processed()
+    logger.info(f"Purged {deleted} processed outbox events")
+    return deleted
@@ -0,0 +1,169 @@
+import threading
+
+import pytest
+from model_bakery import baker
+
+from apps.game.application.event_handlers import (
+    UpdateGlobalUserStatsOnAnswerHandler,
+    UpdatePlayerStatsOnAnswerHandler,
+)
+from apps.game.domain.events import QuestionAnsweredEvent
+from apps.game.infrastructure.event_bus import EventBus, EventHandler
+from apps.game.infrastructure.event_bus.executors import SyncEventExecutor, ThreadPoolEventExecutor
+from apps.game.infrastructure.event_bus.metrics import event_bus_metrics
+from apps.game.infrastructure.event_bus.serialization import deserialize_event, serialize_event
+from apps.game.models import DeadLetterEvent, GameSession, PlayerGameStats
+from apps.game.tasks import handle_domain_event
+
+
+def make_event(session_id=1, user_id=3, is_correct=True, points_earned=100):
+    return QuestionAnsweredEvent(
+        session_id=session_id,
+        round_id=2,
+        user_id=user_id,
+        answer_id=4,
+        is_correct=is_correct,
+        points_earned=points_earned,
+        time_taken=1.5,
+        is_first_answer=False,
+    )
+
+
+class SlowHandler(EventHandler):
+    def __init__(self):
+        self.release = threading.Event()
+        self.done = threading.Event()
+
+    def handle(self, event):
+        self.release.wait(timeout=5)
+        self.done.set()
+
+    def can_handle_async(self):
+        return True
+
+
+class FailingHandler(EventHandler):
+    calls = 0
+
+    def handle(self, event):
+        FailingHandler.calls += 1
+        raise RuntimeError("boom")
+
+    def can_handle_async(self):
+        return True
+
+
+@pytest.mark.django_db
+def test_publish_does_not_wait_for_async_handler(django_capture_on_commit_callbacks):
+    bus = EventBus()
+    executor = ThreadPoolEventExecutor(max_workers=1, queue_size=1, retry_backoff=0)
+    bus.set_async_executor(executor)
+    handler = SlowHandler()
+    bus.subscribe(QuestionAnsweredEvent, handler)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bus.publish(make_event())
+
+    assert not handler.done.is_set()
+
+    handler.release.set()
+    executor.shutdown()
+    assert handler.done.is_set()
+
+
+def test_event_serialization_roundtrip():
+    event = make_event()
+
+    assert deserialize_event(serialize_event(event)) == event
+
+
+@pytest.mark.django_db
+def test_failing_handler_is_retried_and_dead_lettered():
+    FailingHandler.calls = 0
+    bus = EventBus()
+    bus.set_async_executor(SyncEventExecutor(max_retries=2, retry_backoff=0))
+    bus.subscribe(QuestionAnsweredEvent, FailingHandler())
+
+    event = make_event()
+    bus.publish(event)
+
+    assert FailingHandler.calls == 3
+    dead = DeadLetterEvent.objects.get()
+    assert dead.handler.endswith("FailingHandler")
+    assert dead.attempts == 3
+    assert deserialize_event({"event_type": dead.event_type, "payload": dead.payload}) == event
+
+
+@pytest.mark.django_db
+def test_celery_task_dead_letters_after_retries(settings):
+    settings.GAME_EVENT_BUS_MAX_RETRIES = 1
+    FailingHandler.calls = 0
+    handler_path = f"{FailingHandler.__module__}.FailingHandler"
+
+    handle_domain_event.apply(args=[handler_path, serialize_event(make_event())], throw=False)
+
+    assert FailingHandler.calls == 2
+    assert DeadLetterEvent.objects.get().attempts == 2
+
+
+@pytest.mark.django_db
+def test_answer_events_coalesced_into_one_update_per_table(
+    settings, django_capture_on_commit_callbacks, django_assert_num_queries
+):
+    settings.GAME_EVENT_BUS_BATCH_WINDOW = 60
+    alice = baker.make("users.User", nickname="alice")
+    bob = baker.make("users.User", nickname="bob")
+    session = baker.make(GameSession, room__host=alice, quiz__author=alice)
+    PlayerGameStats.objects.create(session=session, user=alice)
+    PlayerGameStats.objects.create(session=session, user=bob)
+
+    bus = EventBus()
+    bus.subscribe(QuestionAnsweredEvent, UpdatePlayerStatsOnAnswerHandler())
+    bus.subscribe(QuestionAnsweredEvent, UpdateGlobalUserStatsOnAnswerHandler())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bus.publish(make_event(session.id, alice.id, True, 100))
+        bus.publish(make_event(session.id, alice.id, False, 0))
+        bus.publish(make_event(session.id, alice.id, True, 50))
+        bus.publish(make_event(session.id, bob.id, True, 70))
+
+    with django_assert_num_queries(2):
+        bus.flush_batches()
+
+    alice_stats = PlayerGameStats.objects.get(session=session, user=alice)
+    assert (alice_stats.total_points, alice_stats.correct_answers, alice_stats.wrong_answers) == (150, 2, 1)
+    assert PlayerGameStats.objects.get(session=session, user=bob).total_points == 70
+
+    alice.refresh_from_db()
+    bob.refresh_from_db()
+    assert (alice.total_points, bob.total_points) == (150, 70)
+
+
+@pytest.mark.django_db
+def test_metrics_record_publishes_latency_and_errors(api):
+    FailingHandler.calls = 0
+    bus = EventBus()
+    bus.set_async_executor(SyncEventExecutor(max_retries=0, retry_backoff=0))
+    bus.subscribe(QuestionAnsweredEvent, FailingHandler())
+    bus.enable_metrics(slow_threshold_ms=0)
+
+    try:
+        bus.publish(make_event())
+        bus.publish(make_event())
+
+        snapshot = event_bus_metrics.snapshot()
+        assert snapshot["published"]["QuestionAnsweredEvent"] == 2
+        handler_stats = snapshot["handlers"]["FailingHandler"]
+        assert handler_stats["calls"] == 2
+        assert handler_stats["errors"] == 2
+        assert handler_stats["slow"] == 2
+        assert sum(handler_stats["latency_histogram_ms"].values()) == 2
+
+        admin = baker.make("users.User", nickname="admin", is_staff=True)
+        api.force_authenticate(admin)
+        res = api.get("/api/game/event-bus/metrics/")
+        assert res.status_code == 200
+        assert res.data["handlers"]["FailingHandler"]["error_rate"] == 1.0
+    finally:
+        event_bus_metrics.disable()
+        event_bus_metrics.reset()
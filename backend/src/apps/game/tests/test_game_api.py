@@ -6,6 +6,7 @@ from django.utils import timezone
 from apps.rooms.models import Room, RoomParticipant
 from apps.questions.models import Quiz, Question, AnswerOption, QuizQuestion
 from apps.game.models import GameSession, GameRound, PlayerAnswer
+from apps.game.application.services.session_participants_service import session_participants_service
 
 
 @pytest.mark.django_db
@@ -90,6 +91,30 @@ def test_start_game_success(auth_client, user):
     assert rounds.first().question == questions[0]
 
 
+@pytest.mark.django_db
+def test_start_game_query_count_independent_of_size(api, user, django_assert_max_num_queries):
+    """
+    Раунды и статистика игроков создаются пачкой: число запросов
+    не растёт с количеством вопросов и участников.
+    """
+    players = [baker.make("users.User", nickname=f"player{i}") for i in range(10)]
+    room = create_room_with_participants(host=user, participants=players)
+    quiz, questions = create_quiz_with_questions(author=user, count=10)
+
+    api.force_authenticate(user)
+    with django_assert_max_num_queries(13):
+        res = api.post(f"/api/game/rooms/{room.id}/start/", {"quiz_id": quiz.id}, format="json")
+
+    assert res.status_code == 201
+    assert res.data["players_count"] == 11
+
+    session = GameSession.objects.get(id=res.data["id"])
+    assert list(session.rounds.order_by("round_number").values_list("question_id", flat=True)) == [
+        q.id for q in questions
+    ]
+    assert session.player_stats.count() == 11
+
+
 @pytest.mark.django_db
 def test_start_game_not_host(auth_client, user):
     """
@@ -199,3 +224,122 @@ def test_my_game_sessions(auth_client, user):
 
     assert session1.id in ids
     assert session2.id not in ids
+
+
+@pytest.mark.django_db
+def test_submit_answer_query_budget(api, user, django_assert_max_num_queries):
+    """
+    Ответ через REST укладывается в 3 запроса:
+    раунд с аннотациями, INSERT ответа, UPDATE статистики через F().
+    """
+    p2 = baker.make("users.User", nickname="player2")
+
+    room = create_room_with_participants(host=user, participants=[p2])
+    quiz, questions = create_quiz_with_questions(author=user, count=2)
+
+    session = baker.make(GameSession, room=room, quiz=quiz, status=GameSession.Status.PLAYING)
+    round1 = baker.make(
+        GameRound,
+        session=session,
+        question=questions[0],
+        round_number=1,
+        status=GameRound.Status.ACTIVE,
+        started_at=timezone.now()
+    )
+    stats = baker.make("game.PlayerGameStats", session=session, user=user)
+    baker.make("game.PlayerGameStats", session=session, user=p2)
+
+    session_participants_service.capture(session.id, 2)
+    session_participants_service.start_round(session.id, 1)
+
+    wrong_option = questions[0].options.get(is_correct=False)
+    api.force_authenticate(user)
+
+    with django_assert_max_num_queries(3):
+        res = api.post(
+            f"/api/game/sessions/{session.id}/answer/",
+            {"selected_option": wrong_option.id},
+            format="json"
+        )
+
+    assert res.status_code == 201
+    assert res.data["is_correct"] is False
+    assert res.data["next_question"] is False
+    assert res.data["answer"]["selected_option_text"] == "Wrong"
+
+    stats.refresh_from_db()
+    assert stats.wrong_answers == 1
+    assert PlayerAnswer.objects.filter(round=round1, user=user).count() == 1
+
+
+@pytest.mark.django_db
+def test_submit_answer_option_from_other_question(auth_client, user):
+    room = create_room_with_participants(host=user)
+    quiz, questions = create_quiz_with_questions(author=user, count=2)
+
+    session = baker.make(GameSession, room=room, quiz=quiz, status=GameSession.Status.PLAYING)
+    baker.make(
+        GameRound,
+        session=session,
+        question=questions[0],
+        round_number=1,
+        status=GameRound.Status.ACTIVE,
+        started_at=timezone.now()
+    )
+
+    foreign_option = questions[1].options.first()
+
+    res = auth_client.post(
+        f"/api/game/sessions/{session.id}/answer/",
+        {"selected_option": foreign_option.id},
+        format="json"
+    )
+
+    assert res.status_code == 400
+    assert "selected_option" in res.data
+
+
+@pytest.mark.django_db
+def test_my_game_sessions_query_budget(api, user, django_assert_max_num_queries):
+    """
+    Число запросов списка сессий не зависит от количества строк.
+    """
+    p2 = baker.make("users.User", nickname="player2")
+    quiz, questions = create_quiz_with_questions(author=user, count=2)
+
+    for _ in range(5):
+        room = create_room_with_participants(host=user, participants=[p2])
+        session = baker.make(
+            GameSession,
+            room=room,
+            quiz=quiz,
+            status=GameSession.Status.PLAYING,
+            current_question_index=0,
+        )
+        round1 = baker.make(
+            GameRound,
+            session=session,
+            question=questions[0],
+            round_number=1,
+            status=GameRound.Status.ACTIVE,
+            started_at=timezone.now()
+        )
+        baker.make("game.PlayerGameStats", session=session, user=user)
+        baker.make("game.PlayerGameStats", session=session, user=p2)
+        baker.make(PlayerAnswer, round=round1, user=p2, selected_option=questions[0].options.first())
+
+    api.force_authenticate(user)
+
+    # count для пагинации, сессии, текущие раунды, варианты ответов
+    with django_assert_max_num_queries(4):
+        res = api.get("/api/game/sessions/my/")
+
+    assert res.status_code == 200
+    assert len(res.data["results"]) == 5
+
+    item = res.data["results"][0]
+    assert item["players_count"] == 2
+    assert item["total_questions"] == 2
+    assert item["current_round"]["round_number"] == 1
+    assert item["current_round"]["answers_count"] == 1
+    assert len(item["current_round"]["question_data"]["options_readonly"]) == 2
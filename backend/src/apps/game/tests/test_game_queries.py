@@ -5,6 +5,8 @@ from model_bakery import baker
 
 from apps.rooms.models import Room, RoomParticipant
 from apps.game.models import GameSession, GameRound, PlayerGameStats
+from apps.game.application.services.game_results_service import game_results_service
+from apps.game.infrastructure.redis_game_results_repository import game_results_repository
 from apps.game.tests.test_session_controls import create_quiz_with_one_question
 
 @pytest.mark.django_db
@@ -235,3 +237,75 @@ def test_get_results_not_participant(auth_client, user):
 
     assert res.status_code == status.HTTP_403_FORBIDDEN
     assert "не являетесь участником" in res.data["detail"].lower()
+
+
+@pytest.mark.django_db
+def test_get_results_finished_served_from_cache(auth_client, user, django_assert_max_num_queries):
+    """
+    Итоги завершённой игры материализуются один раз и дальше
+    отдаются с ETag: повторный запрос с If-None-Match -> 304.
+    """
+    room = baker.make(Room, host=user, status=Room.Status.FINISHED)
+    RoomParticipant.objects.create(room=room, user=user)
+    quiz, question, _ = create_quiz_with_one_question(user)
+
+    session = GameSession.objects.create(
+        room=room,
+        quiz=quiz,
+        status=GameSession.Status.FINISHED,
+        finished_at=timezone.now(),
+    )
+    GameRound.objects.create(
+        session=session,
+        question=question,
+        round_number=1,
+        status=GameRound.Status.COMPLETED,
+    )
+    PlayerGameStats.objects.create(session=session, user=user, total_points=10, rank=1)
+
+    url = f"/api/game/sessions/{session.id}/results/"
+    first = auth_client.get(url)
+    assert first.status_code == status.HTTP_200_OK
+    etag = first["ETag"]
+
+    session.refresh_from_db()
+    assert session.results_snapshot["leaderboard"][0]["total_points"] == 10
+
+    # Изменения в БД после завершения не влияют на отданные итоги
+    PlayerGameStats.objects.filter(session=session).update(total_points=999)
+
+    # Пользователь (JWT) + сессия с признаком участия, итоги из кэша
+    with django_assert_max_num_queries(2):
+        res = auth_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert res.status_code == status.HTTP_200_OK
+    assert res["Content-Encoding"] == "gzip"
+    assert res["ETag"] == etag
+
+    res = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == status.HTTP_304_NOT_MODIFIED
+
+    res = auth_client.get(url)
+    assert res.data["leaderboard"][0]["total_points"] == 10
+
+    # gzip;q=0 - явный отказ от gzip
+    res = auth_client.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+    assert "Content-Encoding" not in res
+    assert res.data["leaderboard"][0]["total_points"] == 10
+
+    res = auth_client.get(url, HTTP_ACCEPT_ENCODING="br, *;q=0.5")
+    assert res["Content-Encoding"] == "gzip"
+
+
+@pytest.mark.django_db
+def test_results_written_to_redis_after_commit(user, django_capture_on_commit_callbacks):
+    room = baker.make(Room, host=user, status=Room.Status.FINISHED)
+    quiz, _, _ = create_quiz_with_one_question(user)
+    session = GameSession.objects.create(room=room, quiz=quiz, status=GameSession.Status.FINISHED)
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        game_results_service.materialize(session)
+    assert game_results_repository.get(session.id) is None
+
+    for callback in callbacks:
+        callback()
+    assert game_results_repository.get(session.id) is not None
@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+
+from apps.game.domain.events import QuestionAnsweredEvent
+from apps.game.infrastructure.event_bus import EventBus, EventHandler
+from apps.game.infrastructure.outbox import EventOutbox
+from apps.game.models import OutboxEvent
+
+
+class RecordingHandler(EventHandler):
+    def __init__(self):
+        self.events = []
+
+    def handle(self, event):
+        self.events.append(event)
+
+
+def make_event(answer_id=1):
+    return QuestionAnsweredEvent(
+        session_id=1,
+        round_id=1,
+        user_id=1,
+        answer_id=answer_id,
+        is_correct=True,
+        points_earned=10,
+        time_taken=2.0,
+        is_first_answer=True,
+    )
+
+
+@pytest.fixture
+def outbox():
+    bus = EventBus()
+    handler = RecordingHandler()
+    bus.subscribe(QuestionAnsweredEvent, handler)
+    outbox = EventOutbox(bus=bus)
+    outbox.handler = handler
+    return outbox
+
+
+@pytest.mark.django_db
+def test_rolled_back_event_is_never_published(outbox):
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            outbox.record(make_event(), idempotency_key="answer:1")
+            raise RuntimeError("rollback")
+
+    assert outbox.relay() == 0
+    assert outbox.handler.events == []
+
+
+@pytest.mark.django_db
+def test_event_relayed_after_commit_once(outbox, django_capture_on_commit_callbacks):
+    event = make_event()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        assert outbox.record(event, idempotency_key="answer:1") is True
+        assert outbox.record(event, idempotency_key="answer:1") is False
+
+    # Relay планируется после коммита
+    assert len(callbacks) == 1
+    assert outbox.handler.events == []
+
+    assert outbox.relay() == 1
+    assert outbox.relay() == 0
+
+    assert outbox.handler.events == [event]
+    assert OutboxEvent.objects.get().processed_at is not None
+
+
+class FlakyHandler(EventHandler):
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.events = []
+
+    def handle(self, event):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("handler failed")
+        self.events.append(event)
+
+
+@pytest.mark.django_db
+def test_failed_delivery_is_retried_only_for_failed_handler(outbox):
+    """
+    Ошибка обработчика не помечает событие обработанным; при повторе
+    обработчик, уже получивший событие, не вызывается ещё раз.
+    """
+    flaky = FlakyHandler(failures=1)
+    outbox.bus.subscribe(QuestionAnsweredEvent, flaky)
+    event = make_event()
+    outbox.record(event, idempotency_key="answer:1")
+
+    assert outbox.relay() == 1
+    row = OutboxEvent.objects.get()
+    assert row.processed_at is None
+    assert row.attempts == 1
+    assert "handler failed" in row.last_error
+    assert outbox.handler.events == [event]
+
+    # До истечения паузы повтора событие не забирается
+    assert row.claimed_until > timezone.now() + timedelta(seconds=3)
+    assert outbox.relay() == 0
+
+    OutboxEvent.objects.update(claimed_until=timezone.now() - timedelta(seconds=1))
+    assert outbox.relay() == 1
+    row.refresh_from_db()
+    assert row.processed_at is not None
+    assert flaky.events == [event]
+    assert outbox.handler.events == [event]
+
+
+@pytest.mark.django_db
+def test_claimed_events_are_skipped_by_other_relays(outbox):
+    outbox.record(make_event(), idempotency_key="answer:1")
+    OutboxEvent.objects.update(claimed_until=timezone.now() + timedelta(minutes=1))
+
+    assert outbox.relay() == 0
+
+    OutboxEvent.objects.update(claimed_until=timezone.now() - timedelta(seconds=1))
+    assert outbox.relay() == 1
+
+
+@pytest.mark.django_db
+def test_relay_all_does_not_burn_retries_of_failing_event(outbox, settings):
+    settings.GAME_EVENT_OUTBOX_BATCH_SIZE = 1
+    outbox.bus.subscribe(QuestionAnsweredEvent, FlakyHandler(failures=10))
+    outbox.record(make_event(), idempotency_key="answer:1")
+
+    # Полная пачка заставила бы relay_all сразу забрать событие снова
+    assert outbox.relay_all() == 1
+
+    row = OutboxEvent.objects.get()
+    assert row.attempts == 1
+    assert row.processed_at is None
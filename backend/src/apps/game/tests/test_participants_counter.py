@@ -0,0 +1,96 @@
+import pytest
+from model_bakery import baker
+
+from apps.rooms.models import Room, RoomParticipant
+from apps.game.models import GameSession, GameRound, PlayerGameStats
+from apps.game.infrastructure.redis_game_state_repository import game_state_repository
+from apps.game.application.services.session_participants_service import session_participants_service
+from apps.game.tests.test_game_api import create_quiz_with_questions, create_room_with_participants
+
+
+@pytest.mark.django_db
+def test_participants_count_captured_on_start_and_updated_on_leave(
+    auth_client, user, django_capture_on_commit_callbacks
+):
+    """
+    Счётчик фиксируется при старте игры и уменьшается при выходе игрока,
+    после чего ответ оставшегося игрока завершает раунд.
+    """
+    p2 = baker.make("users.User")
+    room = create_room_with_participants(host=user, participants=[p2])
+    quiz, questions = create_quiz_with_questions(author=user, count=2)
+
+    res = auth_client.post(f"/api/game/rooms/{room.id}/start/", {"quiz_id": quiz.id}, format="json")
+    assert res.status_code == 201
+    session_id = res.data["id"]
+    assert game_state_repository.get_participants_count(session_id) == 2
+
+    auth_client.force_authenticate(p2)
+    with django_capture_on_commit_callbacks(execute=True):
+        res = auth_client.post(f"/api/rooms/{room.id}/leave/")
+    assert res.status_code == 200
+    assert game_state_repository.get_participants_count(session_id) == 1
+
+    auth_client.force_authenticate(user)
+    GameSession.objects.filter(id=session_id).update(status=GameSession.Status.PLAYING)
+    GameRound.objects.filter(session_id=session_id, round_number=1).update(status=GameRound.Status.ACTIVE)
+
+    wrong_option = questions[0].options.get(is_correct=False)
+    res = auth_client.post(
+        f"/api/game/sessions/{session_id}/answer/",
+        {"selected_option": wrong_option.id},
+        format="json",
+    )
+    assert res.status_code == 201
+    assert res.data["next_question"] is True
+
+
+@pytest.mark.django_db
+def test_participants_count_falls_back_to_database(user):
+    room = baker.make(Room, host=user, status=Room.Status.IN_PROGRESS)
+    player2 = baker.make("users.User", nickname="player2")
+    late = baker.make("users.User", nickname="late_joiner")
+    for participant in (user, player2, late):
+        RoomParticipant.objects.create(room=room, user=participant)
+    quiz, _ = create_quiz_with_questions(author=user, count=1)
+    session = baker.make(GameSession, room=room, quiz=quiz, status=GameSession.Status.PLAYING)
+    # Вошедший после старта без статистики в счётчик не входит
+    PlayerGameStats.objects.create(session=session, user=user)
+    PlayerGameStats.objects.create(session=session, user=player2)
+
+    assert game_state_repository.get_participants_count(session.id) is None
+    assert session_participants_service.get_participants_count(session) == 2
+    assert game_state_repository.get_participants_count(session.id) == 2
+
+
+@pytest.mark.django_db
+def test_late_joiner_does_not_block_round(auth_client, user, django_capture_on_commit_callbacks):
+    """
+    Игрок, вошедший после старта, не увеличивает счётчик участников:
+    ответ единственного игрока со статистикой завершает раунд.
+    """
+    room = create_room_with_participants(host=user)
+    quiz, questions = create_quiz_with_questions(author=user, count=2)
+
+    res = auth_client.post(f"/api/game/rooms/{room.id}/start/", {"quiz_id": quiz.id}, format="json")
+    assert res.status_code == 201
+    session_id = res.data["id"]
+    assert game_state_repository.get_participants_count(session_id) == 1
+
+    late = baker.make("users.User", nickname="late_joiner")
+    RoomParticipant.objects.create(room=room, user=late)
+    with django_capture_on_commit_callbacks(execute=True):
+        session_participants_service.notify_joined(room.id, late.id)
+    assert game_state_repository.get_participants_count(session_id) == 1
+
+    GameSession.objects.filter(id=session_id).update(status=GameSession.Status.PLAYING)
+    GameRound.objects.filter(session_id=session_id, round_number=1).update(status=GameRound.Status.ACTIVE)
+
+    wrong_option = questions[0].options.get(is_correct=False)
+    res = auth_client.post(
+        f"/api/game/sessions/{session_id}/answer/",
+        {"selected_option": wrong_option.id},
+        format="json",
+    )
+    assert res.status_code == 201
+    assert res.data["next_question"] is True
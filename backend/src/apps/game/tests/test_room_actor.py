@@ -0,0 +1,238 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer
+
+from apps.game.application.services import room_actor_service as room_actor_module
+from apps.game.application.services.room_actor_service import GameSessionActor, GameSessionActorState, RoomActorService
+from apps.game.domain.events.game_events import PlayerAnswerSubmitted, AnswerChecked
+from apps.game.infrastructure.redis_room_actor_repository import RedisRoomActorRepository, room_actor_repository
+
+
+class FakeCoordinator:
+    def __init__(self):
+        self.submitted = []
+        self.completed = []
+
+    def submit_answer(self, session_id, user_id, username, answer_option_id, time_taken=0,
+                      check_round_completion=True):
+        self.submitted.append(user_id)
+        return {
+            'answer_submitted_event': PlayerAnswerSubmitted(room_id=1, session_id=session_id, user_id=user_id),
+            'answer_checked_event': AnswerChecked(room_id=1, session_id=session_id, user_id=user_id, is_correct=False),
+            'should_complete_round': False,
+        }
+
+    def complete_current_round(self, session_id, round_number=None):
+        self.completed.append('all_answered')
+        return {'has_next': False}
+
+    def auto_complete_round(self, session_id, round_number, reason='time_expired'):
+        self.completed.append(reason)
+        return {'has_next': False}
+
+
+def test_actor_completes_round_once():
+    """
+    Ответ последнего игрока и таймер приходят одновременно -
+    раунд завершается ровно один раз, повторный ответ отклоняется.
+    """
+    coordinator = FakeCoordinator()
+    state = GameSessionActorState(session_id=1, room_id=1, round_number=1, participants_count=2)
+    actor = GameSessionActor(state, coordinator, InMemoryChannelLayer())
+    actor.ROUND_RESULTS_DELAY = 0
+
+    async def scenario():
+        answer = {'action': 'submit_answer', 'answer_option_id': 5}
+        await actor.handle({**answer, 'user_id': 1})
+        await actor.handle({**answer, 'user_id': 1})
+        await asyncio.gather(
+            actor.handle({**answer, 'user_id': 2}),
+            actor.handle({'action': 'complete_round', 'round_number': 1, 'reason': 'time_expired'}),
+        )
+        await asyncio.sleep(0.01)
+
+    async_to_sync(scenario)()
+
+    assert coordinator.submitted == [1, 2]
+    assert coordinator.completed == ['all_answered']
+    assert actor.finished is True
+    assert room_actor_repository.get_checkpoint(1)['round_completed'] is True
+
+
+class PendingCoordinator(FakeCoordinator):
+    """Раунд завершает другой процесс: результат появляется со второго опроса."""
+
+    def __init__(self):
+        super().__init__()
+        self.polls = 0
+
+    def auto_complete_round(self, session_id, round_number, reason='time_expired'):
+        return {'round_completed_event': None, 'has_next': None, 'next_question_data': None,
+                'duplicate': True, 'pending': True}
+
+    def get_round_completion_result(self, session_id, round_number):
+        self.polls += 1
+        if self.polls < 2:
+            return None
+        return {'round_completed_event': None, 'has_next': False, 'next_question_data': None, 'duplicate': True}
+
+
+def test_actor_waits_for_pending_completion_without_blocking():
+    coordinator = PendingCoordinator()
+    state = GameSessionActorState(session_id=2, room_id=1, round_number=1, participants_count=2)
+    actor = GameSessionActor(state, coordinator, InMemoryChannelLayer())
+    actor.COMPLETION_POLL_INTERVAL = 0
+
+    async_to_sync(actor.handle)({'action': 'complete_round', 'round_number': 1, 'reason': 'time_expired'})
+
+    assert coordinator.polls == 2
+    assert actor.finished is True
+
+
+class SkippingCoordinator(FakeCoordinator):
+    """Хост пропускает вопрос: раунд 1 завершается, открывается раунд 2."""
+
+    def __init__(self):
+        super().__init__()
+        self.paused_by = []
+
+    def complete_current_round(self, session_id, round_number=None):
+        self.completed.append(('skip', round_number))
+        return {'has_next': True, 'next_question_data': {'round_number': round_number + 1}}
+
+    def auto_complete_round(self, session_id, round_number, reason='time_expired'):
+        self.completed.append((reason, round_number))
+        return {'has_next': False}
+
+    def pause_game_session(self, session_id, user_id):
+        self.paused_by.append(user_id)
+        return {'game_paused_event': None}
+
+
+def test_actor_advances_round_when_host_skips_question(monkeypatch):
+    """
+    Пропуск вопроса идёт через актора: в следующем раунде ответ принимается,
+    а таймер этого раунда не отбрасывается как устаревший.
+    """
+    monkeypatch.setattr(room_actor_module, '_load_participants_count', lambda session_id: 2)
+    coordinator = SkippingCoordinator()
+    state = GameSessionActorState(session_id=3, room_id=1, round_number=1, participants_count=2)
+    actor = GameSessionActor(state, coordinator, InMemoryChannelLayer())
+    actor.ROUND_RESULTS_DELAY = 0
+
+    async def scenario():
+        answer = {'action': 'submit_answer', 'answer_option_id': 5, 'user_id': 1}
+        await actor.handle(answer)
+        await actor.handle({'action': 'next_question'})
+        await actor.handle({'action': 'pause', 'user_id': 1})
+        await actor.handle(answer)
+        await actor.handle({'action': 'complete_round', 'round_number': 2, 'reason': 'time_expired'})
+        await asyncio.sleep(0.01)
+
+    async_to_sync(scenario)()
+
+    assert coordinator.submitted == [1, 1]
+    assert coordinator.paused_by == [1]
+    assert coordinator.completed == [('skip', 1), ('time_expired', 2)]
+    assert actor.state.round_number == 2
+    assert actor.finished is True
+
+
+class NoLeaseRepository:
+    def acquire_lease(self, session_id, owner, ttl):
+        return None
+
+
+def test_dispatch_without_lease_falls_back_to_caller():
+    service = RoomActorService(repository=NoLeaseRepository())
+    service._channel_layer = InMemoryChannelLayer()
+    service.owner_channel = 'game-actor.test'
+
+    handled = async_to_sync(service.dispatch)(4, 1, {'action': 'next_question'})
+
+    assert handled is False
+    assert service.actors == {}
+
+
+class FlakyChannelLayer(InMemoryChannelLayer):
+    """Первое чтение очереди падает, как при обрыве связи с Redis."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    async def receive(self, channel):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("redis is down")
+        return await super().receive(channel)
+
+
+def test_receive_loop_survives_channel_errors(monkeypatch):
+    service = RoomActorService()
+    service._channel_layer = FlakyChannelLayer()
+    service.owner_channel = 'game-actor.test'
+    service.RECEIVE_RETRY_DELAY = 0
+    handled = []
+
+    async def handle_forwarded(message):
+        handled.append(message['session_id'])
+
+    monkeypatch.setattr(service, '_handle_forwarded', handle_forwarded)
+
+    async def scenario():
+        loop = asyncio.create_task(service._receive_loop())
+        await service.channel_layer.send(service.owner_channel, {'type': service.COMMAND_TYPE, 'session_id': 5})
+        await asyncio.sleep(0.05)
+        loop.cancel()
+
+    async_to_sync(scenario)()
+
+    assert service.channel_layer.failures == 0
+    assert handled == [5]
+
+
+def test_lease_has_single_owner():
+    assert room_actor_repository.acquire_lease(7, 'owner-a', ttl=30) == 'owner-a'
+    assert room_actor_repository.acquire_lease(7, 'owner-b', ttl=30) == 'owner-a'
+
+    assert room_actor_repository.renew_lease(7, 'owner-b', ttl=30) is False
+    room_actor_repository.release_lease(7, 'owner-b')
+    assert room_actor_repository.get_owner(7) == 'owner-a'
+
+    room_actor_repository.release_lease(7, 'owner-a')
+    assert room_actor_repository.acquire_lease(7, 'owner-b', ttl=30) == 'owner-b'
+
+
+def test_redis_lease_renew_and_release_check_owner(fake_redis):
+    repository = RedisRoomActorRepository(client_factory=lambda: fake_redis)
+
+    assert repository.acquire_lease(7, 'owner-a', ttl=30) == 'owner-a'
+    assert repository.acquire_lease(7, 'owner-b', ttl=30) == 'owner-a'
+
+    assert repository.renew_lease(7, 'owner-b', ttl=300) is False
+    assert fake_redis.ttl(repository._get_lease_key(7)) <= 30
+    assert repository.renew_lease(7, 'owner-a', ttl=300) is True
+    assert fake_redis.ttl(repository._get_lease_key(7)) > 30
+
+    repository.release_lease(7, 'owner-b')
+    assert repository.get_owner(7) == 'owner-a'
+    repository.release_lease(7, 'owner-a')
+    assert repository.get_owner(7) is None
+
+
+def test_redis_checkpoint_is_fenced_by_lease(fake_redis):
+    """Бывший владелец (аренда перешла другому) не перезаписывает чекпоинт."""
+    repository = RedisRoomActorRepository(client_factory=lambda: fake_redis)
+    repository.acquire_lease(7, 'owner-a', ttl=30)
+
+    assert repository.save_checkpoint(7, {'round_number': 1}, 'owner-a') is True
+
+    # Аренда истекла и досталась owner-b
+    fake_redis.delete(repository._get_lease_key(7))
+    repository.acquire_lease(7, 'owner-b', ttl=30)
+
+    assert repository.save_checkpoint(7, {'round_number': 2}, 'owner-b') is True
+    assert repository.save_checkpoint(7, {'round_number': 1}, 'owner-a') is False
+    assert repository.get_checkpoint(7) == {'round_number': 2}
@@ -0,0 +1,68 @@
+import pytest
+from django.utils import timezone
+
+from apps.rooms.models import Room, RoomParticipant
+from apps.game.models import GameSession, GameRound, PlayerGameStats
+from apps.game.application.services.game_coordinator_service import GameCoordinatorService
+from apps.game.infrastructure.redis_game_state_repository import game_state_repository
+from apps.game.tests.test_game_finish import create_single_question_quiz
+from apps.users.models import GameHistory
+
+
+def create_playing_session(user):
+    room = Room.objects.create(name="Room", host=user, status=Room.Status.IN_PROGRESS)
+    RoomParticipant.objects.create(room=room, user=user)
+    quiz, question, _ = create_single_question_quiz(user)
+
+    session = GameSession.objects.create(
+        room=room,
+        quiz=quiz,
+        status=GameSession.Status.PLAYING,
+        current_question_index=1,
+        started_at=timezone.now(),
+    )
+    GameRound.objects.create(
+        session=session,
+        question=question,
+        round_number=1,
+        status=GameRound.Status.ACTIVE,
+        started_at=timezone.now(),
+    )
+    PlayerGameStats.objects.create(session=session, user=user)
+    return session
+
+
+@pytest.mark.django_db
+def test_round_completed_once_for_concurrent_callers(user):
+    """
+    Повторное завершение того же раунда (таймер после "все ответили")
+    не выполняет работу заново и возвращает сохранённый результат.
+    """
+    session = create_playing_session(user)
+    coordinator = GameCoordinatorService()
+
+    first = coordinator.complete_current_round(session.id)
+    second = coordinator.auto_complete_round(session.id, 1)
+
+    assert "duplicate" not in first
+    assert second["duplicate"] is True
+    assert second["round_completed_event"] == first["round_completed_event"]
+    assert GameHistory.objects.filter(session=session).count() == 1
+
+
+@pytest.mark.django_db
+def test_round_completion_in_progress_returns_duplicate(user):
+    session = create_playing_session(user)
+    coordinator = GameCoordinatorService()
+
+    assert game_state_repository.acquire_round_completion(session.id, 1) is True
+
+    result = coordinator.complete_current_round(session.id)
+
+    # Не ждёт завершения другим вызывающим, а сразу возвращает pending
+    assert result["duplicate"] is True
+    assert result["pending"] is True
+    assert result["round_completed_event"] is None
+    assert coordinator.get_round_completion_result(session.id, 1) is None
+    session.refresh_from_db()
+    assert session.status == GameSession.Status.PLAYING
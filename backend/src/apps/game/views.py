@@ -1,9 +1,16 @@
+import json
+
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, PermissionDenied
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
@@ -16,11 +23,18 @@ from .serializers import (
     PlayerAnswerCreateSerializer,
     PlayerGameStatsSerializer,
     GameStartSerializer,
-    GameResultsSerializer,
 )
 from .permissions import IsRoomHost, IsGameParticipant, CanAnswerQuestion
-from apps.rooms.models import Room
-from apps.questions.models import Quiz
+from .application.services.session_participants_service import session_participants_service
+from .application.services.game_results_service import game_results_service
+from .infrastructure.event_bus.metrics import event_bus_metrics
+from .infrastructure.repositories.game_repositories import GameRoundRepository, PlayerGameStatsRepository
+from apps.rooms.models import Room, RoomParticipant
+from apps.users.application.services.global_leaderboard_service import global_leaderboard_service
+from apps.questions.models import Quiz, AnswerOption
+
+game_round_repository = GameRoundRepository()
+player_stats_repository = PlayerGameStatsRepository()
 
 
 @swagger_auto_schema(
@@ -42,7 +56,7 @@ def start_game(request, room_id):
     """
     room = get_object_or_404(Room, id=room_id)
 
-    if room.host != request.user:
+    if room.host_id != request.user.id:
         raise PermissionDenied("Только хост комнаты может запустить игру")
 
     if room.status not in [Room.Status.DRAFT, Room.Status.OPEN]:
@@ -75,27 +89,31 @@ def start_game(request, room_id):
             status=GameSession.Status.WAITING
         )
 
-        # Создаем раунды для всех вопросов
-        quiz_questions = quiz.quizquestion_set.select_related('question').order_by('order')
-
-        for idx, qq in enumerate(quiz_questions, start=1):
-            GameRound.objects.create(
+        # Раунды и статистика создаются пачкой - по одному INSERT на таблицу
+        question_ids = quiz.quizquestion_set.order_by('order').values_list('question_id', flat=True)
+        game_round_repository.bulk_create([
+            GameRound(
                 session=session,
-                question=qq.question,
+                question_id=question_id,
                 round_number=idx,
                 time_limit=30
             )
+            for idx, question_id in enumerate(question_ids, start=1)
+        ])
 
-        participants = room.participants.select_related('user')
-        for participant in participants:
-            PlayerGameStats.objects.create(
-                session=session,
-                user=participant.user
-            )
+        participant_ids = list(room.participants.values_list('user_id', flat=True))
+        player_stats_repository.bulk_create([
+            PlayerGameStats(session=session, user_id=user_id)
+            for user_id in participant_ids
+        ])
 
         room.status = Room.Status.IN_PROGRESS
         room.save(update_fields=['status'])
 
+    session_participants_service.capture(session.id, len(participant_ids))
+    # Статистика только что создана - число игроков известно без COUNT
+    session.players_total = len(participant_ids)
+
     return Response(
         GameSessionSerializer(session).data,
         status=status.HTTP_201_CREATED
@@ -138,6 +156,7 @@ def start_session(request, session_id):
     first_round = session.rounds.filter(round_number=1).first()
     if first_round:
         first_round.start()
+        session_participants_service.start_round(session.id, first_round.round_number)
 
     return Response(GameSessionSerializer(session).data)
 
@@ -222,29 +241,43 @@ def submit_answer(request, session_id):
     """
     Отправить ответ на текущий вопрос
     """
-    session = get_object_or_404(GameSession, id=session_id)
+    try:
+        option_id = int(request.data.get('selected_option'))
+    except (TypeError, ValueError):
+        option_id = None
 
-    if not session.room.participants.filter(user=request.user).exists():
-        raise PermissionDenied("Вы не являетесь участником этой игры")
+    current_round = _get_round_for_answer(session_id, request.user.id, option_id)
 
-    if session.status != GameSession.Status.PLAYING:
-        return Response(
-            {"error": "Игра не идёт"},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    if current_round is None:
+        # Медленный путь только для ошибок: выясняем, что именно не так
+        session = get_object_or_404(GameSession, id=session_id)
 
-    current_round = session.rounds.filter(
-        round_number=session.current_question_index + 1,
-        status=GameRound.Status.ACTIVE
-    ).first()
+        if not session.room.participants.filter(user=request.user).exists():
+            raise PermissionDenied("Вы не являетесь участником этой игры")
+
+        if session.status != GameSession.Status.PLAYING:
+            return Response(
+                {"error": "Игра не идёт"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-    if not current_round:
         return Response(
             {"error": "Активный раунд не найден"},
             status=status.HTTP_404_NOT_FOUND
         )
 
-    if current_round.answers.filter(user=request.user).exists():
+    session = current_round.session
+
+    if not current_round.is_participant:
+        raise PermissionDenied("Вы не являетесь участником этой игры")
+
+    if session.status != GameSession.Status.PLAYING:
+        return Response(
+            {"error": "Игра не идёт"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if current_round.already_answered:
         return Response(
             {"error": "Вы уже ответили на этот вопрос"},
             status=status.HTTP_400_BAD_REQUEST
@@ -254,15 +287,24 @@ def submit_answer(request, session_id):
         data=request.data,
         context={
             'round': current_round,
-            'round_id': current_round.id,
             'user': request.user
         }
     )
     serializer.is_valid(raise_exception=True)
-    answer = serializer.save()
 
-    total_participants = session.player_stats.count()
-    total_answers = current_round.answers.count()
+    try:
+        answer = serializer.save()
+    except IntegrityError:
+        # Параллельный повторный ответ упёрся в уникальный индекс (round, user)
+        return Response(
+            {"error": "Вы уже ответили на этот вопрос"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    total_participants = session_participants_service.get_participants_count(session)
+    total_answers = session_participants_service.register_answer(
+        session.id, current_round.id, current_round.round_number
+    )
 
     should_advance = False
 
@@ -273,7 +315,7 @@ def submit_answer(request, session_id):
         current_round.complete()
 
         next_index = session.current_question_index + 1
-        total_questions = session.quiz.questions.count()
+        total_questions = session.quiz.question_count
 
         if next_index < total_questions:
             session.current_question_index = next_index
@@ -282,6 +324,7 @@ def submit_answer(request, session_id):
             next_round = session.rounds.filter(round_number=next_index + 1).first()
             if next_round:
                 next_round.start()
+                session_participants_service.start_round(session.id, next_round.round_number)
         else:
             session.finish()
             session.room.status = Room.Status.FINISHED
@@ -297,7 +340,7 @@ def submit_answer(request, session_id):
 
             # Создаем записи в историю игр для всех участников
             from apps.users.models import GameHistory
-            total_questions = session.quiz.questions.count()
+            total_questions = session.quiz.question_count
 
             for stats in session.player_stats.all():
                 GameHistory.objects.create(
@@ -311,6 +354,9 @@ def submit_answer(request, session_id):
                     final_rank=stats.rank
                 )
 
+            game_results_service.materialize(session)
+            global_leaderboard_service.refresh_session_players_on_commit(session.id)
+
     response_data = {
         'answer': PlayerAnswerSerializer(answer).data,
         'is_correct': answer.is_correct,
@@ -322,31 +368,111 @@ def submit_answer(request, session_id):
     return Response(response_data, status=status.HTTP_201_CREATED)
 
 
+def _get_round_for_answer(session_id: int, user_id: int, option_id):
+    """
+    Одним запросом: активный раунд с сессией, вопросом и викториной,
+    признаки участия/повторного ответа и данные выбранного варианта.
+    """
+    option = AnswerOption.objects.filter(id=option_id or 0)
+
+    return (
+        GameRound.objects
+        .select_related('session', 'session__quiz', 'question')
+        .annotate(
+            is_participant=Exists(
+                RoomParticipant.objects.filter(room_id=OuterRef('session__room_id'), user_id=user_id)
+            ),
+            already_answered=Exists(
+                PlayerAnswer.objects.filter(round_id=OuterRef('pk'), user_id=user_id)
+            ),
+            option_question_id=Subquery(option.values('question_id')[:1]),
+            option_is_correct=Subquery(option.values('is_correct')[:1]),
+            option_text=Subquery(option.values('text')[:1]),
+        )
+        .filter(
+            session_id=session_id,
+            status=GameRound.Status.ACTIVE,
+            round_number=F('session__current_question_index') + 1,
+        )
+        .first()
+    )
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated, IsGameParticipant])
 def get_results(request, session_id):
     """
     Получить результаты игры
     """
-    session = get_object_or_404(GameSession, id=session_id)
+    session = get_object_or_404(
+        GameSession.objects.annotate(
+            is_participant=Exists(
+                RoomParticipant.objects.filter(room_id=OuterRef('room_id'), user=request.user)
+            )
+        ),
+        id=session_id
+    )
 
-    if not session.room.participants.filter(user=request.user).exists():
+    if not session.is_participant:
         raise PermissionDenied("Вы не являетесь участником этой игры")
 
-    leaderboard = session.player_stats.select_related('user').order_by('-total_points', 'completed_at')
+    if session.status != GameSession.Status.FINISHED:
+        return Response(game_results_service.build_results(session))
 
-    total_rounds = session.rounds.count()
-    completed_rounds = session.rounds.filter(status=GameRound.Status.COMPLETED).count()
+    # Итоги завершённой игры неизменны - отдаём готовый gzip-блоб с ETag
+    entry = game_results_service.get_finished_results(session)
+    etag = quote_etag(entry.etag)
 
-    data = {
-        'session': session,
-        'leaderboard': leaderboard,
-        'total_rounds': total_rounds,
-        'completed_rounds': completed_rounds,
-    }
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    elif request.accepted_renderer.format == 'json' and _accepts_gzip(request.headers.get('Accept-Encoding', '')):
+        response = HttpResponse(entry.blob, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(json.loads(entry.content))
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
 
-    serializer = GameResultsSerializer(data)
-    return Response(serializer.data)
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Принимает ли клиент gzip по Accept-Encoding (RFC 9110, с учётом q-значений).
+
+    "gzip;q=0" - явный отказ; без упоминания gzip решает "*".
+    """
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Метрики EventBus текущего процесса: публикации, задержки и ошибки обработчиков. Только для администраторов.",
+    responses={200: openapi.Response('Снимок метрик')}
+)
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def event_bus_metrics_view(request):
+    """
+    Метрики EventBus
+    """
+    return Response(event_bus_metrics.snapshot())
 
 
 class GameSessionListView(generics.ListAPIView):
@@ -357,7 +483,30 @@ class GameSessionListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return GameSession.objects.filter(
-            player_stats__user=self.request.user
-        ).select_related('room', 'quiz').order_by('-created_at')
+        players_count = (
+            PlayerGameStats.objects
+            .filter(session_id=OuterRef('pk'))
+            .values('session_id')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        current_rounds = (
+            GameRound.objects
+            .filter(
+                round_number=F('session__current_question_index') + 1,
+                session__status__in=[GameSession.Status.PLAYING, GameSession.Status.PAUSED],
+            )
+            .select_related('question__author')
+            .prefetch_related('question__options')
+            .annotate(answers_total=Count('answers'))
+        )
+
+        return (
+            GameSession.objects
+            .filter(player_stats__user=self.request.user)
+            .select_related('room', 'quiz')
+            .annotate(players_total=Coalesce(Subquery(players_count), Value(0)))
+            .prefetch_related(Prefetch('rounds', queryset=current_rounds, to_attr='current_rounds'))
+            .order_by('-created_at')
+        )
 
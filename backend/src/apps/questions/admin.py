@@ -1,6 +1,7 @@
 from django.forms.models import BaseInlineFormSet
 from django.core.exceptions import ValidationError
-from django.contrib import admin
+from django.contrib import admin, messages
+from .domain.services.quiz_validation_service import QuizValidationService
 from .models import Topic, Tag, Quiz, Question, AnswerOption, QuizQuestion
 
 
@@ -78,6 +79,18 @@ class QuizAdmin(admin.ModelAdmin):
     raw_id_fields = ("author",)
     filter_horizontal = ("topics", "tags")
     inlines = [QuizQuestionInline]
+    actions = ["validate_for_publication"]
+
+    @admin.action(description="Проверить готовность к публикации")
+    def validate_for_publication(self, request, queryset):
+        valid = 0
+        for quiz, is_valid, errors in QuizValidationService().validate_many(queryset.order_by("id")):
+            if is_valid:
+                valid += 1
+            else:
+                self.message_user(request, f"«{quiz.title}» (#{quiz.id}): {'; '.join(errors[:5])}", messages.WARNING)
+
+        self.message_user(request, f"Готовы к публикации: {valid} из {queryset.count()}", messages.INFO)
 
     fieldsets = (
         ("Основное", {
@@ -91,10 +104,6 @@ class QuizAdmin(admin.ModelAdmin):
         }),
     )
 
-    def question_count(self, obj):
-        return obj.questions.count()
-    question_count.short_description = "Вопросов"
-
 
 @admin.register(AnswerOption)
 class AnswerOptionAdmin(admin.ModelAdmin):
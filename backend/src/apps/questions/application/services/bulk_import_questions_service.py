@@ -0,0 +1,208 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import json
+import logging
+
+from django.db import transaction
+from django.db.models import Max
+
+from apps.questions.application.services.catalog_cache_service import catalog_cache_service
+from apps.questions.application.services.create_question_service import CreateQuestionService
+from apps.questions.models import AnswerOption, Question, Quiz, QuizQuestion
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportReport:
+    """Итог импорта: сколько вопросов создано, сколько строк отклонено и почему."""
+    created: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    MAX_ERRORS = 100
+
+    def add_error(self, line: Optional[int], message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def to_dict(self) -> dict:
+        return {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+
+
+class BulkImportQuestionsService:
+    """
+    Пакетный импорт вопросов из CSV или NDJSON.
+
+    Файл читается построчно, каждая строка проверяется как в CreateQuestionService
+    (QuestionText, Difficulty, варианты ответа). Корректные строки сохраняются
+    пачками: bulk_create вопросов, вариантов и (если указана викторина) QuizQuestion.
+    Ошибочные строки пропускаются и попадают в отчёт с номером строки.
+
+    CSV: text, difficulty, points, explanation, option_1..option_6, correct (номер правильного варианта).
+    NDJSON: {"text", "difficulty", "points", "explanation", "options": [{"text", "is_correct"}]}.
+    """
+
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+    FORMATS = (CSV, NDJSON)
+
+    MAX_OPTIONS = 6
+
+    def __init__(self):
+        self.question_service = CreateQuestionService()
+
+    @classmethod
+    def detect_format(cls, filename: str) -> Optional[str]:
+        """Формат по расширению файла."""
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        if extension == 'csv':
+            return cls.CSV
+        if extension in ('ndjson', 'jsonl'):
+            return cls.NDJSON
+        return None
+
+    def execute(
+        self,
+        author_id: int,
+        lines: Iterable[str],
+        input_format: str,
+        quiz: Optional[Quiz] = None,
+        chunk_size: int = 500,
+    ) -> ImportReport:
+        """Импортировать вопросы автора из потока строк; quiz - добавить их в конец викторины."""
+        if input_format not in self.FORMATS:
+            raise ValueError(f"Неизвестный формат: {input_format}. Допустимые: {', '.join(self.FORMATS)}")
+
+        rows = self._read_csv(lines) if input_format == self.CSV else self._read_ndjson(lines)
+        report = ImportReport()
+        chunk = []
+
+        try:
+            for line, row in rows:
+                if 'error' in row:
+                    report.add_error(line, row['error'])
+                    continue
+                try:
+                    chunk.append((line, self.question_service.prepare(**row)))
+                except ValueError as e:
+                    report.add_error(line, str(e))
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    report.created += self._save_chunk(author_id, chunk, quiz)
+                    chunk = []
+        except UnicodeDecodeError:
+            report.add_error(None, "Файл должен быть в кодировке UTF-8")
+
+        if chunk:
+            report.created += self._save_chunk(author_id, chunk, quiz)
+
+        if quiz is not None and report.created:
+            # bulk_create не отправляет сигналы: счётчик и кэш каталога обновляются здесь
+            quiz.refresh_question_count()
+            catalog_cache_service.invalidate(catalog_cache_service.QUIZZES)
+
+        logger.info(
+            f"Imported {report.created} questions for user {author_id} "
+            f"({report.failed} rows rejected, quiz {quiz.pk if quiz else None})"
+        )
+        return report
+
+    def _save_chunk(self, author_id: int, chunk: List[Tuple[int, Dict]], quiz: Optional[Quiz]) -> int:
+        with transaction.atomic():
+            questions = Question.objects.bulk_create([
+                Question(
+                    author_id=author_id,
+                    text=data['text'],
+                    difficulty=data['difficulty'],
+                    points=data['points'],
+                    explanation=data['explanation'],
+                )
+                for _, data in chunk
+            ])
+            AnswerOption.objects.bulk_create([
+                AnswerOption(question=question, **option)
+                for question, (_, data) in zip(questions, chunk)
+                for option in data['options']
+            ])
+
+            if quiz is not None:
+                last_order = QuizQuestion.objects.filter(quiz=quiz).aggregate(last=Max('order'))['last'] or 0
+                QuizQuestion.objects.bulk_create([
+                    QuizQuestion(quiz=quiz, question=question, order=last_order + position)
+                    for position, question in enumerate(questions, start=1)
+                ])
+        return len(questions)
+
+    def _read_csv(self, lines: Iterable[str]) -> Iterator[Tuple[int, dict]]:
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None or 'text' not in reader.fieldnames:
+            raise ValueError("В CSV нужна строка заголовков с колонкой text")
+
+        for record in reader:
+            line = reader.line_num
+            try:
+                options = [
+                    {'text': text}
+                    for text in (record.get(f'option_{idx}') or '' for idx in range(1, self.MAX_OPTIONS + 1))
+                    if text.strip()
+                ]
+                correct = self._to_int(record.get('correct'), "correct")
+                if correct is not None:
+                    if not 1 <= correct <= len(options):
+                        raise ValueError(f"correct: нет варианта №{correct}")
+                    options[correct - 1]['is_correct'] = True
+
+                yield line, {
+                    'text': record.get('text') or '',
+                    'difficulty': record.get('difficulty') or '',
+                    'points': self._to_int(record.get('points'), "points"),
+                    'explanation': record.get('explanation') or '',
+                    'options': options,
+                }
+            except ValueError as e:
+                yield line, {'error': str(e)}
+
+    def _read_ndjson(self, lines: Iterable[str]) -> Iterator[Tuple[int, dict]]:
+        for line, raw in enumerate(lines, start=1):
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+                if not isinstance(record, dict):
+                    raise ValueError("Строка должна быть JSON-объектом")
+
+                options = record.get('options') or []
+                if not isinstance(options, list) or not all(isinstance(option, dict) for option in options):
+                    raise ValueError("options должен быть списком объектов")
+
+                yield line, {
+                    'text': str(record.get('text') or ''),
+                    'difficulty': str(record.get('difficulty') or ''),
+                    'points': self._to_int(record.get('points'), "points"),
+                    'explanation': str(record.get('explanation') or ''),
+                    # Порядок вариантов - порядок в списке
+                    'options': [
+                        {'text': str(option.get('text') or ''), 'is_correct': option.get('is_correct') is True}
+                        for option in options
+                    ],
+                }
+            except ValueError as e:
+                yield line, {'error': str(e)}
+
+    @staticmethod
+    def _to_int(value, name: str) -> Optional[int]:
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return None
+        if isinstance(value, bool):
+            raise ValueError(f"{name}: ожидается целое число")
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name}: ожидается целое число")
+
+
+bulk_import_questions_service = BulkImportQuestionsService()
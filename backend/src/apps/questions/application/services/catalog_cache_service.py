@@ -0,0 +1,150 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+from urllib.parse import urlencode
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogCacheEntry:
+    """Сериализованный ответ: данные, ETag, время сборки и до какого момента он свежий."""
+    data: Any
+    etag: str
+    last_modified: float
+    fresh_until: float
+
+
+class CatalogCacheService:
+    """
+    Кэш ответов публичных эндпоинтов каталога (одинаковы для всех посетителей).
+
+    Ключ - хост и путь (ссылки пагинации абсолютные) + отсортированные query-параметры + версия пространства имён.
+    Инвалидация - увеличение версии (сигналы Quiz, Topic, Tag, apps/questions/signals.py),
+    старые записи просто истекают по TTL.
+
+    Защита от лавины: пересобирает один запрос (cache.add-блокировка), остальные
+    отдают устаревшую запись или, если её нет, ждут до WAIT_TIMEOUT секунд.
+    """
+
+    QUIZZES = 'quizzes'
+    LABELS = 'labels'
+
+    VERSION_KEY_TEMPLATE = "catalog:cache:{namespace}:version"
+    ENTRY_KEY_TEMPLATE = "catalog:cache:{namespace}:v{version}:{digest}"
+    LOCK_SUFFIX = ":lock"
+
+    LOCK_TTL = 10
+    WAIT_TIMEOUT = 2.0
+    WAIT_STEP = 0.05
+
+    def get(self, namespace: str, request, build: Callable[[], Response]) -> CatalogCacheEntry:
+        """Запись из кэша или собранная build(); ошибки build() (404 и т.п.) не кэшируются."""
+        key = self._get_entry_key(namespace, request)
+        entry = self._load(key)
+
+        if entry is not None:
+            # Свежая, или её уже пересобирает другой запрос - отдаём что есть
+            if entry.fresh_until > time.time() or not self._acquire(key):
+                return entry
+            return self._rebuild(key, build)
+
+        if self._acquire(key):
+            return self._rebuild(key, build)
+
+        entry = self._wait(key)
+        if entry is not None:
+            return entry
+
+        logger.warning(f"Catalog cache rebuild of {key} is taking too long, building without cache")
+        return self._build(build)
+
+    def respond(self, request, entry: CatalogCacheEntry, data: Any = None):
+        """Response с ETag и Last-Modified, либо 304 по If-None-Match / If-Modified-Since."""
+        response = Response(entry.data if data is None else data)
+        response['ETag'] = entry.etag
+        response['Last-Modified'] = http_date(entry.last_modified)
+        response['Cache-Control'] = 'public, no-cache'
+        return get_conditional_response(
+            request, etag=entry.etag, last_modified=int(entry.last_modified), response=response
+        )
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        Сбросить кэш пространств имён: сразу и ещё раз после коммита,
+        чтобы параллельный запрос не закэшировал данные до коммита.
+        """
+        self._bump(namespaces)
+        transaction.on_commit(lambda: self._bump(namespaces))
+
+    def _bump(self, namespaces) -> None:
+        for namespace in namespaces:
+            key = self.VERSION_KEY_TEMPLATE.format(namespace=namespace)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, 1, timeout=None)
+
+    def _get_entry_key(self, namespace: str, request) -> str:
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+        )
+        digest = hashlib.sha1(f"{request.get_host()}{request.path}?{urlencode(params)}".encode('utf-8')).hexdigest()
+        version = cache.get(self.VERSION_KEY_TEMPLATE.format(namespace=namespace), 0)
+        return self.ENTRY_KEY_TEMPLATE.format(namespace=namespace, version=version, digest=digest)
+
+    def _load(self, key: str) -> Optional[CatalogCacheEntry]:
+        data = cache.get(key)
+        return CatalogCacheEntry(**data) if isinstance(data, dict) else None
+
+    def _acquire(self, key: str) -> bool:
+        return cache.add(key + self.LOCK_SUFFIX, 1, timeout=self.LOCK_TTL)
+
+    def _wait(self, key: str) -> Optional[CatalogCacheEntry]:
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(self.WAIT_STEP)
+            entry = self._load(key)
+            if entry is not None:
+                return entry
+        return None
+
+    def _rebuild(self, key: str, build: Callable[[], Response]) -> CatalogCacheEntry:
+        try:
+            entry = self._build(build)
+            cache.set(
+                key,
+                asdict(entry),
+                timeout=settings.CATALOG_CACHE_TTL + settings.CATALOG_CACHE_STALE_TTL,
+            )
+            return entry
+        finally:
+            cache.delete(key + self.LOCK_SUFFIX)
+
+    def _build(self, build: Callable[[], Response]) -> CatalogCacheEntry:
+        data = build().data
+        content = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+        now = time.time()
+        return CatalogCacheEntry(
+            # Слабый ETag: в детальной викторине views_count подставляется вживую
+            data=json.loads(content),
+            etag='W/' + quote_etag(hashlib.sha1(content.encode('utf-8')).hexdigest()),
+            last_modified=now,
+            fresh_until=now + settings.CATALOG_CACHE_TTL,
+        )
+
+
+catalog_cache_service = CatalogCacheService()
@@ -12,6 +12,9 @@ class CreateQuestionService:
     Application Service для создания вопроса.
     """
 
+    # Question.points - PositiveSmallIntegerField
+    MAX_POINTS = 32767
+
     def __init__(self, repository: QuestionRepository = None):
         self.repository = repository or question_repository
 
@@ -28,6 +31,30 @@ class CreateQuestionService:
         """
         Создать новый вопрос.
         """
+        data = self.prepare(text, difficulty, options, explanation, points)
+        options = data.pop('options')
+
+        # 5. Создание вопроса
+        question = self.repository.create(author_id=author_id, **data)
+
+        # 6. Создание вариантов ответа
+        for option_data in options:
+            self.repository.add_option(question=question, **option_data)
+
+        return question
+
+    def prepare(
+        self,
+        text: str,
+        difficulty: str,
+        options: List[Dict[str, any]],
+        explanation: str = "",
+        points: int = None
+    ) -> Dict[str, any]:
+        """
+        Проверить данные вопроса и привести их к полям модели
+        (общая часть для создания одного вопроса и пакетного импорта).
+        """
         # 1. Валидация текста через Value Object
         question_text_vo = QuestionText(text)
 
@@ -41,28 +68,26 @@ class CreateQuestionService:
         if points <= 0:
             raise ValueError("Очки должны быть больше 0")
 
+        if points > self.MAX_POINTS:
+            raise ValueError(f"Очки должны быть не больше {self.MAX_POINTS}")
+
         # 4. Валидация вариантов ответа
         self._validate_options(options)
 
-        # 5. Создание вопроса
-        question = self.repository.create(
-            author_id=author_id,
-            text=question_text_vo.value,
-            difficulty=difficulty_vo.level.value,
-            points=points,
-            explanation=explanation
-        )
-
-        # 6. Создание вариантов ответа
-        for idx, option_data in enumerate(options, start=1):
-            self.repository.add_option(
-                question=question,
-                text=option_data['text'],
-                is_correct=option_data.get('is_correct', False),
-                order=option_data.get('order', idx)
-            )
-
-        return question
+        return {
+            'text': question_text_vo.value,
+            'difficulty': difficulty_vo.level.value,
+            'points': points,
+            'explanation': explanation,
+            'options': [
+                {
+                    'text': option_data['text'],
+                    'is_correct': option_data.get('is_correct', False),
+                    'order': option_data.get('order', idx),
+                }
+                for idx, option_data in enumerate(options, start=1)
+            ],
+        }
 
     def _validate_options(self, options: List[Dict]) -> None:
         """
@@ -26,10 +26,7 @@ class PublishQuizService:
 
         # 1. Получение викторины
         try:
-            quiz = Quiz.objects.prefetch_related(
-                'questions__options',
-                'quizquestion_set__question__options'
-            ).get(id=quiz_id)
+            quiz = Quiz.objects.prefetch_related(self.validation_service.PREFETCH).get(id=quiz_id)
         except Quiz.DoesNotExist:
             raise ValueError(f"Викторина с ID {quiz_id} не найдена")
 
@@ -55,7 +52,7 @@ class PublishQuizService:
             "success": True,
             "quiz_id": quiz.id,
             "message": "Викторина успешно опубликована",
-            "questions_count": quiz.questions.count()
+            "questions_count": quiz.question_count
         }
 
     def validate(self, quiz_id: int) -> dict:
@@ -65,10 +62,7 @@ class PublishQuizService:
         from apps.questions.models import Quiz
 
         try:
-            quiz = Quiz.objects.prefetch_related(
-                'questions__options',
-                'quizquestion_set__question__options'
-            ).get(id=quiz_id)
+            quiz = Quiz.objects.prefetch_related(self.validation_service.PREFETCH).get(id=quiz_id)
         except Quiz.DoesNotExist:
             return {
                 "is_valid": False,
@@ -82,6 +76,6 @@ class PublishQuizService:
             "errors": errors,
             "quiz_id": quiz.id,
             "title": quiz.title,
-            "questions_count": quiz.questions.count()
+            "questions_count": quiz.question_count
         }
 
@@ -0,0 +1,411 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+import json
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+
+from apps.questions.application.services.bulk_import_questions_service import ImportReport
+from apps.questions.application.services.catalog_cache_service import catalog_cache_service
+from apps.questions.application.services.create_question_service import CreateQuestionService
+from apps.questions.domain.services.quiz_validation_service import QuizValidationService
+from apps.questions.models import AnswerOption, Question, Quiz, QuizQuestion, Tag, Topic
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BundleImportReport(ImportReport):
+    """
+    Итог импорта пакета: created/updated - вопросы, quizzes - загруженные викторины,
+    warnings - сохранённое с оговорками (например, викторина переведена в черновик).
+    """
+    updated: int = 0
+    quizzes: int = 0
+    warnings: List[str] = field(default_factory=list)
+
+    def add_warning(self, message: str) -> None:
+        if len(self.warnings) < self.MAX_ERRORS:
+            self.warnings.append(message)
+
+    def to_dict(self) -> dict:
+        return {**super().to_dict(), 'updated': self.updated, 'quizzes': self.quizzes, 'warnings': self.warnings}
+
+
+@dataclass
+class _QuizComposition:
+    """Новый состав загружаемой викторины: заменяет старый целиком, когда собран."""
+    quiz_id: int
+    ref: object
+    links: List[QuizQuestion] = field(default_factory=list)
+    orders: Set[int] = field(default_factory=set)
+    texts: Set[str] = field(default_factory=set)
+
+
+class QuizBundleService:
+    """
+    Перенос викторин между окружениями и резервная копия библиотеки автора.
+
+    Пакет - NDJSON, по объекту на строку:
+      {"type": "bundle", "version": 1, "exported_at"}
+      {"type": "topic" | "tag", "slug", "name"}
+      {"type": "quiz", "ref", "title", "description", "status", "visibility", "topics", "tags"}
+      {"type": "question", "quiz": ref | null, "order", "text", "difficulty", "points", "explanation", "options"}
+
+    Вопросы викторины идут сразу после её строки в порядке order. Выгрузка идёт потоком
+    через .iterator(), загрузка - пачками, память не зависит от размера библиотеки
+    (в памяти только состав текущей викторины).
+
+    При загрузке всё принадлежит импортирующему автору, естественные ключи:
+    тема и тег - slug, викторина - название, вопрос - текст (при дублях - самый старый).
+    Состав найденной викторины заменяется составом из пакета одной транзакцией,
+    когда он собран целиком: сбой посреди загрузки оставляет прежний состав. Варианты ответа
+    существующего вопроса заменяются, только если он ещё не использовался в играх.
+    """
+
+    VERSION = 1
+    CHUNK_SIZE = 1000
+
+    def __init__(self):
+        self.question_service = CreateQuestionService()
+        self.validation_service = QuizValidationService()
+
+    # Выгрузка
+
+    def export(self, author_id: int, quiz_ids: Optional[List[int]] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        """
+        Строки NDJSON с викторинами автора (все или quiz_ids) и их вопросами.
+        Для всей библиотеки в конце идут вопросы автора вне его викторин.
+        """
+        quizzes = Quiz.objects.filter(author_id=author_id)
+        if quiz_ids is not None:
+            quizzes = quizzes.filter(id__in=quiz_ids)
+
+        yield self._line({'type': 'bundle', 'version': self.VERSION, 'exported_at': timezone.now()})
+
+        for kind, model in (('topic', Topic), ('tag', Tag)):
+            labels = model.objects.filter(quizzes__in=quizzes).distinct().order_by('slug').values('slug', 'name')
+            for label in labels.iterator(chunk_size=chunk_size):
+                yield self._line({'type': kind, **label})
+
+        for quiz in quizzes.prefetch_related('topics', 'tags').order_by('id').iterator(chunk_size=100):
+            yield self._line({
+                'type': 'quiz',
+                'ref': quiz.id,
+                'title': quiz.title,
+                'description': quiz.description,
+                'status': quiz.status,
+                'visibility': quiz.visibility,
+                'topics': [topic.slug for topic in quiz.topics.all()],
+                'tags': [tag.slug for tag in quiz.tags.all()],
+            })
+
+            links = (
+                QuizQuestion.objects
+                .filter(quiz=quiz)
+                .select_related('question')
+                .prefetch_related('question__options')
+                .order_by('order', 'id')
+            )
+            for link in links.iterator(chunk_size=chunk_size):
+                yield self._question_line(link.question, quiz_ref=quiz.id, order=link.order)
+
+        if quiz_ids is None:
+            loose = (
+                Question.objects
+                .filter(author_id=author_id)
+                .exclude(in_quizzes__author_id=author_id)
+                .prefetch_related('options')
+                .order_by('id')
+            )
+            for question in loose.iterator(chunk_size=chunk_size):
+                yield self._question_line(question)
+
+    def _question_line(self, question: Question, quiz_ref: Optional[int] = None, order: Optional[int] = None) -> str:
+        return self._line({
+            'type': 'question',
+            'quiz': quiz_ref,
+            'order': order,
+            'text': question.text,
+            'difficulty': question.difficulty,
+            'points': question.points,
+            'explanation': question.explanation,
+            'options': [{'text': option.text, 'is_correct': option.is_correct} for option in question.options.all()],
+        })
+
+    @staticmethod
+    def _line(record: dict) -> str:
+        return json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    # Загрузка
+
+    def import_bundle(self, author_id: int, lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> BundleImportReport:
+        """Загрузить пакет в библиотеку автора (upsert по естественным ключам)."""
+        report = BundleImportReport()
+        quiz_ids: Set[int] = set()
+        composition: Optional[_QuizComposition] = None
+        chunk = []
+
+        try:
+            for line, raw in enumerate(lines, start=1):
+                if not raw.strip():
+                    continue
+                try:
+                    record = json.loads(raw)
+                    if not isinstance(record, dict):
+                        raise ValueError("Строка должна быть JSON-объектом")
+                    kind = record.get('type')
+
+                    if kind == 'question':
+                        chunk.append((line, self._prepare_question(record, composition)))
+                        if len(chunk) >= chunk_size:
+                            self._save_questions(author_id, chunk, composition, report)
+                            chunk = []
+                    elif kind == 'quiz':
+                        if not isinstance(record.get('ref'), (int, str)):
+                            raise ValueError("У викторины нет ref")
+                        if chunk:
+                            self._save_questions(author_id, chunk, composition, report)
+                            chunk = []
+                        if composition is not None:
+                            self._replace_quiz_questions(composition)
+                            # Строка викторины может оказаться ошибочной - её вопросы тогда отклоняются
+                            composition = None
+                        composition = _QuizComposition(quiz_id=self._save_quiz(author_id, record), ref=record['ref'])
+                        quiz_ids.add(composition.quiz_id)
+                        report.quizzes += 1
+                    elif kind in ('topic', 'tag'):
+                        self._save_label(Topic if kind == 'topic' else Tag, record)
+                    elif kind == 'bundle':
+                        if record.get('version') != self.VERSION:
+                            raise ValueError(f"Неподдерживаемая версия пакета: {record.get('version')}")
+                    else:
+                        raise ValueError(f"Неизвестный тип записи: {kind}")
+                except ValueError as e:
+                    report.add_error(line, str(e))
+        except UnicodeDecodeError:
+            report.add_error(None, "Файл должен быть в кодировке UTF-8")
+
+        if chunk:
+            self._save_questions(author_id, chunk, composition, report)
+        if composition is not None:
+            self._replace_quiz_questions(composition)
+
+        self._finish_quizzes(quiz_ids, report)
+        if quiz_ids or report.created or report.updated:
+            # bulk_create / bulk_update и _raw_delete не отправляют сигналы
+            catalog_cache_service.invalidate(catalog_cache_service.QUIZZES)
+
+        logger.info(
+            f"Imported bundle for user {author_id}: {report.quizzes} quizzes, "
+            f"{report.created} questions created, {report.updated} updated, {report.failed} rows rejected"
+        )
+        return report
+
+    @staticmethod
+    def _check_length(model, field_name: str, value: str) -> None:
+        max_length = model._meta.get_field(field_name).max_length
+        if len(value) > max_length:
+            raise ValueError(f"{field_name}: не длиннее {max_length} символов (сейчас {len(value)})")
+
+    def _save_label(self, model, record: dict) -> None:
+        slug, name = record.get('slug'), record.get('name')
+        if not isinstance(slug, str) or not isinstance(name, str) or not slug or not name:
+            raise ValueError("Нужны slug и name")
+        self._check_length(model, 'slug', slug)
+        self._check_length(model, 'name', name)
+
+        # Темы и теги общие для всех авторов: существующие не переименовываются.
+        # Savepoint на запись: ошибка БД отклоняет строку, а не весь импорт
+        try:
+            with transaction.atomic():
+                model.objects.get_or_create(slug=slug, defaults={'name': name})
+        except IntegrityError:
+            raise ValueError(f"Название «{name}» уже занято записью с другим slug")
+        except DataError as e:
+            raise ValueError(f"Запись не сохранена: {e}")
+
+    def _save_quiz(self, author_id: int, record: dict) -> int:
+        title = str(record.get('title') or '').strip()
+        if not title:
+            raise ValueError("Название викторины не может быть пустым")
+        self._check_length(Quiz, 'title', title)
+        status = record.get('status', Quiz.Status.DRAFT)
+        visibility = record.get('visibility', Quiz.Visibility.PUBLIC)
+        if status not in Quiz.Status.values or visibility not in Quiz.Visibility.values:
+            raise ValueError(f"Неверный статус или видимость викторины: {status}, {visibility}")
+
+        fields = {'description': str(record.get('description') or ''), 'status': status, 'visibility': visibility}
+        try:
+            with transaction.atomic():
+                quiz = Quiz.objects.filter(author_id=author_id, title=title).order_by('id').first()
+                if quiz is None:
+                    quiz = Quiz.objects.create(author_id=author_id, title=title, **fields)
+                else:
+                    for field, value in fields.items():
+                        setattr(quiz, field, value)
+                    quiz.save(update_fields=[*fields, 'updated_at'])
+
+                quiz.topics.set(Topic.objects.filter(slug__in=record.get('topics') or []))
+                quiz.tags.set(Tag.objects.filter(slug__in=record.get('tags') or []))
+        except (IntegrityError, DataError) as e:
+            raise ValueError(f"Викторина не сохранена: {e}")
+        return quiz.id
+
+    def _prepare_question(self, record: dict, composition: Optional[_QuizComposition]) -> dict:
+        quiz_id = None
+        if record.get('quiz') is not None:
+            if composition is None or composition.ref != record['quiz']:
+                raise ValueError(f"Вопрос викторины {record['quiz']} должен идти сразу после её строки")
+            quiz_id = composition.quiz_id
+
+        options = record.get('options') or []
+        if not isinstance(options, list) or not all(isinstance(option, dict) for option in options):
+            raise ValueError("options должен быть списком объектов")
+
+        points = record.get('points')
+        if points is not None and (isinstance(points, bool) or not isinstance(points, int)):
+            raise ValueError("points: ожидается целое число")
+
+        data = self.question_service.prepare(
+            text=str(record.get('text') or ''),
+            difficulty=str(record.get('difficulty') or ''),
+            options=[
+                {'text': str(option.get('text') or ''), 'is_correct': option.get('is_correct') is True}
+                for option in options
+            ],
+            explanation=str(record.get('explanation') or ''),
+            points=points,
+        )
+        order = record.get('order')
+        if quiz_id is not None:
+            if isinstance(order, bool) or not isinstance(order, int) or order < 1:
+                raise ValueError("order: у вопроса викторины нужен порядковый номер от 1")
+            # Иначе строка нарушила бы уникальность (quiz, order) / (quiz, question)
+            if order in composition.orders:
+                raise ValueError(f"order: номер {order} в викторине уже занят")
+            if data['text'] in composition.texts:
+                raise ValueError("Вопрос уже есть в этой викторине")
+            composition.orders.add(order)
+            composition.texts.add(data['text'])
+
+        data['quiz_id'] = quiz_id
+        data['order'] = order
+        return data
+
+    @transaction.atomic
+    def _save_questions(
+        self,
+        author_id: int,
+        chunk: List[tuple],
+        composition: Optional[_QuizComposition],
+        report: BundleImportReport,
+    ) -> None:
+        # Один вопрос может встречаться в пакете несколько раз (в разных викторинах)
+        by_text = {}
+        for _, data in chunk:
+            by_text.setdefault(data['text'], data)
+
+        existing = {}
+        for question_id, text in (
+            Question.objects
+            .filter(author_id=author_id, text__in=list(by_text))
+            .order_by('-id')
+            .values_list('id', 'text')
+        ):
+            existing[text] = question_id
+
+        new = [text for text in by_text if text not in existing]
+        created = Question.objects.bulk_create([
+            Question(
+                author_id=author_id,
+                text=text,
+                difficulty=by_text[text]['difficulty'],
+                points=by_text[text]['points'],
+                explanation=by_text[text]['explanation'],
+            )
+            for text in new
+        ])
+        ids = {**existing, **{question.text: question.id for question in created}}
+        replace_options = new + self._changed_options(existing, by_text)
+
+        AnswerOption.objects.filter(question_id__in=[existing[text] for text in replace_options if text in existing]).delete()
+        AnswerOption.objects.bulk_create([
+            AnswerOption(question_id=ids[text], **option)
+            for text in replace_options
+            for option in by_text[text]['options']
+        ])
+
+        Question.objects.bulk_update(
+            [
+                Question(
+                    id=question_id,
+                    difficulty=by_text[text]['difficulty'],
+                    points=by_text[text]['points'],
+                    explanation=by_text[text]['explanation'],
+                )
+                for text, question_id in existing.items()
+            ],
+            ['difficulty', 'points', 'explanation'],
+        )
+
+        # Связи копятся до конца викторины; повторы order и вопросов отсеяны в _prepare_question
+        if composition is not None:
+            composition.links.extend(
+                QuizQuestion(quiz_id=data['quiz_id'], question_id=ids[data['text']], order=data['order'])
+                for _, data in chunk
+                if data['quiz_id'] is not None
+            )
+
+        report.created += len(created)
+        report.updated += len(existing)
+
+    def _changed_options(self, existing: Dict[str, int], by_text: Dict[str, dict]) -> List[str]:
+        """Тексты существующих вопросов, чьи варианты отличаются от пакета и которые ещё не разыгрывались."""
+        current = {}
+        for question_id, text, is_correct in (
+            AnswerOption.objects
+            .filter(question_id__in=existing.values())
+            .order_by('question_id', 'order', 'id')
+            .values_list('question_id', 'text', 'is_correct')
+        ):
+            current.setdefault(question_id, []).append({'text': text, 'is_correct': is_correct})
+
+        changed = {
+            existing[text]: text
+            for text in existing
+            if current.get(existing[text], []) != [
+                {'text': option['text'], 'is_correct': option['is_correct']} for option in by_text[text]['options']
+            ]
+        }
+        played = set(
+            Question.objects.filter(id__in=changed, game_rounds__isnull=False).values_list('id', flat=True)
+        )
+        for question_id in played:
+            logger.warning(f"Options of question {question_id} are kept: it has already been played")
+        return [text for question_id, text in changed.items() if question_id not in played]
+
+    @transaction.atomic
+    def _replace_quiz_questions(self, composition: _QuizComposition) -> None:
+        """
+        Заменить состав викторины собранным: старый удаляется без сигналов
+        (иначе UPDATE счётчика и сброс кэша на каждую строку), счётчик ставится один раз.
+        """
+        old_links = QuizQuestion.objects.filter(quiz_id=composition.quiz_id)
+        old_links._raw_delete(old_links.db)
+        QuizQuestion.objects.bulk_create(composition.links, batch_size=self.CHUNK_SIZE)
+        Quiz.objects.filter(pk=composition.quiz_id).update(question_count=len(composition.links))
+
+    def _finish_quizzes(self, quiz_ids, report: BundleImportReport) -> None:
+        """Опубликованные, но не проходящие проверку викторины - в черновик."""
+        published = Quiz.objects.filter(id__in=quiz_ids, status=Quiz.Status.PUBLISHED)
+
+        for quiz, is_valid, errors in self.validation_service.validate_many(published):
+            if not is_valid:
+                Quiz.objects.filter(pk=quiz.pk).update(status=Quiz.Status.DRAFT)
+                report.add_warning(f"Викторина «{quiz.title}» сохранена черновиком: {'; '.join(errors)}")
+
+
+quiz_bundle_service = QuizBundleService()
@@ -0,0 +1,139 @@
+from typing import Iterable
+import logging
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, QuerySet, Value, When
+
+logger = logging.getLogger(__name__)
+
+# Поля документа и их веса в tsvector
+WEIGHTED_FIELDS = (('title', 'A'), ('keywords', 'B'), ('description', 'C'), ('author_nickname', 'D'))
+SEARCH_CONFIGS = ('russian', 'english')
+
+
+def build_search_vector():
+    """Взвешенный tsvector документа по русской и английской морфологии."""
+    vector = None
+    for config in SEARCH_CONFIGS:
+        for field, weight in WEIGHTED_FIELDS:
+            part = SearchVector(field, config=config, weight=weight)
+            vector = part if vector is None else vector + part
+    return vector
+
+
+class QuizSearchService:
+    """
+    Полнотекстовый поиск по каталогу викторин.
+
+    PostgreSQL: websearch-запрос по search_vector плюс триграммы по названию
+    для опечаток, сортировка по SearchRank + сходству названия. Оба условия
+    проверяются по таблице документов - её GIN-индексы объединяются через BitmapOr.
+    Другие СУБД (SQLite в тестах): все слова запроса (в нижнем регистре) должны
+    встретиться в документе, совпадение в названии выше.
+    """
+
+    TRIGRAM_WEIGHT = 0.5
+    MAX_TERMS = 10
+
+    @property
+    def is_postgres(self) -> bool:
+        return connection.vendor == 'postgresql'
+
+    def search(self, queryset: QuerySet, text: str) -> QuerySet:
+        """Отфильтровать викторины по запросу и аннотировать search_rank."""
+        text = ' '.join(text.split())
+        if not text:
+            return queryset
+
+        if self.is_postgres:
+            return self._search_postgres(queryset, text)
+        return self._search_fallback(queryset, text)
+
+    def _search_postgres(self, queryset: QuerySet, text: str) -> QuerySet:
+        query = None
+        for config in SEARCH_CONFIGS:
+            part = SearchQuery(text, config=config, search_type='websearch')
+            query = part if query is None else query | part
+
+        # Название в документе хранится в нижнем регистре
+        title = text.lower()
+        return queryset.filter(
+            Q(search_document__search_vector=query) | Q(search_document__title__trigram_similar=title)
+        ).annotate(
+            search_rank=SearchRank(F('search_document__search_vector'), query)
+            + TrigramSimilarity('search_document__title', title) * self.TRIGRAM_WEIGHT
+        )
+
+    def _search_fallback(self, queryset: QuerySet, text: str) -> QuerySet:
+        text = text.lower()
+        condition = Q()
+        for term in text.split()[:self.MAX_TERMS]:
+            condition &= (
+                Q(search_document__title__contains=term)
+                | Q(search_document__keywords__contains=term)
+                | Q(search_document__description__contains=term)
+                | Q(search_document__author_nickname__contains=term)
+            )
+
+        return queryset.filter(condition).annotate(
+            search_rank=Case(
+                When(search_document__title__contains=text, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+
+    def update_documents(self, quiz_ids: Iterable[int]) -> int:
+        """Пересобрать поисковые документы викторин пачкой (число запросов не зависит от количества)."""
+        from apps.questions.models import Quiz, QuizSearchDocument
+
+        quizzes = list(
+            Quiz.objects
+            .filter(id__in=list(quiz_ids))
+            .select_related('author')
+            .prefetch_related('topics', 'tags')
+        )
+        if not quizzes:
+            return 0
+
+        # Текст хранится в нижнем регистре: LIKE в SQLite регистронезависим только для ASCII
+        documents = [
+            QuizSearchDocument(
+                quiz=quiz,
+                title=quiz.title.lower(),
+                description=quiz.description.lower(),
+                keywords=' '.join(
+                    [topic.name for topic in quiz.topics.all()] + [tag.name for tag in quiz.tags.all()]
+                ).lower(),
+                author_nickname=(quiz.author.nickname or '').lower(),
+            )
+            for quiz in quizzes
+        ]
+        QuizSearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['quiz'],
+            update_fields=['title', 'description', 'keywords', 'author_nickname', 'updated_at'],
+        )
+
+        if self.is_postgres:
+            QuizSearchDocument.objects.filter(quiz_id__in=[quiz.id for quiz in quizzes]).update(
+                search_vector=build_search_vector()
+            )
+        return len(documents)
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        """Пересобрать документы всех викторин."""
+        from apps.questions.models import Quiz
+
+        ids = list(Quiz.objects.order_by('id').values_list('id', flat=True))
+        count = 0
+        for start in range(0, len(ids), batch_size):
+            count += self.update_documents(ids[start:start + batch_size])
+
+        logger.info(f"Quiz search documents rebuilt: {count}")
+        return count
+
+
+quiz_search_service = QuizSearchService()
@@ -0,0 +1,72 @@
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from redis import RedisError
+
+from apps.questions.infrastructure.redis_view_counter_repository import view_counter_repository
+
+logger = logging.getLogger(__name__)
+
+
+class QuizViewCounterService:
+    """
+    Счётчик просмотров викторин без записи в БД на каждом просмотре.
+
+    Просмотры копятся в Redis (HINCRBY) и сбрасываются в Quiz.views_count задачей
+    flush_quiz_views одним UPDATE на пачку. Без Redis - атомарный UPDATE через F().
+    """
+
+    FLUSH_LOCK_KEY = "quiz:views:flush_lock"
+    FLUSH_LOCK_TTL = 300
+    FLUSH_CHUNK_SIZE = 500
+
+    def __init__(self):
+        self.repository = view_counter_repository
+
+    def register_view(self, quiz) -> None:
+        """Учесть просмотр; quiz.views_count дополняется ещё не сброшенными просмотрами."""
+        if self.repository.client is not None:
+            try:
+                quiz.views_count += self.repository.increment(quiz.pk)
+                return
+            except RedisError as e:
+                logger.warning(f"Failed to buffer view of quiz {quiz.pk}: {e}")
+
+        quiz.increment_views()
+
+    def flush(self) -> int:
+        """Записать накопленные просмотры в БД. Возвращает число обновлённых викторин."""
+        if self.repository.client is None:
+            return 0
+        if not cache.add(self.FLUSH_LOCK_KEY, 1, timeout=self.FLUSH_LOCK_TTL):
+            return 0
+
+        try:
+            pending = self.repository.take_batch()
+            if not pending:
+                return 0
+
+            from apps.questions.models import Quiz
+
+            items = list(pending.items())
+            with transaction.atomic():
+                for start in range(0, len(items), self.FLUSH_CHUNK_SIZE):
+                    chunk = items[start:start + self.FLUSH_CHUNK_SIZE]
+                    Quiz.objects.filter(id__in=[quiz_id for quiz_id, _ in chunk]).update(
+                        views_count=F('views_count') + Case(
+                            *[When(id=quiz_id, then=Value(count)) for quiz_id, count in chunk],
+                            default=Value(0),
+                            output_field=IntegerField(),
+                        )
+                    )
+
+            self.repository.confirm_batch()
+            logger.info(f"Flushed views of {len(items)} quizzes")
+            return len(items)
+        finally:
+            cache.delete(self.FLUSH_LOCK_KEY)
+
+
+quiz_view_counter_service = QuizViewCounterService()
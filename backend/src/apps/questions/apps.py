@@ -5,3 +5,6 @@ class QuestionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.questions'
     label = 'questions'
+
+    def ready(self):
+        from apps.questions import signals  # noqa: F401
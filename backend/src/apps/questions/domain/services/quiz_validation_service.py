@@ -1,4 +1,6 @@
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
+
+from django.db.models import prefetch_related_objects
 
 
 class QuizValidationException(Exception):
@@ -9,24 +11,33 @@ class QuizValidationException(Exception):
 class QuizValidationService:
     """
     Domain Service для валидации викторины перед публикацией.
+
+    Работает только с предзагруженными данными (PREFETCH): если викторина
+    загружена без них, они подгружаются тремя запросами независимо от числа вопросов.
     """
 
     MIN_QUESTIONS = 5
     MIN_OPTIONS_PER_QUESTION = 2
     MAX_OPTIONS_PER_QUESTION = 6
 
+    PREFETCH = 'quizquestion_set__question__options'
+
     def validate_for_publication(self, quiz) -> Tuple[bool, List[str]]:
         """
         Валидация викторины перед публикацией.
         """
         errors = []
 
+        # Уже предзагруженное повторно не запрашивается
+        prefetch_related_objects([quiz], self.PREFETCH)
+        quiz_questions = list(quiz.quizquestion_set.all())
+
         # 1. Проверка названия
         if not quiz.title or not quiz.title.strip():
             errors.append("Название викторины обязательно")
 
         # 2. Проверка количества вопросов
-        questions_count = quiz.questions.count()
+        questions_count = len(quiz_questions)
         if questions_count < self.MIN_QUESTIONS:
             errors.append(
                 f"Недостаточно вопросов: {questions_count} "
@@ -34,7 +45,7 @@ class QuizValidationService:
             )
 
         # 3. Проверка каждого вопроса
-        for idx, quiz_question in enumerate(quiz.quizquestion_set.select_related('question').all(), 1):
+        for idx, quiz_question in enumerate(quiz_questions, 1):
             question = quiz_question.question
             question_errors = self._validate_question(question, idx)
             errors.extend(question_errors)
@@ -86,6 +97,29 @@ class QuizValidationService:
 
         return errors
 
+    def validate_many(self, quizzes: Iterable, chunk_size: int = 200) -> Iterator[Tuple[object, bool, List[str]]]:
+        """
+        Пакетная валидация: (викторина, is_valid, errors) для каждой.
+
+        Вопросы и варианты подгружаются на пачку из chunk_size викторин
+        (три запроса на пачку), поэтому quizzes может быть и .iterator().
+        """
+        chunk = []
+        for quiz in quizzes:
+            chunk.append(quiz)
+            if len(chunk) >= chunk_size:
+                yield from self._validate_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            yield from self._validate_chunk(chunk)
+
+    def _validate_chunk(self, quizzes: List) -> Iterator[Tuple[object, bool, List[str]]]:
+        prefetch_related_objects(quizzes, self.PREFETCH)
+        for quiz in quizzes:
+            is_valid, errors = self.validate_for_publication(quiz)
+            yield quiz, is_valid, errors
+
     def can_publish(self, quiz) -> bool:
         """
         Быстрая проверка: можно ли опубликовать викторину.
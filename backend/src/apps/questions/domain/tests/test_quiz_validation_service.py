@@ -190,3 +190,52 @@ def test_validate_or_raise_raises_exception_for_invalid_quiz(user):
 
     with pytest.raises(QuizValidationException):
         service.validate_or_raise(quiz)
+
+
+@pytest.mark.django_db
+def test_validation_query_count_does_not_depend_on_questions(user, django_assert_num_queries):
+    """Вопросы и варианты подгружаются разом: 3 запроса на 30 вопросов."""
+    quiz = Quiz.objects.create(author=user, title="Большая викторина")
+    for i in range(1, 31):
+        QuizQuestion.objects.create(quiz=quiz, question=_create_valid_question(user, i), order=i)
+
+    service = QuizValidationService()
+    quiz = Quiz.objects.get(pk=quiz.pk)
+
+    with django_assert_num_queries(3):
+        is_valid, errors = service.validate_for_publication(quiz)
+    assert is_valid is True
+
+    # Уже предзагруженная викторина не делает запросов
+    prefetched = Quiz.objects.prefetch_related(QuizValidationService.PREFETCH).get(pk=quiz.pk)
+    with django_assert_num_queries(0):
+        assert service.can_publish(prefetched) is True
+
+
+@pytest.mark.django_db
+def test_validate_many_uses_three_queries_per_chunk(user, django_assert_num_queries, django_assert_max_num_queries):
+    """Пакетная проверка: запрос викторин + 3 запроса на пачку."""
+    valid = Quiz.objects.create(author=user, title="Полная")
+    for i in range(1, 6):
+        QuizQuestion.objects.create(quiz=valid, question=_create_valid_question(user, i), order=i)
+
+    short = Quiz.objects.create(author=user, title="Короткая")
+    QuizQuestion.objects.create(quiz=short, question=_create_valid_question(user, 10), order=1)
+    empty = Quiz.objects.create(author=user, title="Пустая")
+
+    service = QuizValidationService()
+
+    with django_assert_num_queries(4):
+        results = {
+            quiz.id: (is_valid, errors)
+            for quiz, is_valid, errors in service.validate_many(Quiz.objects.order_by("id"))
+        }
+
+    assert results[valid.id] == (True, [])
+    assert results[short.id][0] is False
+    assert "Недостаточно вопросов: 1" in results[short.id][1][0]
+    assert results[empty.id][0] is False
+
+    # Маленькие пачки: не больше 3 запросов на каждую
+    with django_assert_max_num_queries(1 + 3 * 2):
+        assert sum(is_valid for _, is_valid, _ in service.validate_many(Quiz.objects.order_by("id"), chunk_size=2)) == 1
@@ -0,0 +1,52 @@
+from typing import Dict
+
+from redis.exceptions import ResponseError
+
+from apps.core.redis_client import get_redis_client
+
+
+class RedisViewCounterRepository:
+    """
+    Буфер просмотров викторин в Redis: hash quiz_id -> накопленные просмотры (HINCRBY).
+
+    Сброс в БД забирает hash целиком через RENAME во "flushing"-ключ,
+    поэтому новые просмотры во время сброса копятся в новом hash.
+    """
+
+    PENDING_KEY = "quiz:views:pending"
+    FLUSHING_KEY = "quiz:views:flushing"
+
+    def __init__(self, client_factory=get_redis_client):
+        self._client_factory = client_factory
+
+    @property
+    def client(self):
+        return self._client_factory()
+
+    def increment(self, quiz_id: int) -> int:
+        """Учесть просмотр. Возвращает число ещё не сброшенных просмотров викторины."""
+        return self.client.hincrby(self.PENDING_KEY, quiz_id, 1)
+
+    def take_batch(self) -> Dict[int, int]:
+        """
+        Забрать накопленные просмотры на сброс.
+
+        Если предыдущий сброс не завершился (ключ flushing остался), сначала
+        возвращается он - новые просмотры дождутся следующего запуска.
+        """
+        client = self.client
+        try:
+            # RENAMENX не перезапишет незавершённый flushing
+            client.renamenx(self.PENDING_KEY, self.FLUSHING_KEY)
+        except ResponseError:
+            # Новых просмотров нет (ключа pending не существует)
+            pass
+
+        return {int(quiz_id): int(count) for quiz_id, count in client.hgetall(self.FLUSHING_KEY).items()}
+
+    def confirm_batch(self) -> None:
+        """Сброс записан в БД - удалить забранный hash."""
+        self.client.delete(self.FLUSHING_KEY)
+
+
+view_counter_repository = RedisViewCounterRepository()
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.questions.models import Quiz, QuizQuestion
+
+
+class Command(BaseCommand):
+    help = "Пересчитать Quiz.question_count по таблице QuizQuestion"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--quiz",
+            type=int,
+            action="append",
+            dest="quiz_ids",
+            help="ID викторины (можно указать несколько раз). По умолчанию - все викторины",
+        )
+
+    def handle(self, *args, **options):
+        counts = (
+            QuizQuestion.objects
+            .filter(quiz_id=OuterRef("pk"))
+            .values("quiz_id")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+
+        queryset = Quiz.objects.all()
+        if options["quiz_ids"]:
+            queryset = queryset.filter(id__in=options["quiz_ids"])
+
+        updated = queryset.update(question_count=Coalesce(Subquery(counts), Value(0)))
+
+        self.stdout.write(self.style.SUCCESS(f"Пересчитано викторин: {updated}"))
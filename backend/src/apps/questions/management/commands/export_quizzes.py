@@ -0,0 +1,50 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.questions.application.services.quiz_bundle_service import quiz_bundle_service
+
+
+class Command(BaseCommand):
+    help = "Выгрузить викторины автора с вопросами в NDJSON-пакет"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--author", required=True, help="ID или email автора")
+        parser.add_argument(
+            "--quiz",
+            type=int,
+            action="append",
+            dest="quiz_ids",
+            help="ID викторины (можно указать несколько раз). По умолчанию - вся библиотека",
+        )
+        parser.add_argument("--output", help="Файл для пакета (по умолчанию - stdout)")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Размер пачки при чтении из БД")
+
+    def handle(self, *args, **options):
+        user = get_author(options["author"])
+        lines = quiz_bundle_service.export(
+            author_id=user.pk,
+            quiz_ids=options["quiz_ids"],
+            chunk_size=options["chunk_size"],
+        )
+
+        if not options["output"]:
+            sys.stdout.writelines(lines)
+            return
+
+        count = 0
+        with open(options["output"], "w", encoding="utf-8") as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f"Записано строк: {count}"))
+
+
+def get_author(author: str):
+    User = get_user_model()
+    lookup = {"pk": int(author)} if author.isdigit() else {"email": author}
+    try:
+        return User.objects.get(**lookup)
+    except User.DoesNotExist:
+        raise CommandError(f"Пользователь {author} не найден")
@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.questions.application.services.bulk_import_questions_service import bulk_import_questions_service
+from apps.questions.models import Quiz
+
+
+class Command(BaseCommand):
+    help = "Импортировать вопросы из CSV или NDJSON-файла"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу")
+        parser.add_argument("--author", required=True, help="ID или email автора вопросов")
+        parser.add_argument(
+            "--format",
+            dest="input_format",
+            choices=bulk_import_questions_service.FORMATS,
+            help="Формат файла (по умолчанию - по расширению)",
+        )
+        parser.add_argument("--quiz", type=int, help="ID викторины автора: добавить в неё вопросы")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Сколько вопросов сохранять за раз")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        author = options["author"]
+        lookup = {"pk": int(author)} if author.isdigit() else {"email": author}
+        try:
+            user = User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"Пользователь {author} не найден")
+
+        quiz = None
+        if options["quiz"]:
+            quiz = Quiz.objects.filter(pk=options["quiz"], author=user).first()
+            if quiz is None:
+                raise CommandError(f"Викторина {options['quiz']} не найдена у автора {author}")
+
+        input_format = options["input_format"] or bulk_import_questions_service.detect_format(options["path"])
+        if input_format is None:
+            raise CommandError("Не удалось определить формат по расширению, укажите --format")
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+                report = bulk_import_questions_service.execute(
+                    author_id=user.pk,
+                    lines=lines,
+                    input_format=input_format,
+                    quiz=quiz,
+                    chunk_size=options["chunk_size"],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            self.stderr.write(f"Строка {error['line']}: {error['error']}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f"... и ещё {report.failed - len(report.errors)} ошибок")
+
+        self.stdout.write(self.style.SUCCESS(f"Создано вопросов: {report.created}, отклонено строк: {report.failed}"))
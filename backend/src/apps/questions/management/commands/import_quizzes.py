@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.questions.application.services.quiz_bundle_service import quiz_bundle_service
+from apps.questions.management.commands.export_quizzes import get_author
+
+
+class Command(BaseCommand):
+    help = "Загрузить NDJSON-пакет викторин (из export_quizzes) в библиотеку автора"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к пакету")
+        parser.add_argument("--author", required=True, help="ID или email автора, которому достанутся викторины")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Сколько вопросов сохранять за раз")
+
+    def handle(self, *args, **options):
+        user = get_author(options["author"])
+
+        try:
+            with open(options["path"], encoding="utf-8-sig") as lines:
+                report = quiz_bundle_service.import_bundle(
+                    author_id=user.pk,
+                    lines=lines,
+                    chunk_size=options["chunk_size"],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            self.stderr.write(f"Строка {error['line']}: {error['error']}" if error["line"] else error["error"])
+        if report.failed > len(report.errors):
+            self.stderr.write(f"... и ещё {report.failed - len(report.errors)} ошибок")
+        for warning in report.warnings:
+            self.stdout.write(self.style.WARNING(warning))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Викторин: {report.quizzes}, вопросов создано: {report.created}, "
+            f"обновлено: {report.updated}, отклонено строк: {report.failed}"
+        ))
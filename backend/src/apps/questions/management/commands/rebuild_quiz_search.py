@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.questions.application.services.quiz_search_service import quiz_search_service
+
+
+class Command(BaseCommand):
+    help = "Пересобрать поисковые документы викторин (QuizSearchDocument)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Сколько викторин обрабатывать за раз",
+        )
+
+    def handle(self, *args, **options):
+        count = quiz_search_service.rebuild(batch_size=options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Поисковых документов: {count}"))
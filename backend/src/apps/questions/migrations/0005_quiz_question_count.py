@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_question_count(apps, schema_editor):
+    Quiz = apps.get_model('questions', 'Quiz')
+    QuizQuestion = apps.get_model('questions', 'QuizQuestion')
+
+    counts = (
+        QuizQuestion.objects
+        .filter(quiz_id=OuterRef('pk'))
+        .values('quiz_id')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Quiz.objects.update(question_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0004_quiz_views_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='question_count',
+            field=models.PositiveIntegerField(default=0, help_text='Количество вопросов (поддерживается сигналами QuizQuestion)'),
+        ),
+        migrations.RunPython(backfill_question_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0005_quiz_question_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['status', 'visibility', '-created_at', '-id'], name='quiz_catalog_created_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:05
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+# GIN по tsvector и триграммный индекс по названию (оба на таблице документов) - только на PostgreSQL
+POSTGRES_CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS quiz_search_vector_gin ON questions_quizsearchdocument USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS quiz_search_title_trgm_gin ON questions_quizsearchdocument USING gin (title gin_trgm_ops)",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS quiz_search_title_trgm_gin",
+    "DROP INDEX IF EXISTS quiz_search_vector_gin",
+]
+
+
+def create_postgres_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in POSTGRES_CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_postgres_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in POSTGRES_DROP_SQL:
+        schema_editor.execute(sql)
+
+
+def backfill_search_documents(apps, schema_editor):
+    Quiz = apps.get_model('questions', 'Quiz')
+    QuizSearchDocument = apps.get_model('questions', 'QuizSearchDocument')
+
+    quizzes = Quiz.objects.select_related('author').prefetch_related('topics', 'tags').iterator(chunk_size=500)
+    QuizSearchDocument.objects.bulk_create(
+        (
+            QuizSearchDocument(
+                quiz=quiz,
+                title=quiz.title.lower(),
+                description=quiz.description.lower(),
+                keywords=' '.join([t.name for t in quiz.topics.all()] + [t.name for t in quiz.tags.all()]).lower(),
+                author_nickname=(quiz.author.nickname or '').lower(),
+            )
+            for quiz in quizzes
+        ),
+        batch_size=500,
+    )
+
+    if schema_editor.connection.vendor == 'postgresql':
+        vector = None
+        for config in ('russian', 'english'):
+            for field, weight in (('title', 'A'), ('keywords', 'B'), ('description', 'C'), ('author_nickname', 'D')):
+                part = SearchVector(field, config=config, weight=weight)
+                vector = part if vector is None else vector + part
+        QuizSearchDocument.objects.update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0006_quiz_quiz_catalog_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizSearchDocument',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='questions.quiz')),
+                ('title', models.CharField(blank=True, max_length=140)),
+                ('description', models.TextField(blank=True)),
+                ('keywords', models.TextField(blank=True, help_text='Темы и теги через пробел')),
+                ('author_nickname', models.CharField(blank=True, max_length=40)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Поисковый документ викторины',
+                'verbose_name_plural': 'Поисковые документы викторин',
+            },
+        ),
+        migrations.RunPython(create_postgres_search_indexes, drop_postgres_search_indexes),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -60,6 +61,10 @@ class Quiz(models.Model):
     tags = models.ManyToManyField(Tag, related_name="quizzes", blank=True)
 
     views_count = models.PositiveIntegerField(default=0, db_index=True, help_text="Количество просмотров")
+    question_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Количество вопросов (поддерживается сигналами QuizQuestion)"
+    )
 
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -76,6 +81,8 @@ class Quiz(models.Model):
         indexes = [
             models.Index(fields=["author", "status"]),
             models.Index(fields=["title"]),
+            # Каталог: keyset-пагинация по (created_at, id)
+            models.Index(fields=["status", "visibility", "-created_at", "-id"], name="quiz_catalog_created_idx"),
         ]
 
     def __str__(self):
@@ -90,8 +97,19 @@ class Quiz(models.Model):
         self.save(update_fields=["status"])
 
     def increment_views(self):
+        """Атомарный +1 в БД (без Redis-буфера, см. QuizViewCounterService)."""
+        Quiz.objects.filter(pk=self.pk).update(views_count=F("views_count") + 1)
         self.views_count += 1
-        self.save(update_fields=["views_count"])
+
+    def refresh_question_count(self) -> int:
+        """
+        Пересчитать question_count по QuizQuestion.
+
+        Нужен после операций, которые не отправляют сигналы (bulk_create).
+        """
+        self.question_count = QuizQuestion.objects.filter(quiz_id=self.pk).count()
+        Quiz.objects.filter(pk=self.pk).update(question_count=self.question_count)
+        return self.question_count
 
 
 class Question(models.Model):
@@ -153,3 +171,27 @@ class QuizQuestion(models.Model):
 
     def __str__(self):
         return f"{self.quiz.title} -> Q{self.question_id} (#{self.order})"
+
+
+class QuizSearchDocument(models.Model):
+    """
+    Поисковый документ викторины для каталога: название, описание, темы и теги, автор.
+
+    Поддерживается сигналами (apps/questions/signals.py). На PostgreSQL search_vector
+    хранит взвешенный tsvector (russian + english) с GIN-индексом, по title документа
+    есть триграммный индекс; на других СУБД поиск идёт по текстовым полям.
+    """
+    quiz = models.OneToOneField(Quiz, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    title = models.CharField(max_length=140, blank=True)
+    description = models.TextField(blank=True)
+    keywords = models.TextField(blank=True, help_text="Темы и теги через пробел")
+    author_nickname = models.CharField(max_length=40, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Поисковый документ викторины"
+        verbose_name_plural = "Поисковые документы викторин"
+
+    def __str__(self):
+        return f"Search document of quiz #{self.quiz_id}"
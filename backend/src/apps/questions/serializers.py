@@ -38,6 +38,12 @@ class QuestionSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "author", "created_at"]
 
     def get_options_readonly(self, obj):
+        if "options" in getattr(obj, "_prefetched_objects_cache", {}):
+            opts = sorted(obj.options.all(), key=lambda o: (o.order, o.id))
+            return [
+                {"id": o.id, "text": o.text, "is_correct": o.is_correct, "order": o.order}
+                for o in opts
+            ]
         opts = obj.options.order_by("order", "id").values("id", "text", "is_correct", "order")
         return list(opts)
 
@@ -90,7 +96,6 @@ class QuizListSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.nickname", read_only=True)
     topics = TopicSerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
-    question_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Quiz
@@ -99,10 +104,7 @@ class QuizListSerializer(serializers.ModelSerializer):
             "status", "visibility", "topics", "tags",
             "question_count", "views_count", "created_at", "updated_at"
         ]
-        read_only_fields = ["id", "author", "views_count", "created_at", "updated_at"]
-
-    def get_question_count(self, obj):
-        return obj.questions.count()
+        read_only_fields = ["id", "author", "question_count", "views_count", "created_at", "updated_at"]
 
 
 class QuizDetailSerializer(serializers.ModelSerializer):
@@ -209,6 +211,9 @@ class QuizDetailSerializer(serializers.ModelSerializer):
         if quiz_questions:
             QuizQuestion.objects.bulk_create(quiz_questions)
 
+        # bulk_create не отправляет сигналы - пересчитываем счётчик явно
+        quiz.refresh_question_count()
+
 
 class QuizCreateSerializer(serializers.ModelSerializer):
     topic_ids = serializers.ListField(
@@ -266,3 +271,6 @@ class QuizCreateSerializer(serializers.ModelSerializer):
         if quiz_questions:
             QuizQuestion.objects.bulk_create(quiz_questions)
 
+        # bulk_create не отправляет сигналы - пересчитываем счётчик явно
+        quiz.refresh_question_count()
+
@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .application.services.catalog_cache_service import catalog_cache_service
+from .application.services.quiz_search_service import quiz_search_service
+from .models import Question, Quiz, QuizQuestion, QuizSearchDocument, Tag, Topic
+
+# Поля Quiz, входящие в поисковый документ
+SEARCH_DOCUMENT_FIELDS = {"title", "description", "author", "author_id"}
+
+
+@receiver(post_save, sender=QuizQuestion)
+def increment_quiz_question_count(sender, instance, created, **kwargs):
+    """Новый вопрос в викторине -> question_count + 1."""
+    if not created or kwargs.get("raw"):
+        return
+
+    Quiz.objects.filter(pk=instance.quiz_id).update(
+        question_count=F("question_count") + 1
+    )
+
+
+@receiver(post_delete, sender=QuizQuestion)
+def decrement_quiz_question_count(sender, instance, **kwargs):
+    """
+    Вопрос убран из викторины -> question_count - 1.
+
+    Срабатывает и при каскадном удалении (удаление Question).
+    """
+    Quiz.objects.filter(pk=instance.quiz_id).update(
+        question_count=Greatest(F("question_count") - 1, 0)
+    )
+
+
+@receiver(post_save, sender=Quiz)
+def update_quiz_search_document(sender, instance, update_fields=None, **kwargs):
+    """Название, описание или автор изменились -> пересобрать поисковый документ."""
+    if kwargs.get("raw"):
+        return
+    if update_fields is not None and not SEARCH_DOCUMENT_FIELDS & set(update_fields):
+        return
+
+    quiz_search_service.update_documents([instance.pk])
+
+
+@receiver(m2m_changed, sender=Quiz.topics.through)
+@receiver(m2m_changed, sender=Quiz.tags.through)
+def update_quiz_search_document_on_labels(sender, instance, action, reverse, pk_set, **kwargs):
+    """Темы или теги викторины изменились (с любой стороны связи)."""
+    if action == "pre_clear" and reverse:
+        instance._search_quiz_ids = list(instance.quizzes.values_list("id", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        quiz_ids = [instance.pk]
+    elif action == "post_clear":
+        quiz_ids = getattr(instance, "_search_quiz_ids", [])
+    else:
+        quiz_ids = pk_set or []
+    quiz_search_service.update_documents(quiz_ids)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Tag)
+def update_quiz_search_documents_on_label_rename(sender, instance, created, **kwargs):
+    if created or kwargs.get("raw"):
+        return
+
+    quiz_search_service.update_documents(instance.quizzes.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Topic)
+@receiver(pre_delete, sender=Tag)
+def remember_quizzes_of_deleted_label(sender, instance, **kwargs):
+    instance._search_quiz_ids = list(instance.quizzes.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Topic)
+@receiver(post_delete, sender=Tag)
+def update_quiz_search_documents_on_label_delete(sender, instance, **kwargs):
+    quiz_search_service.update_documents(getattr(instance, "_search_quiz_ids", []))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_quiz_search_documents_on_nickname_change(sender, instance, created, update_fields=None, **kwargs):
+    """Смена ника автора -> пересобрать документы его викторин с устаревшим ником."""
+    if created or kwargs.get("raw"):
+        return
+    if update_fields is not None and "nickname" not in update_fields:
+        return
+
+    stale = list(
+        QuizSearchDocument.objects
+        .filter(quiz__author_id=instance.pk)
+        .exclude(author_nickname=(instance.nickname or "").lower())
+        .values_list("quiz_id", flat=True)
+    )
+    if stale:
+        quiz_search_service.update_documents(stale)
+        catalog_cache_service.invalidate(catalog_cache_service.QUIZZES)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+@receiver(m2m_changed, sender=Quiz.topics.through)
+@receiver(m2m_changed, sender=Quiz.tags.through)
+def invalidate_catalog_cache_on_quiz_change(sender, **kwargs):
+    """Викторина, её вопросы, темы или теги изменились -> сбросить кэш каталога."""
+    if kwargs.get("raw") or kwargs.get("action", "post_").startswith("pre_"):
+        return
+
+    catalog_cache_service.invalidate(catalog_cache_service.QUIZZES)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_catalog_cache_on_label_change(sender, **kwargs):
+    """Темы и теги выводятся и в списках, и в карточках викторин."""
+    if kwargs.get("raw"):
+        return
+
+    catalog_cache_service.invalidate(catalog_cache_service.LABELS, catalog_cache_service.QUIZZES)
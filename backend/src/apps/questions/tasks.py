@@ -0,0 +1,33 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_quiz_views():
+    """Сбросить накопленные в Redis просмотры викторин в Quiz.views_count."""
+    from apps.questions.application.services.quiz_view_counter_service import quiz_view_counter_service
+
+    return quiz_view_counter_service.flush()
+
+
+@shared_task
+def validate_published_quizzes():
+    """
+    Ночная проверка целостности: опубликованные викторины, которые больше
+    не проходят валидацию (вопросы удалены или изменены), попадают в лог.
+    """
+    from apps.questions.domain.services.quiz_validation_service import QuizValidationService
+    from apps.questions.models import Quiz
+
+    quizzes = Quiz.objects.filter(status=Quiz.Status.PUBLISHED).order_by('id').iterator(chunk_size=200)
+    invalid = 0
+    for quiz, is_valid, errors in QuizValidationService().validate_many(quizzes):
+        if not is_valid:
+            invalid += 1
+            logger.warning(f"Published quiz {quiz.id} fails validation: {'; '.join(errors)}")
+
+    logger.info(f"Published quizzes validated, {invalid} invalid")
+    return invalid
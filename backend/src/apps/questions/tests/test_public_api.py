@@ -1,6 +1,7 @@
 import pytest
 from model_bakery import baker
-from apps.questions.models import Topic, Tag, Quiz, Question
+from apps.questions.application.services.quiz_search_service import QuizSearchService
+from apps.questions.models import Topic, Tag, Quiz, Question, QuizSearchDocument
 
 
 @pytest.mark.django_db
@@ -89,3 +90,145 @@ def test_home_page_top10(api, user):
 
     views = [item["views_count"] for item in res.data]
     assert views == sorted(views, reverse=True)
+
+
+@pytest.mark.django_db
+def test_public_quizzes_keyset_pagination_walks_ties_in_both_directions(api, user):
+    """
+    ?pagination=cursor: страницы по (created_at, id) без OFFSET,
+    одинаковый created_at не теряет и не дублирует строки.
+    """
+    quizzes = baker.make(Quiz, author=user, status="published", visibility="public", _quantity=5)
+    Quiz.objects.filter(id__in=[q.id for q in quizzes[:3]]).update(created_at=quizzes[0].created_at)
+    expected = list(Quiz.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    res = api.get("/api/quizzes/", {"pagination": "cursor", "page_size": 2})
+    assert res.status_code == 200
+    assert res.data["previous"] is None
+
+    seen, pages = [], [res]
+    while res.data["next"]:
+        seen += [item["id"] for item in res.data["results"]]
+        res = api.get(res.data["next"])
+        pages.append(res)
+    seen += [item["id"] for item in res.data["results"]]
+    assert seen == expected
+    assert len(pages) == 3
+
+    back = api.get(pages[-1].data["previous"])
+    assert [item["id"] for item in back.data["results"]] == [item["id"] for item in pages[-2].data["results"]]
+
+    assert api.get("/api/quizzes/", {"cursor": "broken"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_public_quizzes_search_uses_search_document(api, user):
+    """
+    Поиск идёт по документу викторины (название, описание, темы/теги, автор),
+    документ обновляется сигналами, совпадение в названии выше.
+    """
+    tag = baker.make(Tag, name="астрономия")
+    by_title = baker.make(Quiz, author=user, title="Астрономия для всех", status="published", visibility="public")
+    by_description = baker.make(
+        Quiz, author=user, title="Космос", description="Вопросы по астрономии", status="published", visibility="public"
+    )
+    by_tag = baker.make(Quiz, author=user, title="Звёзды", status="published", visibility="public")
+    by_tag.tags.add(tag)
+    baker.make(Quiz, author=user, title="История", status="published", visibility="public")
+
+    res = api.get("/api/quizzes/", {"search": "астрономи"})
+    ids = [item["id"] for item in res.data["results"]]
+    assert ids[0] == by_title.id
+    assert set(ids) == {by_title.id, by_description.id, by_tag.id}
+
+    by_tag.tags.remove(tag)
+    res = api.get("/api/quizzes/", {"search": "астрономи"})
+    assert by_tag.id not in [item["id"] for item in res.data["results"]]
+
+    user.nickname = "stargazer"
+    user.save(update_fields=["nickname"])
+    res = api.get("/api/quizzes/", {"search": "stargazer"})
+    assert res.data["count"] == 4
+
+
+def test_postgres_search_filters_only_document_table():
+    """Полнотекстовое и триграммное условия - по одной таблице, иначе их GIN-индексы не объединить."""
+    queryset = QuizSearchService()._search_postgres(Quiz.objects.all(), "Астрономя")
+
+    (condition,) = queryset.query.where.children
+    assert condition.connector == "OR"
+    assert {lookup.lhs.target.model for lookup in condition.children} == {QuizSearchDocument}
+    assert condition.children[1].rhs == "астрономя"
+
+
+@pytest.mark.django_db
+def test_public_catalog_is_cached_with_etag_and_invalidated_on_change(api, user, django_assert_num_queries):
+    quiz = baker.make(Quiz, author=user, status="published", visibility="public", title="Первая")
+
+    res = api.get("/api/quizzes/", {"page_size": 5, "ordering": "title"})
+    assert res.status_code == 200
+    etag = res["ETag"]
+    assert etag.startswith('W/"')
+    assert res["Last-Modified"]
+
+    # Тот же набор параметров в другом порядке - тот же ключ, без запросов к БД
+    with django_assert_num_queries(0):
+        cached = api.get("/api/quizzes/", {"ordering": "title", "page_size": 5})
+    assert cached.data == res.data
+    assert cached["ETag"] == etag
+
+    not_modified = api.get("/api/quizzes/", {"page_size": 5, "ordering": "title"}, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+
+    quiz.title = "Переименованная"
+    quiz.save()
+
+    res = api.get("/api/quizzes/", {"page_size": 5, "ordering": "title"}, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.data["results"][0]["title"] == "Переименованная"
+    assert res["ETag"] != etag
+
+    # Переименование темы сбрасывает и списки тем, и карточки викторин
+    topic = baker.make(Topic, name="История")
+    quiz.topics.add(topic)
+    assert api.get("/api/topics/").data["results"][0]["name"] == "История"
+    assert api.get(f"/api/quizzes/{quiz.id}/").data["topics"][0]["name"] == "История"
+
+    topic.name = "Древняя история"
+    topic.save()
+
+    assert api.get("/api/topics/").data["results"][0]["name"] == "Древняя история"
+    detail = api.get(f"/api/quizzes/{quiz.id}/")
+    assert detail.data["topics"][0]["name"] == "Древняя история"
+    assert detail.data["views_count"] == 2
+
+
+@pytest.mark.django_db
+def test_public_quizzes_facets_follow_current_filter(api, user, django_assert_num_queries):
+    history = baker.make(Topic, name="История", slug="history")
+    science = baker.make(Topic, name="Наука", slug="science")
+    easy = baker.make(Tag, name="легко", slug="easy")
+
+    for index in range(3):
+        quiz = baker.make(Quiz, author=user, status="published", visibility="public", title=f"Квиз {index}")
+        quiz.topics.add(history)
+        if index:
+            quiz.tags.add(easy)
+    other = baker.make(Quiz, author=user, status="published", visibility="public")
+    other.topics.add(science, history)
+    hidden = baker.make(Quiz, author=user, status="draft", visibility="public")
+    hidden.topics.add(science)
+
+    # count + страница + темы/теги страницы + фасеты одним запросом
+    with django_assert_num_queries(5):
+        res = api.get("/api/quizzes/", {"facets": 1})
+
+    assert res.status_code == 200
+    assert res.data["count"] == 4
+    assert [(row["name"], row["count"]) for row in res.data["facets"]["topics"]] == [("История", 4), ("Наука", 1)]
+    assert [(row["id"], row["count"]) for row in res.data["facets"]["tags"]] == [(easy.id, 2)]
+
+    res = api.get("/api/quizzes/", {"facets": 1, "tags": str(easy.id)})
+    assert [(row["name"], row["count"]) for row in res.data["facets"]["topics"]] == [("История", 2)]
+
+    assert "facets" not in api.get("/api/quizzes/").data
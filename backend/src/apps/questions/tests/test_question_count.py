@@ -0,0 +1,63 @@
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from apps.questions.models import Quiz, Question, QuizQuestion
+
+
+@pytest.mark.django_db
+def test_question_count_follows_quiz_questions(user):
+    quiz = baker.make(Quiz, author=user)
+    q1 = baker.make(Question, author=user)
+    q2 = baker.make(Question, author=user)
+
+    QuizQuestion.objects.create(quiz=quiz, question=q1, order=1)
+    qq2 = QuizQuestion.objects.create(quiz=quiz, question=q2, order=2)
+
+    quiz.refresh_from_db()
+    assert quiz.question_count == 2
+
+    qq2.delete()
+    quiz.refresh_from_db()
+    assert quiz.question_count == 1
+
+    # Каскадное удаление вопроса тоже уменьшает счётчик
+    q1.delete()
+    quiz.refresh_from_db()
+    assert quiz.question_count == 0
+
+
+@pytest.mark.django_db
+def test_question_count_after_bulk_update_via_api(auth_client, user):
+    quiz = baker.make(Quiz, author=user)
+    questions = baker.make(Question, author=user, _quantity=3)
+
+    payload = {
+        "question_orders": [
+            {"question_id": q.id, "order": idx}
+            for idx, q in enumerate(questions, start=1)
+        ]
+    }
+    res = auth_client.patch(f"/api/quizzes/mine/{quiz.id}/", payload, format="json")
+    assert res.status_code == 200
+
+    quiz.refresh_from_db()
+    assert quiz.question_count == 3
+
+    res = auth_client.get("/api/quizzes/mine/")
+    assert res.data["results"][0]["question_count"] == 3
+
+
+@pytest.mark.django_db
+def test_backfill_question_count_command(user):
+    quiz = baker.make(Quiz, author=user)
+    question = baker.make(Question, author=user)
+    QuizQuestion.objects.create(quiz=quiz, question=question, order=1)
+
+    # Рассинхронизируем счётчик вручную
+    Quiz.objects.filter(pk=quiz.pk).update(question_count=42)
+
+    call_command("backfill_question_count")
+
+    quiz.refresh_from_db()
+    assert quiz.question_count == 1
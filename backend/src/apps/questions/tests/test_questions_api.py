@@ -1,6 +1,9 @@
+import json
+
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from model_bakery import baker
-from apps.questions.models import Question, AnswerOption
+from apps.questions.models import Question, AnswerOption, Quiz, QuizQuestion
 
 @pytest.mark.django_db
 def test_my_questions_list(auth_client, user):
@@ -82,3 +85,73 @@ def test_delete_question(auth_client, user):
 
     assert res.status_code == 204
     assert not Question.objects.filter(id=q.id).exists()
+
+
+@pytest.mark.django_db
+def test_import_questions_csv_reports_row_errors_and_appends_to_quiz(auth_client, user):
+    quiz = baker.make(Quiz, author=user)
+    existing = baker.make(Question, author=user)
+    QuizQuestion.objects.create(quiz=quiz, question=existing, order=1)
+
+    content = (
+        "text,difficulty,points,explanation,option_1,option_2,option_3,correct\n"
+        "Столица Франции?,easy,,,Париж,Берлин,Рим,1\n"
+        "Коротко,easy,,,Да,Нет,,1\n"
+        '"Самая длинная река, по мнению многих?",hard,20,Спорный вопрос,Нил,Амазонка,,2\n'
+        "Сколько планет в Солнечной системе?,medium,,,8,9,,5\n"
+        "Сколько дней в високосном году?,extreme,,,366,365,,1\n"
+        "Сколько секунд в сутках?,hard,86400,,86400,3600,,1\n"
+    )
+    upload = SimpleUploadedFile("bank.csv", content.encode("utf-8"), content_type="text/csv")
+
+    res = auth_client.post("/api/questions/import/", {"file": upload, "quiz": quiz.id}, format="multipart")
+
+    assert res.status_code == 201
+    assert res.data["created"] == 2
+    assert res.data["failed"] == 4
+    assert [error["line"] for error in res.data["errors"]] == [3, 5, 6, 7]
+    assert "32767" in res.data["errors"][3]["error"]
+
+    river = Question.objects.get(text__startswith="Самая длинная река")
+    assert (river.points, river.explanation) == (20, "Спорный вопрос")
+    assert list(river.options.values_list("text", "is_correct", "order")) == [("Нил", False, 1), ("Амазонка", True, 2)]
+    assert Question.objects.get(text="Столица Франции?").points == 5
+
+    assert list(QuizQuestion.objects.filter(quiz=quiz).values_list("order", flat=True)) == [1, 2, 3]
+    quiz.refresh_from_db()
+    assert quiz.question_count == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("quiz_id", ["abc", "0", "-1", "1.5"])
+def test_import_questions_rejects_malformed_quiz_id(auth_client, quiz_id):
+    upload = SimpleUploadedFile("bank.csv", b"text,difficulty,option_1,option_2,correct\n", content_type="text/csv")
+
+    res = auth_client.post("/api/questions/import/", {"file": upload, "quiz": quiz_id}, format="multipart")
+
+    assert res.status_code == 400
+    assert "quiz" in res.data["error"]
+    assert not Question.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_questions_ndjson_uses_constant_number_of_queries(auth_client, user, django_assert_max_num_queries):
+    lines = [
+        json.dumps({
+            "text": f"Сколько будет {index} + {index}?",
+            "difficulty": "easy",
+            "options": [{"text": str(index * 2), "is_correct": True}, {"text": str(index), "is_correct": False}],
+        }, ensure_ascii=False)
+        for index in range(50)
+    ]
+    lines.insert(10, "{не json")
+    upload = SimpleUploadedFile("bank.ndjson", "\n".join(lines).encode("utf-8"))
+
+    # Аутентификация + по 2 INSERT на пачку вопросов и вариантов (+ savepoint)
+    with django_assert_max_num_queries(8):
+        res = auth_client.post("/api/questions/import/", {"file": upload}, format="multipart")
+
+    assert res.status_code == 201
+    assert res.data["created"] == 50
+    assert res.data["errors"][0]["line"] == 11
+    assert AnswerOption.objects.filter(question__author=user).count() == 100
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from model_bakery import baker
+
+from apps.questions.application.services.quiz_bundle_service import QuizBundleService
+from apps.questions.models import AnswerOption, Question, Quiz, QuizQuestion, Tag, Topic
+
+
+def bundle(*records):
+    return [json.dumps(record, ensure_ascii=False) + "\n" for record in ({'type': 'bundle', 'version': 1}, *records)]
+
+
+def quiz_line(ref, title="Столицы", status="draft"):
+    return {'type': 'quiz', 'ref': ref, 'title': title, 'status': status, 'visibility': 'public'}
+
+
+def question_line(text, quiz=None, order=None):
+    return {
+        'type': 'question', 'quiz': quiz, 'order': order, 'text': text, 'difficulty': 'easy', 'points': 5,
+        'options': [{'text': "Да", 'is_correct': True}, {'text': "Нет", 'is_correct': False}],
+    }
+
+
+def composition(quiz):
+    return list(QuizQuestion.objects.filter(quiz=quiz).order_by('order').values_list('question__text', flat=True))
+
+
+@pytest.mark.django_db
+def test_duplicate_order_and_misplaced_question_are_reported_per_line(user):
+    report = QuizBundleService().import_bundle(user.id, bundle(
+        quiz_line(1),
+        question_line("Первый вопрос?", quiz=1, order=1),
+        question_line("Второй вопрос?", quiz=1, order=1),
+        question_line("Первый вопрос?", quiz=1, order=2),
+        quiz_line(2, title="Реки"),
+        question_line("Третий вопрос?", quiz=1, order=3),
+    ))
+
+    assert report.failed == 3
+    assert [error['line'] for error in report.errors] == [4, 5, 7]
+    assert "номер 1" in report.errors[0]['error']
+
+    quiz = Quiz.objects.get(author=user, title="Столицы")
+    assert composition(quiz) == ["Первый вопрос?"]
+    assert quiz.question_count == 1
+    assert Quiz.objects.get(author=user, title="Реки").question_count == 0
+
+
+@pytest.mark.django_db
+def test_crash_before_replacing_composition_keeps_old_one(user, monkeypatch):
+    quiz = baker.make(Quiz, author=user, title="Столицы")
+    for order in (1, 2):
+        question = baker.make(Question, author=user, text=f"Старый вопрос {order}?")
+        QuizQuestion.objects.create(quiz=quiz, question=question, order=order)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(QuizQuestion.objects, 'bulk_create', crash)
+    with pytest.raises(RuntimeError):
+        QuizBundleService().import_bundle(user.id, bundle(quiz_line(1), question_line("Новый вопрос?", quiz=1, order=1)))
+
+    quiz.refresh_from_db()
+    assert composition(quiz) == ["Старый вопрос 1?", "Старый вопрос 2?"]
+    assert quiz.question_count == 2
+
+
+@pytest.mark.django_db
+def test_replaces_composition_and_warns_about_demoted_quiz(user):
+    quiz = baker.make(Quiz, author=user, title="Столицы")
+    QuizQuestion.objects.create(quiz=quiz, question=baker.make(Question, author=user, text="Старый вопрос?"), order=1)
+
+    report = QuizBundleService().import_bundle(user.id, bundle(
+        quiz_line(7, status="published"),
+        question_line("Новый вопрос?", quiz=7, order=1),
+        question_line("Вопрос вне викторин?"),
+    ))
+
+    assert (report.quizzes, report.created, report.failed, report.errors) == (1, 2, 0, [])
+    assert len(report.warnings) == 1
+    assert "«Столицы» сохранена черновиком" in report.warnings[0]
+
+    quiz.refresh_from_db()
+    assert composition(quiz) == ["Новый вопрос?"]
+    assert (quiz.status, quiz.question_count) == ("draft", 1)
+    assert AnswerOption.objects.filter(question__text="Новый вопрос?").count() == 2
+
+
+@pytest.mark.django_db
+def test_database_conflicts_and_long_values_reject_only_their_line(user):
+    baker.make(Topic, name="История", slug="history")
+
+    report = QuizBundleService().import_bundle(user.id, bundle(
+        {'type': 'topic', 'slug': 'istoriya', 'name': "История"},
+        {'type': 'tag', 'slug': 'long', 'name': "т" * 51},
+        quiz_line(1, title="В" * 141),
+        question_line("Вопрос длинной викторины?", quiz=1, order=1),
+        {'type': 'tag', 'slug': 'daty', 'name': "Даты"},
+        quiz_line(2),
+        question_line("Первый вопрос?", quiz=2, order=1),
+    ))
+
+    assert [error['line'] for error in report.errors] == [2, 3, 4, 5]
+    assert "«История» уже занято" in report.errors[0]['error']
+    assert "50" in report.errors[1]['error']
+    assert "140" in report.errors[2]['error']
+
+    assert list(Topic.objects.values_list('slug', flat=True)) == ["history"]
+    assert list(Tag.objects.values_list('slug', flat=True)) == ["daty"]
+    assert composition(Quiz.objects.get(author=user, title="Столицы")) == ["Первый вопрос?"]
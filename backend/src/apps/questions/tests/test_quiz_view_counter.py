@@ -0,0 +1,103 @@
+import pytest
+from model_bakery import baker
+
+from apps.questions.application.services.quiz_view_counter_service import QuizViewCounterService
+from apps.questions.infrastructure.redis_view_counter_repository import RedisViewCounterRepository
+from apps.questions.models import Quiz
+
+
+@pytest.fixture
+def service(fake_redis):
+    service = QuizViewCounterService()
+    service.repository = RedisViewCounterRepository(client_factory=lambda: fake_redis)
+    return service
+
+
+def views_in_db(quiz):
+    return Quiz.objects.values_list('views_count', flat=True).get(id=quiz.id)
+
+
+@pytest.mark.django_db
+def test_views_are_buffered_and_flushed_per_chunk(service, user, django_assert_num_queries):
+    first = baker.make(Quiz, author=user, views_count=5)
+    second = baker.make(Quiz, author=user, views_count=0)
+    service.FLUSH_CHUNK_SIZE = 1
+
+    # Каждый запрос загружает викторину заново
+    for _ in range(3):
+        viewed = Quiz.objects.get(id=first.id)
+        service.register_view(viewed)
+    service.register_view(second)
+
+    # Ответ видит живое значение, в БД - без изменений
+    assert viewed.views_count == 8
+    assert views_in_db(first) == 5
+
+    # Savepoint + один CASE UPDATE на каждую пачку
+    with django_assert_num_queries(4):
+        assert service.flush() == 2
+
+    assert views_in_db(first) == 8
+    assert views_in_db(second) == 1
+    assert service.flush() == 0
+
+
+@pytest.mark.django_db
+def test_view_during_flush_waits_for_next_flush(service, user):
+    quiz = baker.make(Quiz, author=user, views_count=0)
+    service.register_view(quiz)
+
+    take_batch = service.repository.take_batch
+
+    def take_batch_with_concurrent_view():
+        batch = take_batch()
+        # Просмотр, пришедший после RENAMENX, копится в новом pending
+        service.register_view(Quiz.objects.get(id=quiz.id))
+        return batch
+
+    service.repository.take_batch = take_batch_with_concurrent_view
+    assert service.flush() == 1
+    assert views_in_db(quiz) == 1
+
+    service.repository.take_batch = take_batch
+    assert service.flush() == 1
+    assert views_in_db(quiz) == 2
+
+
+@pytest.mark.django_db
+def test_batch_left_by_crashed_flush_is_retried_first(service, user, fake_redis, monkeypatch):
+    quiz = baker.make(Quiz, author=user, views_count=0)
+    service.register_view(quiz)
+    service.register_view(quiz)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("database is down")
+
+    # Сбой UPDATE: забранный batch остаётся в flushing, блокировка снимается
+    with monkeypatch.context() as patch:
+        patch.setattr(Quiz.objects, 'filter', crash)
+        with pytest.raises(RuntimeError):
+            service.flush()
+    assert fake_redis.exists(service.repository.FLUSHING_KEY)
+    assert views_in_db(quiz) == 0
+
+    service.register_view(quiz)
+
+    # Сначала дописывается незавершённый batch, новые просмотры ждут следующего запуска
+    assert service.flush() == 1
+    assert views_in_db(quiz) == 2
+    assert service.flush() == 1
+    assert views_in_db(quiz) == 3
+    assert not fake_redis.exists(service.repository.FLUSHING_KEY)
+
+
+@pytest.mark.django_db
+def test_without_redis_views_are_written_to_database(user):
+    service = QuizViewCounterService()
+    service.repository = RedisViewCounterRepository(client_factory=lambda: None)
+    quiz = baker.make(Quiz, author=user, views_count=2)
+
+    service.register_view(quiz)
+
+    assert views_in_db(quiz) == 3
+    assert service.flush() == 0
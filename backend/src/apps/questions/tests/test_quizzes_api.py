@@ -1,4 +1,9 @@
+import json
+import warnings
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
 from model_bakery import baker
 from apps.questions.models import Quiz, Question, Topic, Tag, QuizQuestion
 
@@ -188,3 +193,86 @@ def test_public_quiz_detail_increments_views(api):
     quiz.refresh_from_db()
     assert quiz.views_count == 1
     assert res.data["views_count"] == 1
+
+
+@pytest.mark.django_db
+def test_quiz_bundle_export_import_round_trip(auth_client, user):
+    import json
+    from django.contrib.auth.hashers import make_password
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from rest_framework.test import APIClient
+    from apps.questions.models import AnswerOption
+
+    topic = baker.make(Topic, name="География", slug="geo")
+    quiz = baker.make(Quiz, author=user, title="Столицы", status="published", visibility="public")
+    quiz.topics.add(topic)
+    for order in range(1, 6):
+        question = baker.make(Question, author=user, text=f"Столица страны №{order}?", difficulty="easy", points=5)
+        AnswerOption.objects.create(question=question, text="Верно", is_correct=True, order=1)
+        AnswerOption.objects.create(question=question, text="Неверно", is_correct=False, order=2)
+        QuizQuestion.objects.create(quiz=quiz, question=question, order=order)
+    loose = baker.make(Question, author=user, text="Вопрос вне викторин?", difficulty="hard", points=15)
+    AnswerOption.objects.create(question=loose, text="Да", is_correct=True, order=1)
+    AnswerOption.objects.create(question=loose, text="Нет", is_correct=False, order=2)
+
+    res = auth_client.get("/api/quizzes/mine/export/")
+    assert res.status_code == 200
+    content = b"".join(res.streaming_content)
+    records = [json.loads(line) for line in content.decode("utf-8").splitlines()]
+    assert [r["type"] for r in records] == ["bundle", "topic", "quiz"] + ["question"] * 6
+    assert [r["order"] for r in records[3:8]] == [1, 2, 3, 4, 5]
+    assert records[-1]["quiz"] is None
+
+    baker.make("users.User", email="other@example.com", nickname="other", is_active=True, password=make_password("12345test"))
+    other = APIClient()
+    token = other.post("/api/auth/login/", {"email": "other@example.com", "password": "12345test"}).data["access"]
+    other.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def upload():
+        return other.post(
+            "/api/quizzes/mine/import/",
+            {"file": SimpleUploadedFile("bundle.ndjson", content)},
+            format="multipart",
+        )
+
+    res = upload()
+    assert res.status_code == 201
+    assert (res.data["quizzes"], res.data["created"], res.data["updated"], res.data["failed"]) == (1, 6, 0, 0)
+
+    copy = Quiz.objects.exclude(pk=quiz.pk).get(title="Столицы")
+    assert copy.author.email == "other@example.com"
+    assert (copy.status, copy.question_count) == ("published", 5)
+    assert list(copy.topics.values_list("slug", flat=True)) == ["geo"]
+    assert list(copy.quizquestion_set.values_list("question__text", flat=True)) == [f"Столица страны №{n}?" for n in range(1, 6)]
+
+    # Повторная загрузка обновляет по естественным ключам, дублей нет
+    res = upload()
+    assert (res.data["quizzes"], res.data["created"], res.data["updated"]) == (1, 0, 6)
+    assert Quiz.objects.filter(author__email="other@example.com").count() == 1
+    assert Question.objects.filter(author__email="other@example.com").count() == 6
+    assert AnswerOption.objects.filter(question__author__email="other@example.com").count() == 12
+    copy.refresh_from_db()
+    assert copy.question_count == 5
+
+
+# ASGI-обработчик выполняет view в своём потоке (своё соединение с БД) - данные должны быть закоммичены
+@pytest.mark.django_db(transaction=True)
+def test_quiz_bundle_export_is_streamed_under_asgi(api, user):
+    quiz = baker.make(Quiz, author=user, title="Столицы")
+    for order in range(1, 4):
+        QuizQuestion.objects.create(quiz=quiz, question=baker.make(Question, author=user), order=order)
+    token = api.post("/api/auth/login/", {"email": "u@example.com", "password": "12345test"}).data["access"]
+
+    async def export():
+        response = await AsyncClient().get("/api/quizzes/mine/export/", headers={"Authorization": f"Bearer {token}"})
+        return response, [chunk async for chunk in response.streaming_content]
+
+    # Синхронный итератор под ASGI буферизуется целиком с предупреждением
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="StreamingHttpResponse must consume")
+        response, chunks = async_to_sync(export)()
+
+    assert response.status_code == 200
+    assert response.is_async
+    records = [json.loads(line) for line in b"".join(chunks).decode("utf-8").splitlines()]
+    assert [record["type"] for record in records] == ["bundle", "quiz"] + ["question"] * 3
@@ -1,4 +1,14 @@
+import io
+from functools import partial
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import generics, permissions
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework import status as http_status
 from .models import Question, Quiz, Topic, Tag
@@ -14,7 +24,14 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from .application.services.create_question_service import CreateQuestionService
+from .application.services.bulk_import_questions_service import bulk_import_questions_service
+from .application.services.quiz_bundle_service import quiz_bundle_service
 from .application.services.publish_quiz_service import PublishQuizService
+from .application.services.quiz_search_service import quiz_search_service
+from .application.services.quiz_view_counter_service import quiz_view_counter_service
+from .application.services.catalog_cache_service import catalog_cache_service
+from .application.services.catalog_facet_service import catalog_facet_service
+from apps.core.pagination import PageNumberOrKeysetPagination
 
 
 class IsAuthor(permissions.BasePermission):
@@ -22,18 +39,29 @@ class IsAuthor(permissions.BasePermission):
         return obj.author_id == request.user.id
 
 
-class TopicListView(generics.ListAPIView):
+class CatalogCacheMixin:
+    """GET из кэша каталога (catalog_cache_service) с ETag / Last-Modified и 304."""
+    cache_namespace = catalog_cache_service.QUIZZES
+
+    def get(self, request, *args, **kwargs):
+        entry = catalog_cache_service.get(self.cache_namespace, request, partial(super().get, request, *args, **kwargs))
+        return catalog_cache_service.respond(request, entry)
+
+
+class TopicListView(CatalogCacheMixin, generics.ListAPIView):
     """Список всех тем"""
     queryset = Topic.objects.all()
     serializer_class = TopicSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespace = catalog_cache_service.LABELS
 
 
-class TagListView(generics.ListAPIView):
+class TagListView(CatalogCacheMixin, generics.ListAPIView):
     """Список всех тегов"""
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespace = catalog_cache_service.LABELS
 
 
 class MyQuestionsListCreateView(generics.ListCreateAPIView):
@@ -107,6 +135,56 @@ class MyQuestionsListCreateView(generics.ListCreateAPIView):
             )
 
 
+class MyQuestionsImportView(generics.GenericAPIView):
+    """Пакетный импорт вопросов из CSV / NDJSON-файла"""
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter("file", openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+                              description="CSV (text, difficulty, points, explanation, option_1..option_6, correct) или NDJSON"),
+            openapi.Parameter("input_format", openapi.IN_FORM, type=openapi.TYPE_STRING, enum=["csv", "ndjson"],
+                              description="Формат файла (по умолчанию - по расширению)"),
+            openapi.Parameter("quiz", openapi.IN_FORM, type=openapi.TYPE_INTEGER,
+                              description="ID своей викторины: добавить в неё импортированные вопросы"),
+        ],
+        responses={201: "created, failed, errors: [{line, error}]"},
+    )
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Не передан файл"}, status=http_status.HTTP_400_BAD_REQUEST)
+
+        input_format = request.data.get("input_format") or bulk_import_questions_service.detect_format(upload.name)
+        if input_format is None:
+            return Response({"error": "Укажите input_format: csv или ndjson"}, status=http_status.HTTP_400_BAD_REQUEST)
+
+        quiz = None
+        if request.data.get("quiz"):
+            quiz_id = str(request.data["quiz"])
+            if not quiz_id.isdigit() or int(quiz_id) < 1:
+                return Response({"error": "quiz должен быть ID викторины"}, status=http_status.HTTP_400_BAD_REQUEST)
+            quiz = get_object_or_404(Quiz, pk=int(quiz_id), author=request.user)
+
+        try:
+            # Файл читается построчно, целиком в память не загружается
+            lines = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            report = bulk_import_questions_service.execute(
+                author_id=request.user.id,
+                lines=lines,
+                input_format=input_format,
+                quiz=quiz,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=http_status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            report.to_dict(),
+            status=http_status.HTTP_201_CREATED if report.created else http_status.HTTP_400_BAD_REQUEST,
+        )
+
+
 class MyQuestionDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuthor]
@@ -145,7 +223,13 @@ class MyQuizzesListCreateView(generics.ListCreateAPIView):
         return QuizListSerializer
 
     def get_queryset(self):
-        return Quiz.objects.filter(author=self.request.user).order_by("-created_at")
+        return (
+            Quiz.objects
+            .filter(author=self.request.user)
+            .select_related("author")
+            .prefetch_related("topics", "tags")
+            .order_by("-created_at")
+        )
 
     @swagger_auto_schema(
         request_body=QuizCreateSerializer,
@@ -175,6 +259,67 @@ class MyQuizzesListCreateView(generics.ListCreateAPIView):
         return Response(output_serializer.data, status=http_status.HTTP_201_CREATED)
 
 
+async def _iterate_in_thread(lines, lines_per_chunk: int = 500):
+    """Асинхронно отдавать строки синхронного генератора пачками, каждая пачка - в потоке sync_to_async."""
+    lines = iter(lines)
+    next_chunk = sync_to_async(lambda: "".join(islice(lines, lines_per_chunk)))
+    while chunk := await next_chunk():
+        yield chunk
+
+
+class MyQuizzesExportView(generics.GenericAPIView):
+    """Выгрузка своих викторин с вопросами в NDJSON-пакет (потоком)"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter("quiz", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="ID викторин через запятую (по умолчанию - вся библиотека, включая вопросы вне викторин)"),
+        ],
+        responses={200: "application/x-ndjson"},
+    )
+    def get(self, request, *args, **kwargs):
+        quiz_ids = None
+        if request.query_params.get("quiz"):
+            quiz_ids = [int(q) for q in request.query_params["quiz"].split(",") if q.isdigit()]
+
+        lines = quiz_bundle_service.export(author_id=request.user.id, quiz_ids=quiz_ids)
+        # Под ASGI (daphne) синхронный генератор был бы собран в список целиком
+        if isinstance(request._request, ASGIRequest):
+            lines = _iterate_in_thread(lines)
+
+        response = StreamingHttpResponse(lines, content_type="application/x-ndjson; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="quizzes-{timezone.localdate():%Y%m%d}.ndjson"'
+        return response
+
+
+class MyQuizzesImportView(generics.GenericAPIView):
+    """Загрузка NDJSON-пакета викторин в свою библиотеку"""
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter("file", openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+                              description="NDJSON-пакет из /api/quizzes/mine/export/"),
+        ],
+        responses={201: "quizzes, created, updated, failed, errors: [{line, error}]"},
+    )
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Не передан файл"}, status=http_status.HTTP_400_BAD_REQUEST)
+
+        lines = io.TextIOWrapper(upload.file, encoding="utf-8-sig")
+        report = quiz_bundle_service.import_bundle(author_id=request.user.id, lines=lines)
+
+        imported = report.quizzes or report.created or report.updated
+        return Response(
+            report.to_dict(),
+            status=http_status.HTTP_201_CREATED if imported else http_status.HTTP_400_BAD_REQUEST,
+        )
+
+
 class MyQuizDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Детальный просмотр/редактирование/удаление моей викторины"""
     serializer_class = QuizDetailSerializer
@@ -190,10 +335,11 @@ class MyQuizDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().patch(request, *args, **kwargs)
 
 
-class PublicQuizzesListView(generics.ListAPIView):
+class PublicQuizzesListView(CatalogCacheMixin, generics.ListAPIView):
     """Публичные опубликованные викторины (каталог)"""
     serializer_class = QuizListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = PageNumberOrKeysetPagination
 
     def get_queryset(self):
         queryset = Quiz.objects.filter(
@@ -221,16 +367,18 @@ class PublicQuizzesListView(generics.ListAPIView):
             else:
                 queryset = queryset.filter(author__nickname__icontains=author)
 
-        # Поиск по названию
-        search = self.request.query_params.get("search")
+        # Полнотекстовый поиск: название, описание, темы, теги, автор
+        search = self.request.query_params.get("search", "").strip()
         if search:
-            queryset = queryset.filter(title__icontains=search)
+            queryset = quiz_search_service.search(queryset, search)
 
-        # Сортировка
-        ordering = self.request.query_params.get("ordering", "-created_at")
+        # Сортировка (при поиске по умолчанию - по релевантности)
+        ordering = self.request.query_params.get("ordering")
         allowed_orderings = ["created_at", "-created_at", "views_count", "-views_count", "title", "-title"]
         if ordering in allowed_orderings:
             queryset = queryset.order_by(ordering)
+        elif search:
+            queryset = queryset.order_by("-search_rank", "-created_at")
         else:
             queryset = queryset.order_by("-created_at")
 
@@ -241,7 +389,7 @@ class PublicQuizzesListView(generics.ListAPIView):
             openapi.Parameter("topics", openapi.IN_QUERY, description="ID тем через запятую (например: 1,2,3)", type=openapi.TYPE_STRING),
             openapi.Parameter("tags", openapi.IN_QUERY, description="ID тегов через запятую (например: 1,2,3)", type=openapi.TYPE_STRING),
             openapi.Parameter("author", openapi.IN_QUERY, description="ID автора или имя автора для фильтрации", type=openapi.TYPE_STRING),
-            openapi.Parameter("search", openapi.IN_QUERY, description="Поиск по названию", type=openapi.TYPE_STRING),
+            openapi.Parameter("search", openapi.IN_QUERY, description="Полнотекстовый поиск: название, описание, темы, теги, автор", type=openapi.TYPE_STRING),
             openapi.Parameter(
                 "ordering",
                 openapi.IN_QUERY,
@@ -251,11 +399,18 @@ class PublicQuizzesListView(generics.ListAPIView):
             ),
             openapi.Parameter("page", openapi.IN_QUERY, description="Номер страницы", type=openapi.TYPE_INTEGER),
             openapi.Parameter("page_size", openapi.IN_QUERY, description="Количество элементов на странице (по умолчанию: 20)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter("facets", openapi.IN_QUERY, description="1 - добавить в ответ facets: число викторин выборки по темам и тегам", type=openapi.TYPE_INTEGER),
         ]
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get("facets") in ("1", "true"):
+            response.data["facets"] = catalog_facet_service.count(self.get_queryset())
+        return response
+
 
 class PublicQuizDetailView(generics.RetrieveAPIView):
     """Детальный просмотр публичной викторины"""
@@ -270,12 +425,17 @@ class PublicQuizDetailView(generics.RetrieveAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.increment_views()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        # Просмотр копится в Redis, в БД его сбросит flush_quiz_views
+        quiz_view_counter_service.register_view(instance)
+
+        # Тело берётся из кэша каталога, счётчик просмотров - живой
+        entry = catalog_cache_service.get(
+            catalog_cache_service.QUIZZES, request, lambda: Response(self.get_serializer(instance).data)
+        )
+        return catalog_cache_service.respond(request, entry, data={**entry.data, "views_count": instance.views_count})
 
 
-class HomePageView(generics.ListAPIView):
+class HomePageView(CatalogCacheMixin, generics.ListAPIView):
     serializer_class = QuizListSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = None
@@ -7,6 +7,7 @@ from apps.rooms.domain.services.room_participant_service import (
 )
 from apps.rooms.domain.repositories import RoomRepository
 from apps.rooms.infrastructure.orm_room_repository import room_repository
+from apps.game.application.services.session_participants_service import session_participants_service
 
 
 class JoinRoomService:
@@ -55,6 +56,8 @@ class JoinRoomService:
             role=RoomParticipant.Role.PLAYER
         )
 
+        session_participants_service.notify_joined(room.id, user_id)
+
         participants_info = self.participant_service.get_participants_info(room)
         
         return {
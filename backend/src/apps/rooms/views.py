@@ -12,6 +12,7 @@ from drf_yasg import openapi
 from .application.services.create_room_service import CreateRoomService
 from .application.services.join_room_service import JoinRoomService
 from apps.rooms.domain.services.room_participant_service import RoomCapacityException
+from apps.game.application.services.session_participants_service import session_participants_service
 
 
 class MyRoomsListView(generics.ListAPIView):
@@ -140,7 +141,9 @@ class RoomLeaveView(APIView):
         room = get_object_or_404(Room, pk=pk)
         if room.host_id == request.user.id:
             return Response({"detail": "Хост не может покинуть комнату. Передайте хостинг или удалите комнату."}, status=400)
-        RoomParticipant.objects.filter(room=room, user=request.user).delete()
+        deleted, _ = RoomParticipant.objects.filter(room=room, user=request.user).delete()
+        if deleted:
+            session_participants_service.notify_left(room.id, request.user.id)
         return Response({"detail": "Вы вышли из комнаты"}, status=200)
 
 
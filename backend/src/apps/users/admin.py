@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import User, QuizBookmark, GameHistory, PasswordResetToken
+from .models import User, QuizBookmark, GameHistory, QuizLeaderboardEntry, UserStatsSnapshot, PasswordResetToken
 
 
 @admin.register(User)
@@ -50,6 +50,29 @@ class GameHistoryAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related("user", "quiz", "room")
 
 
+@admin.register(QuizLeaderboardEntry)
+class QuizLeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "quiz", "user", "best_score", "games_played", "avg_accuracy")
+    search_fields = ("user__email", "user__nickname", "quiz__title")
+    readonly_fields = ("best_score", "games_played", "correct_answers_sum", "total_questions_sum", "avg_accuracy")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("user", "quiz")
+
+
+@admin.register(UserStatsSnapshot)
+class UserStatsSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("user", "total_games", "best_game_points", "bookmarks_count", "active_rooms_count", "updated_at")
+    search_fields = ("user__email", "user__nickname")
+    readonly_fields = (
+        "total_games", "correct_answers_sum", "total_questions_sum", "best_game_points",
+        "bookmarks_count", "active_rooms_count", "updated_at",
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("user")
+
+
 @admin.register(PasswordResetToken)
 class PasswordResetTokenAdmin(admin.ModelAdmin):
     list_display = ("id", "user_email", "token_short", "status_badge", "created_at", "expires_at", "time_left_display")
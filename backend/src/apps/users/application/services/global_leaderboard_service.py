@@ -0,0 +1,200 @@
+from typing import Iterable, Optional
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
+from redis import RedisError
+
+from apps.users.application.services.score_histogram_service import score_histogram_service
+from apps.users.infrastructure.redis_leaderboard_repository import leaderboard_repository
+from apps.users.models import GameHistory, User
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardSlice:
+    """
+    Ленивый список строк рейтинга из Redis для стандартного пагинатора DRF:
+    len() - ZCARD, срез - ZREVRANGE нужной страницы.
+    """
+
+    def __init__(self, repository, limit: Optional[int] = None):
+        self.repository = repository
+        self.limit = limit
+
+    def __len__(self) -> int:
+        total = self.repository.count()
+        return min(total, self.limit) if self.limit else total
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+
+        start = item.start or 0
+        stop = min(item.stop if item.stop is not None else len(self), len(self))
+        return [
+            GlobalLeaderboardService.with_accuracy(entry)
+            for entry in self.repository.get_range(start, stop)
+        ]
+
+
+class GlobalLeaderboardService:
+    """
+    Глобальный рейтинг игроков.
+
+    Основное хранилище - sorted set в Redis, обновляется после завершения
+    игры и пересобирается командой rebuild_global_leaderboard.
+    Без Redis (или пока рейтинг не собран) данные берутся из БД.
+    """
+
+    REBUILD_LOCK_KEY = "leaderboard:global:rebuild_lock"
+    REBUILD_LOCK_TTL = 300
+
+    def __init__(self):
+        self.repository = leaderboard_repository
+
+    def entries_queryset(self, user_ids: Optional[Iterable[int]] = None) -> QuerySet:
+        """Строки рейтинга из БД: активные пользователи хотя бы с одной игрой."""
+        queryset = User.objects.filter(is_active=True)
+        if user_ids is not None:
+            queryset = queryset.filter(id__in=user_ids)
+
+        return queryset.annotate(
+            total_games=Count('game_history'),
+            correct_answers=Coalesce(
+                Sum('game_history__correct_answers', filter=Q(game_history__total_questions__gt=0)), 0
+            ),
+            total_questions=Coalesce(Sum('game_history__total_questions'), 0),
+        ).filter(total_games__gt=0)
+
+    def ranked_queryset(self) -> QuerySet:
+        """
+        Рейтинг из БД одним запросом (когда Redis недоступен).
+        """
+        players_above = (
+            User.objects
+            .filter(is_active=True, total_points__gt=OuterRef('total_points'))
+            .values('is_active')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        return self.entries_queryset().annotate(
+            leaderboard_rank=Coalesce(Subquery(players_above), 0) + 1
+        )
+
+    def get_slice(self, limit: Optional[int] = None) -> Optional[LeaderboardSlice]:
+        """
+        Рейтинг из Redis или None, если Redis недоступен или рейтинг не собран.
+        """
+        if self.repository.client is None:
+            return None
+
+        try:
+            if self.repository.exists():
+                return LeaderboardSlice(self.repository, limit)
+        except RedisError as e:
+            logger.warning(f"Global leaderboard is unavailable in Redis: {e}")
+            return None
+
+        self.schedule_rebuild()
+        return None
+
+    def get_rank(self, user: User) -> int:
+        """Место пользователя: из Redis, иначе подсчётом в БД."""
+        if self.repository.client is not None:
+            try:
+                rank = self.repository.get_rank(user.id)
+                if rank is not None:
+                    return rank
+            except RedisError as e:
+                logger.warning(f"Failed to read rank of user {user.id} from Redis: {e}")
+
+        return User.objects.filter(is_active=True, total_points__gt=user.total_points).count() + 1
+
+    def get_rank_info(self, user: User) -> dict:
+        """
+        Место и процентиль игрока.
+
+        Точное место (sorted set или COUNT) - только для топ-N, в длинном хвосте
+        место приблизительное, по гистограмме очков, без подсчёта игроков.
+        """
+        histogram = score_histogram_service.get()
+        if histogram is not None:
+            rank = histogram.rank(user.total_points)
+            if rank > settings.LEADERBOARD_EXACT_RANK_TOP_N:
+                return {'rank': rank, 'top_percent': histogram.top_percent(rank), 'is_approximate': True}
+
+        rank = self.get_rank(user)
+        return {
+            'rank': rank,
+            'top_percent': histogram.top_percent(rank) if histogram is not None else None,
+            'is_approximate': False,
+        }
+
+    def refresh_users(self, user_ids: Iterable[int]) -> int:
+        """
+        Пересчитать строки рейтинга указанных пользователей по БД.
+
+        Пользователи, которых больше нет в рейтинге (деактивированы, нет игр), удаляются из Redis.
+        """
+        user_ids = list(user_ids)
+        if not user_ids or self.repository.client is None:
+            return 0
+
+        entries = list(self.entries_queryset(user_ids).values(
+            'nickname', 'total_points', 'total_wins', 'total_games', 'correct_answers', 'total_questions',
+            user_id=F('id'),
+        ))
+        try:
+            for user_id in set(user_ids) - {entry['user_id'] for entry in entries}:
+                self.repository.remove(user_id)
+            return self.repository.save_entries(entries)
+        except RedisError as e:
+            logger.warning(f"Failed to update global leaderboard: {e}")
+            return 0
+
+    def refresh_session_players_on_commit(self, session_id: int) -> None:
+        """Обновить рейтинг участников завершённой игры после коммита."""
+        transaction.on_commit(lambda: self._refresh_session_players(session_id))
+
+    def _refresh_session_players(self, session_id: int) -> None:
+        if self.repository.client is None:
+            return
+
+        user_ids = GameHistory.objects.filter(session_id=session_id).values_list('user_id', flat=True)
+        self.refresh_users(user_ids)
+
+    def rebuild(self) -> int:
+        """Пересобрать рейтинг целиком из БД."""
+        entries = self.entries_queryset().values(
+            'nickname', 'total_points', 'total_wins', 'total_games', 'correct_answers', 'total_questions',
+            user_id=F('id'),
+        ).order_by().iterator(chunk_size=2000)
+
+        count = self.repository.replace_all(entries)
+        logger.info(f"Global leaderboard rebuilt: {count} players")
+        return count
+
+    def schedule_rebuild(self) -> None:
+        """Запустить фоновую пересборку (не чаще раза в REBUILD_LOCK_TTL)."""
+        from apps.users.tasks import rebuild_global_leaderboard
+
+        if not cache.add(self.REBUILD_LOCK_KEY, 1, timeout=self.REBUILD_LOCK_TTL):
+            return
+
+        try:
+            rebuild_global_leaderboard.delay()
+        except Exception as e:
+            logger.warning(f"Failed to schedule global leaderboard rebuild: {e}")
+
+    @staticmethod
+    def with_accuracy(entry: dict) -> dict:
+        questions = entry.get('total_questions') or 0
+        entry['avg_accuracy'] = round(entry['correct_answers'] / questions * 100, 1) if questions else 0
+        return entry
+
+
+global_leaderboard_service = GlobalLeaderboardService()
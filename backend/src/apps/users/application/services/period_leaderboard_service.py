@@ -0,0 +1,181 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from redis import RedisError
+
+from apps.users.application.services.global_leaderboard_service import global_leaderboard_service
+from apps.users.infrastructure.redis_period_leaderboard_repository import period_leaderboard_repository
+from apps.users.models import GameHistory, User
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodLeaderboardService:
+    """
+    Рейтинги игроков за день, неделю, месяц и за всё время.
+
+    Очки за игру попадают в дневную корзину Redis после сохранения
+    GameHistory (apps/users/signals.py). Неделя - с понедельника,
+    месяц - с первого числа. "За всё время" - глобальный рейтинг.
+    Без Redis (или пока корзины не собраны) рейтинг считается по GameHistory.
+    """
+
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+    ALL = 'all'
+    PERIODS = (DAY, WEEK, MONTH, ALL)
+
+    REBUILD_LOCK_KEY = "leaderboard:periods:rebuild_lock"
+    REBUILD_LOCK_TTL = 300
+
+    def __init__(self):
+        self.repository = period_leaderboard_repository
+
+    @property
+    def retention_days(self) -> int:
+        return settings.LEADERBOARD_PERIOD_RETENTION_DAYS
+
+    def period_days(self, period: str, today: Optional[date] = None) -> List[date]:
+        """Дни периода по сегодняшний включительно."""
+        today = today or timezone.localdate()
+        if period == self.DAY:
+            start = today
+        elif period == self.WEEK:
+            start = today - timedelta(days=today.weekday())
+        elif period == self.MONTH:
+            start = today.replace(day=1)
+        else:
+            raise ValueError(f"Unknown leaderboard period: {period}")
+
+        return [start + timedelta(days=offset) for offset in range((today - start).days + 1)]
+
+    def get_leaderboard(self, period: str, limit: int) -> List[dict]:
+        """Строки рейтинга за период: rank, user_id, nickname, points."""
+        if period == self.ALL:
+            return self._get_all_time(limit)
+
+        days = self.period_days(period)
+        top = self._get_top_from_redis(period, days, limit)
+        if top is None:
+            return self._rank(
+                GameHistory.objects
+                .filter(played_at__gte=self._day_start(days[0]), user__is_active=True)
+                .values('user_id')
+                .annotate(nickname=F('user__nickname'), points=Sum('final_points'))
+                .order_by('-points', 'user_id')[:limit]
+            )
+
+        nicknames = dict(
+            User.objects.filter(id__in=[user_id for user_id, _ in top], is_active=True).values_list('id', 'nickname')
+        )
+        return self._rank(
+            {'user_id': user_id, 'nickname': nicknames[user_id], 'points': points}
+            for user_id, points in top
+            if user_id in nicknames
+        )
+
+    def _get_top_from_redis(self, period: str, days: List[date], limit: int) -> Optional[List[Tuple[int, int]]]:
+        if self.repository.client is None:
+            return None
+
+        try:
+            if self.repository.is_built():
+                return self.repository.get_top(period, days, limit, settings.LEADERBOARD_PERIOD_CACHE_TTL)
+        except RedisError as e:
+            logger.warning(f"Period leaderboard is unavailable in Redis: {e}")
+            return None
+
+        self.schedule_rebuild()
+        return None
+
+    def _get_all_time(self, limit: int) -> List[dict]:
+        entries = global_leaderboard_service.get_slice(limit=limit)
+        if entries is not None:
+            entries = entries[:limit]
+        else:
+            entries = (
+                global_leaderboard_service.ranked_queryset()
+                .order_by('-total_points', '-total_wins')
+                .values('id', 'nickname', 'total_points', rank=F('leaderboard_rank'))[:limit]
+            )
+
+        return [
+            {'rank': entry['rank'], 'user_id': entry['id'], 'nickname': entry['nickname'], 'points': entry['total_points']}
+            for entry in entries
+        ]
+
+    @staticmethod
+    def _rank(rows) -> List[dict]:
+        """Проставить места: при равных очках место общее."""
+        ranked = []
+        for position, row in enumerate(rows, start=1):
+            if ranked and ranked[-1]['points'] == row['points']:
+                row['rank'] = ranked[-1]['rank']
+            else:
+                row['rank'] = position
+            ranked.append(row)
+        return ranked
+
+    @staticmethod
+    def _day_start(day: date) -> datetime:
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def record_game(self, user_id: int, points: int, played_at: datetime) -> None:
+        """Добавить очки завершённой игры в корзину её дня."""
+        if not points or self.repository.client is None:
+            return
+
+        day = timezone.localdate(played_at)
+        if day <= timezone.localdate() - timedelta(days=self.retention_days):
+            return
+
+        try:
+            self.repository.add_points(day, user_id, points, self.retention_days)
+        except RedisError as e:
+            logger.warning(f"Failed to update period leaderboard for user {user_id}: {e}")
+
+    def rebuild(self, days: Optional[int] = None) -> int:
+        """Пересобрать дневные корзины за последние days дней по GameHistory.played_at."""
+        days = min(days or self.retention_days, self.retention_days)
+        today = timezone.localdate()
+        first_day = today - timedelta(days=days - 1)
+
+        points_by_day = {first_day + timedelta(days=offset): {} for offset in range(days)}
+        self.repository.begin_rebuild(list(points_by_day))
+
+        rows = (
+            GameHistory.objects
+            .filter(played_at__gte=self._day_start(first_day), final_points__gt=0)
+            .annotate(day=TruncDate('played_at'))
+            .values('day', 'user_id')
+            .annotate(points=Sum('final_points'))
+            .order_by()
+        )
+        for row in rows.iterator():
+            points_by_day.setdefault(row['day'], {})[row['user_id']] = row['points']
+
+        count = self.repository.replace_days(points_by_day, self.retention_days)
+        logger.info(f"Period leaderboards rebuilt: {count} rows for {days} days")
+        return count
+
+    def schedule_rebuild(self) -> None:
+        """Запустить фоновую пересборку (не чаще раза в REBUILD_LOCK_TTL)."""
+        from apps.users.tasks import rebuild_period_leaderboards
+
+        if not cache.add(self.REBUILD_LOCK_KEY, 1, timeout=self.REBUILD_LOCK_TTL):
+            return
+
+        try:
+            rebuild_period_leaderboards.delay()
+        except Exception as e:
+            logger.warning(f"Failed to schedule period leaderboard rebuild: {e}")
+
+
+period_leaderboard_service = PeriodLeaderboardService()
@@ -0,0 +1,116 @@
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ScoreHistogram:
+    """
+    Распределение total_points активных игроков по корзинам ширины bucket_size.
+
+    buckets - номера непустых корзин по возрастанию, counts - игроков в корзине,
+    above - игроков во всех корзинах выше данной.
+    """
+    bucket_size: int
+    total: int
+    buckets: List[int]
+    counts: List[int]
+    above: List[int]
+    built_at: str
+
+    def rank(self, points: int) -> int:
+        """Приблизительное место: игроки из корзин выше + доля своей корзины."""
+        bucket = points // self.bucket_size
+        index = bisect_left(self.buckets, bucket)
+        if index == len(self.buckets):
+            return 1
+        if self.buckets[index] != bucket:
+            return self.above[index] + self.counts[index] + 1
+
+        # Внутри корзины игроки считаются распределёнными равномерно
+        share_above = (self.bucket_size - 1 - (points - bucket * self.bucket_size)) / self.bucket_size
+        return self.above[index] + int(self.counts[index] * share_above) + 1
+
+    def top_percent(self, rank: int) -> float:
+        """Доля игроков не ниже этого места, % ("топ 12%")."""
+        if not self.total:
+            return 100.0
+        return max(round(min(rank, self.total) / self.total * 100, 1), 0.1)
+
+
+class ScoreHistogramService:
+    """
+    Гистограмма очков для приблизительного места и процентиля без COUNT по всем игрокам.
+
+    Пересчитывается задачей refresh_score_histogram (Celery beat) одним GROUP BY
+    и хранится в кэше целиком.
+    """
+
+    CACHE_KEY = "leaderboard:score_histogram"
+    REFRESH_LOCK_KEY = "leaderboard:score_histogram:refresh_lock"
+    REFRESH_LOCK_TTL = 300
+
+    def get(self) -> Optional[ScoreHistogram]:
+        """Текущая гистограмма или None (тогда планируется пересчёт)."""
+        data = cache.get(self.CACHE_KEY)
+        if data is None:
+            self.schedule_refresh()
+            return None
+        return ScoreHistogram(**data)
+
+    def refresh(self, bucket_size: Optional[int] = None) -> ScoreHistogram:
+        bucket_size = bucket_size or settings.LEADERBOARD_HISTOGRAM_BUCKET_SIZE
+
+        rows = (
+            User.objects
+            .filter(is_active=True)
+            .annotate(bucket=F('total_points') / bucket_size)
+            .values('bucket')
+            .annotate(players=Count('id'))
+            .order_by('-bucket')
+        )
+
+        buckets, counts, above = [], [], []
+        players_above = 0
+        for row in rows:
+            buckets.append(row['bucket'])
+            counts.append(row['players'])
+            above.append(players_above)
+            players_above += row['players']
+
+        histogram = ScoreHistogram(
+            bucket_size=bucket_size,
+            total=players_above,
+            buckets=buckets[::-1],
+            counts=counts[::-1],
+            above=above[::-1],
+            built_at=timezone.now().isoformat(),
+        )
+        cache.set(self.CACHE_KEY, asdict(histogram), timeout=None)
+        logger.info(f"Score histogram rebuilt: {players_above} players in {len(buckets)} buckets")
+        return histogram
+
+    def schedule_refresh(self) -> None:
+        """Запустить фоновый пересчёт (не чаще раза в REFRESH_LOCK_TTL)."""
+        from apps.users.tasks import refresh_score_histogram
+
+        if not cache.add(self.REFRESH_LOCK_KEY, 1, timeout=self.REFRESH_LOCK_TTL):
+            return
+
+        try:
+            refresh_score_histogram.delay()
+        except Exception as e:
+            logger.warning(f"Failed to schedule score histogram refresh: {e}")
+
+
+score_histogram_service = ScoreHistogramService()
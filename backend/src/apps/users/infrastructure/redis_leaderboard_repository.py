@@ -0,0 +1,141 @@
+from typing import Iterable, List, Optional
+import logging
+
+from apps.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class RedisLeaderboardRepository:
+    """
+    Глобальный рейтинг в Redis.
+
+    Sorted set: member = user_id, score = total_points * WINS_FACTOR + total_wins
+    (сортировка по очкам, при равенстве - по победам). Данные строки
+    (ник, игры, точность) лежат в hash пользователя.
+    """
+
+    GLOBAL_KEY = "leaderboard:global"
+    REBUILD_KEY = "leaderboard:global:rebuild"
+    USER_KEY_TEMPLATE = "leaderboard:global:user:{id}"
+
+    WINS_FACTOR = 10 ** 6
+
+    ENTRY_FIELDS = ('nickname', 'total_points', 'total_wins', 'total_games', 'correct_answers', 'total_questions')
+
+    def __init__(self, client_factory=get_redis_client):
+        self._client_factory = client_factory
+
+    @property
+    def client(self):
+        return self._client_factory()
+
+    def _get_user_key(self, user_id: int) -> str:
+        return self.USER_KEY_TEMPLATE.format(id=user_id)
+
+    def _score(self, entry: dict) -> int:
+        return entry['total_points'] * self.WINS_FACTOR + min(entry['total_wins'], self.WINS_FACTOR - 1)
+
+    def save_entries(self, entries: Iterable[dict], key: Optional[str] = None) -> int:
+        """Записать строки рейтинга (идемпотентно). Возвращает количество."""
+        client = self.client
+        key = key or self.GLOBAL_KEY
+
+        pipe = client.pipeline(transaction=False)
+        count = 0
+        for entry in entries:
+            pipe.zadd(key, {entry['user_id']: self._score(entry)})
+            pipe.hset(self._get_user_key(entry['user_id']), mapping={
+                'nickname': entry['nickname'] or '',
+                **{field: entry[field] or 0 for field in self.ENTRY_FIELDS if field != 'nickname'},
+            })
+            count += 1
+            if count % 1000 == 0:
+                pipe.execute()
+        pipe.execute()
+        return count
+
+    def replace_all(self, entries: Iterable[dict]) -> int:
+        """
+        Пересобрать рейтинг: запись во временный ключ и атомарный RENAME.
+        """
+        client = self.client
+        client.delete(self.REBUILD_KEY)
+
+        count = self.save_entries(entries, key=self.REBUILD_KEY)
+        if count:
+            client.rename(self.REBUILD_KEY, self.GLOBAL_KEY)
+        else:
+            client.delete(self.GLOBAL_KEY)
+        return count
+
+    def remove(self, user_id: int) -> None:
+        client = self.client
+        client.zrem(self.GLOBAL_KEY, user_id)
+        client.delete(self._get_user_key(user_id))
+
+    def exists(self) -> bool:
+        return bool(self.client.exists(self.GLOBAL_KEY))
+
+    def count(self) -> int:
+        return self.client.zcard(self.GLOBAL_KEY)
+
+    def get_range(self, start: int, stop: int) -> List[dict]:
+        """
+        Строки рейтинга [start, stop) с местами: O(log n + k).
+
+        Место = число игроков с большим количеством очков + 1
+        (при равных очках место общее).
+        """
+        if stop <= start:
+            return []
+
+        client = self.client
+        members = client.zrevrange(self.GLOBAL_KEY, start, stop - 1, withscores=True)
+        if not members:
+            return []
+
+        pipe = client.pipeline(transaction=False)
+        for member, _ in members:
+            pipe.hgetall(self._get_user_key(int(member)))
+        first_points = int(members[0][1]) // self.WINS_FACTOR
+        pipe.zcount(self.GLOBAL_KEY, (first_points + 1) * self.WINS_FACTOR, '+inf')
+        *rows, above_first = pipe.execute()
+
+        entries = []
+        rank = above_first + 1
+        previous_points = first_points
+        for position, ((member, score), row) in enumerate(zip(members, rows), start=start):
+            points = int(score) // self.WINS_FACTOR
+            if points != previous_points:
+                rank = position + 1
+                previous_points = points
+
+            entries.append({
+                'id': int(member),
+                'nickname': _decode(row.get(b'nickname', b'')),
+                'total_points': points,
+                'total_wins': int(row.get(b'total_wins', 0)),
+                'total_games': int(row.get(b'total_games', 0)),
+                'correct_answers': int(row.get(b'correct_answers', 0)),
+                'total_questions': int(row.get(b'total_questions', 0)),
+                'rank': rank,
+            })
+        return entries
+
+    def get_rank(self, user_id: int) -> Optional[int]:
+        """Место игрока (ZSCORE + ZCOUNT) или None, если его нет в рейтинге."""
+        client = self.client
+        score = client.zscore(self.GLOBAL_KEY, user_id)
+        if score is None:
+            return None
+
+        points = int(score) // self.WINS_FACTOR
+        return client.zcount(self.GLOBAL_KEY, (points + 1) * self.WINS_FACTOR, '+inf') + 1
+
+
+def _decode(value) -> str:
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+leaderboard_repository = RedisLeaderboardRepository()
@@ -0,0 +1,128 @@
+from datetime import date
+from typing import Dict, List, Tuple
+
+from apps.core.redis_client import get_redis_client
+
+
+class RedisPeriodLeaderboardRepository:
+    """
+    Рейтинги за период (день, неделя, месяц) в Redis.
+
+    Очки пишутся в дневные корзины: sorted set на сутки, member = user_id,
+    score = сумма очков за день. Корзина живёт retention_days и удаляется по TTL.
+    Рейтинг за несколько дней - ZUNIONSTORE корзин в кэширующий ключ с коротким TTL.
+
+    Пока идёт пересборка (ключ REBUILDING_KEY), очки пишутся и в корзину,
+    и в дельту дня; при замене корзины дельта суммируется с пересобранными
+    данными, поэтому очки, пришедшие во время пересборки, не теряются.
+    """
+
+    DAY_KEY_TEMPLATE = "leaderboard:day:{day:%Y%m%d}"
+    UNION_KEY_TEMPLATE = "leaderboard:{period}:{start:%Y%m%d}:{end:%Y%m%d}"
+    REBUILD_SUFFIX = ":rebuild"
+    DELTA_SUFFIX = ":delta"
+    BUILT_KEY = "leaderboard:periods:built"
+    REBUILDING_KEY = "leaderboard:periods:rebuilding"
+
+    DAY_SECONDS = 24 * 60 * 60
+    REBUILDING_TTL = 600
+
+    def __init__(self, client_factory=get_redis_client):
+        self._client_factory = client_factory
+
+    @property
+    def client(self):
+        return self._client_factory()
+
+    def _get_day_key(self, day: date) -> str:
+        return self.DAY_KEY_TEMPLATE.format(day=day)
+
+    def add_points(self, day: date, user_id: int, points: int, retention_days: int) -> None:
+        """Добавить очки игрока в корзину дня (и в дельту, если идёт пересборка)."""
+        key = self._get_day_key(day)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zincrby(key, points, user_id)
+        pipe.expire(key, retention_days * self.DAY_SECONDS)
+        pipe.exists(self.REBUILDING_KEY)
+        *_, rebuilding = pipe.execute()
+
+        # Пересборка, начатая после этой проверки, прочитает игру из БД сама
+        if rebuilding:
+            delta_key = key + self.DELTA_SUFFIX
+            pipe = self.client.pipeline(transaction=False)
+            pipe.zincrby(delta_key, points, user_id)
+            pipe.expire(delta_key, self.REBUILDING_TTL)
+            pipe.execute()
+
+    def begin_rebuild(self, days: List[date]) -> None:
+        """
+        Отметить начало пересборки - до чтения очков из БД,
+        чтобы игры, записанные после чтения, попали в дельты.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(*[self._get_day_key(day) + self.DELTA_SUFFIX for day in days])
+        pipe.set(self.REBUILDING_KEY, 1, ex=self.REBUILDING_TTL)
+        pipe.execute()
+
+    def replace_days(self, points_by_day: Dict[date, Dict[int, int]], retention_days: int) -> int:
+        """
+        Пересобрать дневные корзины: запись во временный ключ и атомарная
+        (MULTI) замена корзины суммой временного ключа и дельты дня.
+        Дни без очков и без дельты удаляются. Возвращает количество записанных строк.
+        """
+        client = self.client
+        ttl = retention_days * self.DAY_SECONDS
+        count = 0
+        for day, points in points_by_day.items():
+            key = self._get_day_key(day)
+            rebuild_key = key + self.REBUILD_SUFFIX
+            delta_key = key + self.DELTA_SUFFIX
+
+            if points:
+                pipe = client.pipeline(transaction=False)
+                pipe.delete(rebuild_key)
+                pipe.zadd(rebuild_key, points)
+                pipe.expire(rebuild_key, ttl)
+                pipe.execute()
+                count += len(points)
+
+            # Пустой результат ZUNIONSTORE удаляет корзину
+            pipe = client.pipeline(transaction=True)
+            pipe.zunionstore(key, [rebuild_key, delta_key], aggregate='SUM')
+            pipe.expire(key, ttl)
+            pipe.delete(rebuild_key, delta_key)
+            pipe.execute()
+
+        pipe = client.pipeline(transaction=False)
+        pipe.set(self.BUILT_KEY, 1, ex=ttl)
+        pipe.delete(self.REBUILDING_KEY)
+        pipe.execute()
+        return count
+
+    def is_built(self) -> bool:
+        return bool(self.client.exists(self.BUILT_KEY))
+
+    def get_top(self, period: str, days: List[date], limit: int, cache_ttl: int) -> List[Tuple[int, int]]:
+        """
+        Топ игроков за дни days: [(user_id, очки), ...] по убыванию очков.
+
+        Для одного дня читается корзина, для нескольких - результат
+        ZUNIONSTORE, закэшированный на cache_ttl секунд.
+        """
+        client = self.client
+        if len(days) == 1:
+            key = self._get_day_key(days[0])
+        else:
+            key = self.UNION_KEY_TEMPLATE.format(period=period, start=days[0], end=days[-1])
+            if not client.exists(key):
+                day_keys = [self._get_day_key(day) for day in days]
+                pipe = client.pipeline(transaction=False)
+                pipe.zunionstore(key, day_keys, aggregate='SUM')
+                pipe.expire(key, cache_ttl)
+                pipe.execute()
+
+        members = client.zrevrange(key, 0, limit - 1, withscores=True)
+        return [(int(member), int(score)) for member, score in members]
+
+
+period_leaderboard_repository = RedisPeriodLeaderboardRepository()
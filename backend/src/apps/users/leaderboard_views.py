@@ -6,9 +6,12 @@ from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from .models import User, GameHistory
-from .serializers import UserLeaderboardSerializer
+from .models import User, GameHistory, QuizLeaderboardEntry, UserStatsSnapshot
+from .serializers import UserLeaderboardSerializer, GlobalLeaderboardEntrySerializer
+from .application.services.global_leaderboard_service import global_leaderboard_service
+from .application.services.period_leaderboard_service import period_leaderboard_service
 from apps.questions.models import Quiz
+from apps.core.pagination import PageNumberOrKeysetPagination
 
 
 class GlobalLeaderboardView(generics.ListAPIView):
@@ -18,6 +21,15 @@ class GlobalLeaderboardView(generics.ListAPIView):
     """
     serializer_class = UserLeaderboardSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = PageNumberOrKeysetPagination
+
+    # Порядок keyset-страниц по ?ordering (победы без индекса - по очкам)
+    KEYSET_ORDERINGS = {
+        '-total_points': ('-total_points', '-id'),
+        'total_points': ('total_points', 'id'),
+        'nickname': ('nickname',),
+        '-nickname': ('-nickname',),
+    }
 
     @swagger_auto_schema(
         operation_description="Глобальная таблица лидеров. Сортировка по очкам и победам.",
@@ -41,30 +53,45 @@ class GlobalLeaderboardView(generics.ListAPIView):
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+    def list(self, request, *args, **kwargs):
+        # Основной порядок отдаётся из sorted set в Redis (ZREVRANGE по месту, без OFFSET в БД);
+        # keyset-пагинация идёт по индексу user_points_id_idx (-total_points, -id) в БД
+        keyset = self.pagination_class.is_keyset_requested(request)
+        if not keyset and request.query_params.get('ordering', '-total_points') == '-total_points':
+            entries = global_leaderboard_service.get_slice(limit=self._get_limit())
+            if entries is not None:
+                page = self.paginate_queryset(entries)
+                return self.get_paginated_response(GlobalLeaderboardEntrySerializer(page, many=True).data)
+
+        return super().list(request, *args, **kwargs)
+
+    def _get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', 100))
+        except (ValueError, TypeError):
+            return 100
+        return limit if limit > 0 else None
+
     def get_queryset(self):
-        # Только активные пользователи с хотя бы одной игрой
-        queryset = User.objects.filter(
-            is_active=True,
-            game_history__isnull=False
-        ).distinct()
+        # Только активные пользователи с хотя бы одной игрой, игры/точность/место - аннотациями
+        queryset = global_leaderboard_service.ranked_queryset()
 
         # Сортировка
         ordering = self.request.query_params.get('ordering', '-total_points')
         allowed_orderings = ['-total_points', 'total_points', '-total_wins', 'total_wins', 'nickname', '-nickname']
 
-        if ordering in allowed_orderings:
+        if self.pagination_class.is_keyset_requested(self.request):
+            # Ключ курсора совпадает с индексом: очки - user_points_id_idx, ник - уникальный индекс
+            queryset = queryset.order_by(*self.KEYSET_ORDERINGS.get(ordering, self.KEYSET_ORDERINGS['-total_points']))
+        elif ordering in allowed_orderings:
             queryset = queryset.order_by(ordering, '-total_points', 'nickname')
         else:
             queryset = queryset.order_by('-total_points', '-total_wins', 'nickname')
 
-        # Лимит результатов
-        limit = self.request.query_params.get('limit', 100)
-        try:
-            limit = int(limit)
-            if limit > 0:
-                queryset = queryset[:limit]
-        except (ValueError, TypeError):
-            queryset = queryset[:100]
+        # Лимит результатов (при keyset-пагинации объём задаёт page_size)
+        limit = self._get_limit()
+        if limit and not self.pagination_class.is_keyset_requested(self.request):
+            queryset = queryset[:limit]
 
         return queryset
 
@@ -111,18 +138,19 @@ class QuizLeaderboardView(APIView):
     def get(self, request, quiz_id):
         quiz = get_object_or_404(Quiz, id=quiz_id)
 
-        # Получаем лучшие результаты по этой викторине
-        leaderboard_data = GameHistory.objects.filter(
+        # Лучшие результаты из агрегата QuizLeaderboardEntry (индекс quiz, -best_score)
+        leaderboard_data = QuizLeaderboardEntry.objects.filter(
             quiz=quiz
+        ).order_by(
+            '-best_score', '-avg_accuracy'
         ).values(
             'user_id',
             'user__nickname',
-            'user__total_points'
-        ).annotate(
-            best_score=Max('final_points'),
-            games_played=Count('id'),
-            avg_accuracy=Avg('correct_answers') * 100.0 / Avg('total_questions')
-        ).order_by('-best_score', '-avg_accuracy')
+            'user__total_points',
+            'best_score',
+            'games_played',
+            'avg_accuracy',
+        )
 
         # Лимит
         limit = request.query_params.get('limit', 50)
@@ -153,6 +181,68 @@ class QuizLeaderboardView(APIView):
         })
 
 
+class PeriodLeaderboardView(APIView):
+    """
+    Таблица лидеров за период: сегодня, текущая неделя, текущий месяц, всё время.
+    Сортировка по сумме очков, набранных за период.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 100
+
+    @swagger_auto_schema(
+        operation_description="Рейтинг игроков за период: day, week, month, all",
+        responses={
+            200: openapi.Response(
+                'Список лучших игроков за период',
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'period': openapi.Schema(type=openapi.TYPE_STRING),
+                        'leaderboard': openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    'rank': openapi.Schema(type=openapi.TYPE_INTEGER, description='Место в рейтинге'),
+                                    'user_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    'nickname': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'points': openapi.Schema(type=openapi.TYPE_INTEGER, description='Очки за период'),
+                                }
+                            )
+                        ),
+                    }
+                )
+            ),
+            404: "Неизвестный период"
+        },
+        manual_parameters=[
+            openapi.Parameter(
+                'limit',
+                openapi.IN_QUERY,
+                description="Количество результатов (по умолчанию: 50, максимум: 100)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ]
+    )
+    def get(self, request, period):
+        if period not in period_leaderboard_service.PERIODS:
+            return Response({'detail': 'Неизвестный период'}, status=404)
+
+        try:
+            limit = int(request.query_params.get('limit', self.DEFAULT_LIMIT))
+        except (ValueError, TypeError):
+            limit = self.DEFAULT_LIMIT
+        if limit <= 0:
+            limit = self.DEFAULT_LIMIT
+
+        return Response({
+            'period': period,
+            'leaderboard': period_leaderboard_service.get_leaderboard(period, min(limit, self.MAX_LIMIT)),
+        })
+
+
 class RoomLeaderboardView(APIView):
     """
     Таблица лидеров по конкретной комнате (результаты игр в этой комнате).
@@ -240,6 +330,8 @@ class UserStatsDetailView(APIView):
                         'total_wins': openapi.Schema(type=openapi.TYPE_INTEGER),
                         'total_games': openapi.Schema(type=openapi.TYPE_INTEGER),
                         'global_rank': openapi.Schema(type=openapi.TYPE_INTEGER, description='Место в глобальном рейтинге'),
+                        'global_top_percent': openapi.Schema(type=openapi.TYPE_NUMBER, description='Топ N% игроков'),
+                        'global_rank_is_approximate': openapi.Schema(type=openapi.TYPE_BOOLEAN, description='Место посчитано по гистограмме очков'),
                         'avg_accuracy': openapi.Schema(type=openapi.TYPE_NUMBER),
                         'best_game_points': openapi.Schema(type=openapi.TYPE_INTEGER),
                     }
@@ -249,27 +341,13 @@ class UserStatsDetailView(APIView):
         }
     )
     def get(self, request, user_id):
-        user = get_object_or_404(User, id=user_id)
-
-        # Общая статистика
-        total_games = user.game_history.count()
-
-        # Средняя точность
-        from django.db.models import Avg
-        avg_accuracy_data = user.game_history.aggregate(
-            avg=Avg('correct_answers') * 100.0 / Avg('total_questions')
-        )
-        avg_accuracy = round(avg_accuracy_data['avg'] or 0, 1)
+        user = get_object_or_404(User.objects.select_related('stats_snapshot'), id=user_id)
 
-        # Лучшая игра
-        best_game = user.game_history.order_by('-final_points').first()
-        best_game_points = best_game.final_points if best_game else 0
+        # Игры, точность и лучший результат - из UserStatsSnapshot
+        stats = UserStatsSnapshot.for_user(user)
 
-        # Глобальный ранг
-        global_rank = User.objects.filter(
-            is_active=True,
-            total_points__gt=user.total_points
-        ).count() + 1
+        # Глобальный ранг: точный для топ-N, в хвосте - приблизительный по гистограмме
+        rank_info = global_leaderboard_service.get_rank_info(user)
 
         return Response({
             'user_id': user.id,
@@ -277,9 +355,11 @@ class UserStatsDetailView(APIView):
             'email': user.email if request.user == user or request.user.is_staff else None,
             'total_points': user.total_points,
             'total_wins': user.total_wins,
-            'total_games': total_games,
-            'global_rank': global_rank,
-            'avg_accuracy': avg_accuracy,
-            'best_game_points': best_game_points,
+            'total_games': stats.total_games,
+            'global_rank': rank_info['rank'],
+            'global_top_percent': rank_info['top_percent'],
+            'global_rank_is_approximate': rank_info['is_approximate'],
+            'avg_accuracy': stats.avg_accuracy,
+            'best_game_points': stats.best_game_points,
         })
 
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+
+from apps.users.models import GameHistory, QuizLeaderboardEntry
+
+
+class Command(BaseCommand):
+    help = "Пересобрать QuizLeaderboardEntry по таблице GameHistory"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--quiz",
+            type=int,
+            action="append",
+            dest="quiz_ids",
+            help="ID викторины (можно указать несколько раз). По умолчанию - все викторины",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Размер пачки INSERT",
+        )
+
+    def handle(self, *args, **options):
+        history = GameHistory.objects.filter(quiz__isnull=False)
+        entries = QuizLeaderboardEntry.objects.all()
+        if options["quiz_ids"]:
+            history = history.filter(quiz_id__in=options["quiz_ids"])
+            entries = entries.filter(quiz_id__in=options["quiz_ids"])
+
+        rows = (
+            history
+            .values("quiz_id", "user_id")
+            .annotate(
+                best_score=Max("final_points"),
+                games_played=Count("id"),
+                correct_answers_sum=Sum("correct_answers"),
+                total_questions_sum=Sum("total_questions"),
+            )
+            .order_by()
+        )
+
+        with transaction.atomic():
+            entries.delete()
+            created = QuizLeaderboardEntry.objects.bulk_create(
+                (
+                    QuizLeaderboardEntry(
+                        **row,
+                        avg_accuracy=row["correct_answers_sum"] * 100 / row["total_questions_sum"]
+                        if row["total_questions_sum"] else 0,
+                    )
+                    for row in rows.iterator()
+                ),
+                batch_size=options["batch_size"],
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Строк рейтинга викторин: {len(created)}"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.application.services.global_leaderboard_service import global_leaderboard_service
+
+
+class Command(BaseCommand):
+    help = "Пересобрать глобальный рейтинг в Redis по данным БД"
+
+    def handle(self, *args, **options):
+        if global_leaderboard_service.repository.client is None:
+            raise CommandError("Кэш настроен не на Redis - глобальный рейтинг хранится только в БД")
+
+        count = global_leaderboard_service.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"Игроков в рейтинге: {count}"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.application.services.period_leaderboard_service import period_leaderboard_service
+
+
+class Command(BaseCommand):
+    help = "Пересобрать рейтинги за день/неделю/месяц в Redis по GameHistory.played_at"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="За сколько последних дней пересобрать корзины (по умолчанию - весь срок хранения)",
+        )
+
+    def handle(self, *args, **options):
+        if period_leaderboard_service.repository.client is None:
+            raise CommandError("Кэш настроен не на Redis - рейтинги за период считаются по БД")
+
+        count = period_leaderboard_service.rebuild(days=options["days"])
+
+        self.stdout.write(self.style.SUCCESS(f"Строк в дневных корзинах: {count}"))
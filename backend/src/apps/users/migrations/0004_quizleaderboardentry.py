@@ -0,0 +1,66 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def backfill_quiz_leaderboard(apps, schema_editor):
+    GameHistory = apps.get_model('users', 'GameHistory')
+    QuizLeaderboardEntry = apps.get_model('users', 'QuizLeaderboardEntry')
+
+    rows = (
+        GameHistory.objects
+        .filter(quiz__isnull=False)
+        .values('quiz_id', 'user_id')
+        .annotate(
+            best_score=Max('final_points'),
+            games_played=Count('id'),
+            correct_answers_sum=Sum('correct_answers'),
+            total_questions_sum=Sum('total_questions'),
+        )
+        .order_by()
+    )
+    QuizLeaderboardEntry.objects.bulk_create(
+        (
+            QuizLeaderboardEntry(
+                **row,
+                avg_accuracy=row['correct_answers_sum'] * 100 / row['total_questions_sum']
+                if row['total_questions_sum'] else 0,
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0005_quiz_question_count'),
+        ('users', '0003_passwordresettoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizLeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('best_score', models.PositiveIntegerField(default=0, verbose_name='Лучший результат')),
+                ('games_played', models.PositiveIntegerField(default=0, verbose_name='Игр сыграно')),
+                ('correct_answers_sum', models.PositiveIntegerField(default=0, verbose_name='Правильных ответов всего')),
+                ('total_questions_sum', models.PositiveIntegerField(default=0, verbose_name='Вопросов всего')),
+                ('avg_accuracy', models.FloatField(default=0, verbose_name='Средняя точность (%)')),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='questions.quiz', verbose_name='Викторина')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_leaderboard_entries', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Результат в рейтинге викторины',
+                'verbose_name_plural': 'Рейтинги викторин',
+                'indexes': [models.Index(fields=['quiz', '-best_score', '-avg_accuracy'], name='quiz_lb_quiz_best_idx')],
+                'constraints': [models.UniqueConstraint(fields=('quiz', 'user'), name='uq_quiz_leaderboard_quiz_user')],
+            },
+        ),
+        migrations.RunPython(backfill_quiz_leaderboard, migrations.RunPython.noop),
+    ]
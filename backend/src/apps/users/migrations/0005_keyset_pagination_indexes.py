@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('game', '0004_outboxevent'),
+        ('questions', '0006_quiz_quiz_catalog_created_idx'),
+        ('rooms', '0001_initial'),
+        ('users', '0004_quizleaderboardentry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='gamehistory',
+            name='users_gameh_user_id_567b8d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='gamehistory',
+            index=models.Index(fields=['user', '-played_at', '-id'], name='users_gameh_user_id_29ed90_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-total_points', '-id'], name='user_points_id_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStatsSnapshot',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats_snapshot', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('total_games', models.PositiveIntegerField(default=0, verbose_name='Игр сыграно')),
+                ('correct_answers_sum', models.PositiveIntegerField(default=0, verbose_name='Правильных ответов всего')),
+                ('total_questions_sum', models.PositiveIntegerField(default=0, verbose_name='Вопросов всего')),
+                ('best_game_points', models.PositiveIntegerField(default=0, verbose_name='Лучший результат')),
+                ('bookmarks_count', models.PositiveIntegerField(default=0, verbose_name='Закладок')),
+                ('active_rooms_count', models.PositiveIntegerField(default=0, verbose_name='Активных комнат')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Статистика игрока',
+                'verbose_name_plural': 'Статистика игроков',
+            },
+        ),
+    ]
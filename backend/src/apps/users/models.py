@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
 from django.contrib.auth.models import AbstractUser
 from .managers import UserManager
 from django.core.validators import MinValueValidator
@@ -6,6 +8,7 @@ from django.utils import timezone
 import secrets
 import string
 from datetime import timedelta
+from typing import Optional
 
 
 class User(AbstractUser):
@@ -23,6 +26,12 @@ class User(AbstractUser):
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Рейтинг и keyset-пагинация по (total_points, id)
+            models.Index(fields=["-total_points", "-id"], name="user_points_id_idx"),
+        ]
+
     def add_points(self, delta: int) -> None:
         new_value = self.total_points + int(delta)
         if new_value < 0:
@@ -129,7 +138,7 @@ class GameHistory(models.Model):
         verbose_name_plural = "История игр"
         ordering = ["-played_at"]
         indexes = [
-            models.Index(fields=["user", "-played_at"]),
+            models.Index(fields=["user", "-played_at", "-id"]),
             models.Index(fields=["user", "session"]),
         ]
 
@@ -145,6 +154,233 @@ class GameHistory(models.Model):
         return round((self.correct_answers / self.total_questions) * 100, 1)
 
 
+class QuizLeaderboardEntry(models.Model):
+    """
+    Агрегат результатов игрока по викторине для рейтинга викторины.
+
+    Поддерживается сигналами GameHistory (apps/users/signals.py),
+    пересчитывается командой backfill_quiz_leaderboard.
+    """
+    quiz = models.ForeignKey(
+        "questions.Quiz",
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries",
+        verbose_name="Викторина"
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="quiz_leaderboard_entries",
+        verbose_name="Пользователь"
+    )
+
+    best_score = models.PositiveIntegerField(default=0, verbose_name="Лучший результат")
+    games_played = models.PositiveIntegerField(default=0, verbose_name="Игр сыграно")
+    correct_answers_sum = models.PositiveIntegerField(default=0, verbose_name="Правильных ответов всего")
+    total_questions_sum = models.PositiveIntegerField(default=0, verbose_name="Вопросов всего")
+    avg_accuracy = models.FloatField(default=0, verbose_name="Средняя точность (%)")
+
+    class Meta:
+        verbose_name = "Результат в рейтинге викторины"
+        verbose_name_plural = "Рейтинги викторин"
+        constraints = [
+            models.UniqueConstraint(fields=["quiz", "user"], name="uq_quiz_leaderboard_quiz_user"),
+        ]
+        indexes = [
+            models.Index(fields=["quiz", "-best_score", "-avg_accuracy"], name="quiz_lb_quiz_best_idx"),
+        ]
+
+    def __str__(self):
+        return f"Quiz #{self.quiz_id} / User #{self.user_id}: {self.best_score}"
+
+    @classmethod
+    def apply_game(cls, history: "GameHistory") -> None:
+        """
+        Учесть новую запись истории: один UPDATE через F(), при отсутствии строки - INSERT.
+        """
+        if history.quiz_id is None:
+            return
+
+        changes = {
+            'best_score': Greatest(F('best_score'), Value(history.final_points)),
+            'games_played': F('games_played') + 1,
+            'correct_answers_sum': F('correct_answers_sum') + history.correct_answers,
+        }
+        if history.total_questions:
+            changes['total_questions_sum'] = F('total_questions_sum') + history.total_questions
+            changes['avg_accuracy'] = (
+                Cast(F('correct_answers_sum') + history.correct_answers, models.FloatField()) * 100
+                / (F('total_questions_sum') + history.total_questions)
+            )
+
+        entries = cls.objects.filter(quiz_id=history.quiz_id, user_id=history.user_id)
+        if entries.update(**changes):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    quiz_id=history.quiz_id,
+                    user_id=history.user_id,
+                    best_score=history.final_points,
+                    games_played=1,
+                    correct_answers_sum=history.correct_answers,
+                    total_questions_sum=history.total_questions,
+                    avg_accuracy=_accuracy(history.correct_answers, history.total_questions),
+                )
+        except IntegrityError:
+            # Строку создал параллельный вызов
+            entries.update(**changes)
+
+    @classmethod
+    def recalculate(cls, quiz_id: int, user_id: int) -> None:
+        """Пересчитать строку по GameHistory (после изменения или удаления записей)."""
+        totals = GameHistory.objects.filter(quiz_id=quiz_id, user_id=user_id).aggregate(
+            best_score=Max('final_points'),
+            games_played=Count('id'),
+            correct_answers_sum=Sum('correct_answers'),
+            total_questions_sum=Sum('total_questions'),
+        )
+
+        if not totals['games_played']:
+            cls.objects.filter(quiz_id=quiz_id, user_id=user_id).delete()
+            return
+
+        cls.objects.update_or_create(
+            quiz_id=quiz_id,
+            user_id=user_id,
+            defaults={
+                **totals,
+                'avg_accuracy': _accuracy(totals['correct_answers_sum'], totals['total_questions_sum']),
+            }
+        )
+
+
+class UserStatsSnapshot(models.Model):
+    """
+    Статистика игрока для профиля (MyStatsView, UserStatsDetailView) одной строкой.
+
+    Строка считается целиком при первом чтении, дальше обновляется сигналами
+    (apps/users/signals.py): завершённые игры, закладки, участие в комнатах.
+    Место в рейтинге не хранится - оно меняется от чужих игр.
+    """
+    ACTIVE_ROOM_STATUSES = ("open", "in_progress")
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats_snapshot",
+        verbose_name="Пользователь"
+    )
+
+    total_games = models.PositiveIntegerField(default=0, verbose_name="Игр сыграно")
+    correct_answers_sum = models.PositiveIntegerField(default=0, verbose_name="Правильных ответов всего")
+    total_questions_sum = models.PositiveIntegerField(default=0, verbose_name="Вопросов всего")
+    best_game_points = models.PositiveIntegerField(default=0, verbose_name="Лучший результат")
+    bookmarks_count = models.PositiveIntegerField(default=0, verbose_name="Закладок")
+    active_rooms_count = models.PositiveIntegerField(default=0, verbose_name="Активных комнат")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
+    class Meta:
+        verbose_name = "Статистика игрока"
+        verbose_name_plural = "Статистика игроков"
+
+    def __str__(self):
+        return f"Stats of user #{self.user_id}"
+
+    @property
+    def avg_accuracy(self) -> float:
+        return round(_accuracy(self.correct_answers_sum, self.total_questions_sum), 1)
+
+    @classmethod
+    def for_user(cls, user: User) -> "UserStatsSnapshot":
+        """Снимок пользователя; если его ещё нет - полный пересчёт."""
+        try:
+            return user.stats_snapshot
+        except cls.DoesNotExist:
+            snapshot = cls.recalculate(user.id)
+            user.stats_snapshot = snapshot
+            return snapshot
+
+    @classmethod
+    def recalculate(cls, user_id: int, create: bool = True) -> Optional["UserStatsSnapshot"]:
+        """
+        Пересчитать снимок по исходным таблицам.
+
+        create=False - только обновить существующую строку (из сигналов: при каскадном
+        удалении пользователя снимок не должен создаваться заново).
+        """
+        games = GameHistory.objects.filter(user_id=user_id).aggregate(
+            total_games=Count('id'),
+            correct_answers_sum=Sum('correct_answers', default=0),
+            total_questions_sum=Sum('total_questions', default=0),
+            best_game_points=Max('final_points', default=0),
+        )
+        values = {
+            **games,
+            'bookmarks_count': QuizBookmark.objects.filter(user_id=user_id).count(),
+            'active_rooms_count': cls._active_rooms_count(user_id),
+        }
+
+        if not create:
+            cls.objects.filter(user_id=user_id).update(**values)
+            return None
+
+        try:
+            with transaction.atomic():
+                snapshot, _ = cls.objects.update_or_create(user_id=user_id, defaults=values)
+        except IntegrityError:
+            # Строку создал параллельный запрос
+            snapshot = cls.objects.get(user_id=user_id)
+        return snapshot
+
+    @classmethod
+    def apply_game(cls, history: "GameHistory") -> None:
+        """Учесть новую игру одним UPDATE (если снимка нет - его посчитает первое чтение)."""
+        cls.objects.filter(user_id=history.user_id).update(
+            total_games=F('total_games') + 1,
+            correct_answers_sum=F('correct_answers_sum') + history.correct_answers,
+            total_questions_sum=F('total_questions_sum') + history.total_questions,
+            best_game_points=Greatest(F('best_game_points'), Value(history.final_points)),
+        )
+
+    @classmethod
+    def add_bookmarks(cls, user_id: int, delta: int) -> None:
+        cls.objects.filter(user_id=user_id).update(
+            bookmarks_count=Greatest(F('bookmarks_count') + delta, Value(0))
+        )
+
+    @classmethod
+    def refresh_active_rooms(cls, user_ids) -> None:
+        """Пересчитать число активных комнат одним UPDATE с подзапросом."""
+        from apps.rooms.models import Room
+
+        active_rooms = (
+            Room.objects
+            .filter(participants__user_id=OuterRef('user_id'), status__in=cls.ACTIVE_ROOM_STATUSES)
+            .order_by()
+            .values('participants__user_id')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        cls.objects.filter(user_id__in=user_ids).update(
+            active_rooms_count=Coalesce(Subquery(active_rooms), 0)
+        )
+
+    @classmethod
+    def _active_rooms_count(cls, user_id: int) -> int:
+        from apps.rooms.models import Room
+
+        return Room.objects.filter(
+            participants__user_id=user_id, status__in=cls.ACTIVE_ROOM_STATUSES
+        ).count()
+
+
+def _accuracy(correct: int, total: int) -> float:
+    return correct * 100 / total if total else 0
+
+
 class PasswordResetToken(models.Model):
     """Токены для восстановления пароля."""
     user = models.ForeignKey(
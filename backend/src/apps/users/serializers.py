@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
-from .models import ActiveSession, QuizBookmark, GameHistory, PasswordResetToken
+from .models import ActiveSession, QuizBookmark, GameHistory, PasswordResetToken, UserStatsSnapshot
 
 User = get_user_model()
 
@@ -76,7 +76,7 @@ class QuizBookmarkSerializer(serializers.ModelSerializer):
 
     quiz_title = serializers.CharField(source='quiz.title', read_only=True)
     quiz_author = serializers.CharField(source='quiz.author.nickname', read_only=True)
-    quiz_questions_count = serializers.SerializerMethodField()
+    quiz_questions_count = serializers.IntegerField(source='quiz.question_count', read_only=True)
     quiz_views = serializers.IntegerField(source='quiz.views_count', read_only=True)
 
     class Meta:
@@ -93,9 +93,6 @@ class QuizBookmarkSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'added_at']
 
-    def get_quiz_questions_count(self, obj):
-        return obj.quiz.questions.count()
-
 
 class QuizBookmarkCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания закладки"""
@@ -161,17 +158,18 @@ class UserStatsSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_total_games(self, obj):
-        return obj.game_history.count()
+        return self._get_snapshot(obj).total_games
 
     def get_bookmarks_count(self, obj):
-        return obj.quiz_bookmarks.count()
+        return self._get_snapshot(obj).bookmarks_count
 
     def get_active_rooms_count(self, obj):
-        from apps.rooms.models import Room
-        return Room.objects.filter(
-            participants__user=obj,
-            status__in=[Room.Status.OPEN, Room.Status.IN_PROGRESS]
-        ).count()
+        return self._get_snapshot(obj).active_rooms_count
+
+    @staticmethod
+    def _get_snapshot(obj):
+        # Одна строка UserStatsSnapshot вместо трёх COUNT
+        return UserStatsSnapshot.for_user(obj)
 
 
 class PasswordResetRequestSerializer(serializers.Serializer):
@@ -268,19 +266,28 @@ class UserLeaderboardSerializer(serializers.ModelSerializer):
 
     def get_rank(self, obj):
         """Ранг вычисляется по количеству пользователей с большими очками"""
-        return User.objects.filter(
-            is_active=True,
-            total_points__gt=obj.total_points
-        ).count() + 1
+        if hasattr(obj, 'leaderboard_rank'):
+            return obj.leaderboard_rank
+        # Без аннотации: точно для топ-N, в хвосте - по гистограмме очков
+        from .application.services.global_leaderboard_service import global_leaderboard_service
+        return global_leaderboard_service.get_rank_info(obj)['rank']
 
     def get_total_games(self, obj):
         """Количество сыгранных игр"""
+        if hasattr(obj, 'total_games'):
+            return obj.total_games
         return obj.game_history.count()
 
     def get_avg_accuracy(self, obj):
         """Средняя точность ответов (в процентах)"""
         from django.db.models import Avg, F
 
+        # Суммы из GlobalLeaderboardService.entries_queryset()
+        if hasattr(obj, 'total_questions'):
+            if not obj.total_questions:
+                return 0
+            return round(obj.correct_answers / obj.total_questions * 100, 1)
+
         games = obj.game_history.filter(total_questions__gt=0)
         if not games.exists():
             return 0
@@ -297,3 +304,15 @@ class UserLeaderboardSerializer(serializers.ModelSerializer):
         return 0
 
 
+
+
+class GlobalLeaderboardEntrySerializer(serializers.Serializer):
+    """Строка глобального рейтинга из Redis (поля как у UserLeaderboardSerializer)"""
+
+    id = serializers.IntegerField()
+    nickname = serializers.CharField()
+    total_points = serializers.IntegerField()
+    total_wins = serializers.IntegerField()
+    total_games = serializers.IntegerField()
+    avg_accuracy = serializers.FloatField()
+    rank = serializers.IntegerField()
@@ -0,0 +1,97 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .application.services.global_leaderboard_service import global_leaderboard_service
+from .application.services.period_leaderboard_service import period_leaderboard_service
+from .models import GameHistory, QuizBookmark, QuizLeaderboardEntry, User, UserStatsSnapshot
+
+
+@receiver(post_save, sender=GameHistory)
+def update_quiz_leaderboard_on_save(sender, instance, created, **kwargs):
+    """Новая игра -> инкрементальное обновление рейтинга викторины."""
+    if kwargs.get("raw") or instance.quiz_id is None:
+        return
+
+    if created:
+        QuizLeaderboardEntry.apply_game(instance)
+    else:
+        QuizLeaderboardEntry.recalculate(instance.quiz_id, instance.user_id)
+
+
+@receiver(post_delete, sender=GameHistory)
+def update_quiz_leaderboard_on_delete(sender, instance, **kwargs):
+    """
+    Запись истории удалена -> пересчёт строки рейтинга.
+
+    Срабатывает и при каскадном удалении (удаление сессии или комнаты).
+    """
+    if instance.quiz_id is None:
+        return
+
+    QuizLeaderboardEntry.recalculate(instance.quiz_id, instance.user_id)
+
+
+@receiver(post_save, sender=GameHistory)
+def update_period_leaderboards_on_save(sender, instance, created, **kwargs):
+    """Новая игра -> очки в дневную корзину рейтинга после коммита."""
+    if kwargs.get("raw") or not created:
+        return
+
+    transaction.on_commit(lambda: period_leaderboard_service.record_game(
+        instance.user_id, instance.final_points, instance.played_at
+    ))
+
+
+@receiver(post_save, sender=User)
+def update_global_leaderboard_on_profile_change(sender, instance, created, update_fields=None, **kwargs):
+    """Смена ника или деактивация -> строка глобального рейтинга обновляется (или удаляется) после коммита."""
+    if created or kwargs.get("raw"):
+        return
+    if update_fields is not None and not {"nickname", "is_active"} & set(update_fields):
+        return
+
+    transaction.on_commit(lambda: global_leaderboard_service.refresh_users([instance.pk]))
+
+
+@receiver(post_save, sender=GameHistory)
+def update_stats_snapshot_on_game_save(sender, instance, created, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    if created:
+        UserStatsSnapshot.apply_game(instance)
+    else:
+        UserStatsSnapshot.recalculate(instance.user_id, create=False)
+
+
+@receiver(post_delete, sender=GameHistory)
+def update_stats_snapshot_on_game_delete(sender, instance, **kwargs):
+    UserStatsSnapshot.recalculate(instance.user_id, create=False)
+
+
+@receiver(post_save, sender=QuizBookmark)
+def update_stats_snapshot_on_bookmark_save(sender, instance, created, **kwargs):
+    if created and not kwargs.get("raw"):
+        UserStatsSnapshot.add_bookmarks(instance.user_id, 1)
+
+
+@receiver(post_delete, sender=QuizBookmark)
+def update_stats_snapshot_on_bookmark_delete(sender, instance, **kwargs):
+    UserStatsSnapshot.add_bookmarks(instance.user_id, -1)
+
+
+@receiver(post_save, sender="rooms.RoomParticipant")
+@receiver(post_delete, sender="rooms.RoomParticipant")
+def update_stats_snapshot_on_participation_change(sender, instance, **kwargs):
+    if not kwargs.get("raw"):
+        UserStatsSnapshot.refresh_active_rooms([instance.user_id])
+
+
+@receiver(post_save, sender="rooms.Room")
+def update_stats_snapshot_on_room_status_change(sender, instance, created, update_fields=None, **kwargs):
+    """Смена статуса комнаты меняет число активных комнат у всех её участников."""
+    if created or kwargs.get("raw") or (update_fields is not None and "status" not in update_fields):
+        return
+
+    UserStatsSnapshot.refresh_active_rooms(instance.participants.values("user_id"))
@@ -275,3 +275,27 @@ def send_welcome_email(user_email: str, user_nickname: str):
             'error': str(e)
         }
 
+
+
+@shared_task
+def rebuild_global_leaderboard():
+    """Пересобрать глобальный рейтинг в Redis по данным БД."""
+    from apps.users.application.services.global_leaderboard_service import global_leaderboard_service
+
+    return global_leaderboard_service.rebuild()
+
+
+@shared_task
+def rebuild_period_leaderboards():
+    """Пересобрать дневные корзины рейтингов за период по данным БД."""
+    from apps.users.application.services.period_leaderboard_service import period_leaderboard_service
+
+    return period_leaderboard_service.rebuild()
+
+
+@shared_task
+def refresh_score_histogram():
+    """Пересчитать гистограмму очков для приблизительных мест и процентилей."""
+    from apps.users.application.services.score_histogram_service import score_histogram_service
+
+    return score_histogram_service.refresh().total
@@ -6,7 +6,7 @@ from datetime import timedelta
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from apps.users.models import QuizBookmark, GameHistory
+from apps.users.models import QuizBookmark, GameHistory, UserStatsSnapshot
 from apps.rooms.models import Room, RoomParticipant
 from apps.game.models import GameSession
 from apps.questions.models import Quiz
@@ -317,3 +317,63 @@ def test_my_stats_view_returns_correct_counters(auth_client, user):
     assert data["total_games"] == 2          # 2 GameHistory
     assert data["bookmarks_count"] == 2      # только его закладки
     assert data["active_rooms_count"] == 2   # только OPEN и IN_PROGRESS
+
+
+@pytest.mark.django_db
+def test_my_stats_snapshot_is_updated_incrementally(api, user, django_assert_num_queries):
+    """
+    Статистика читается одной строкой UserStatsSnapshot, которая после первого
+    чтения обновляется сигналами: новая игра, закладка, смена статуса комнаты.
+    """
+    api.force_authenticate(user)
+    room = Room.objects.create(name="Snapshot room", host=user, status=Room.Status.OPEN)
+    RoomParticipant.objects.create(room=room, user=user, role=RoomParticipant.Role.PLAYER)
+    quiz = Quiz.objects.create(author=user, title="Snapshot quiz", status=Quiz.Status.PUBLISHED)
+
+    res = api.get("/api/cabinet/stats/")
+    assert (res.data["total_games"], res.data["bookmarks_count"], res.data["active_rooms_count"]) == (0, 0, 1)
+
+    GameHistory.objects.create(
+        user=user, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+        final_points=70, correct_answers=3, total_questions=4,
+    )
+    bookmark = QuizBookmark.objects.create(user=user, quiz=quiz)
+    room.status = Room.Status.FINISHED
+    room.save(update_fields=["status"])
+
+    user.refresh_from_db()
+    with django_assert_num_queries(1):
+        res = api.get("/api/cabinet/stats/")
+    assert (res.data["total_games"], res.data["bookmarks_count"], res.data["active_rooms_count"]) == (1, 1, 0)
+
+    bookmark.delete()
+    snapshot = UserStatsSnapshot.objects.get(user=user)
+    assert (snapshot.bookmarks_count, snapshot.best_game_points, snapshot.avg_accuracy) == (0, 70, 75.0)
+
+
+@pytest.mark.django_db
+def test_my_game_history_keyset_page_cost_does_not_depend_on_depth(api, user, django_assert_num_queries):
+    """
+    ?cursor=...: глубокая страница истории - тот же один запрос, что и первая
+    (WHERE (played_at, id) < (...) вместо OFFSET).
+    """
+    api.force_authenticate(user)
+    now = timezone.now()
+    room = Room.objects.create(name="Keyset room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="Keyset quiz", status=Quiz.Status.PUBLISHED)
+    for i in range(6):
+        GameHistory.objects.create(
+            user=user, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+            final_points=i, played_at=now - timedelta(hours=i // 2),
+        )
+
+    with django_assert_num_queries(1):
+        first = api.get("/api/cabinet/history/", {"pagination": "cursor", "page_size": 2})
+    with django_assert_num_queries(1):
+        second = api.get(first.data["next"])
+    third = api.get(second.data["next"])
+
+    points = [item["final_points"] for page in (first, second, third) for item in page.data["results"]]
+    assert sorted(points) == list(range(6))
+    assert third.data["next"] is None
+    assert "count" not in first.data
@@ -0,0 +1,158 @@
+import pytest
+from model_bakery import baker
+
+from apps.game.models import GameSession
+from apps.questions.models import Quiz
+from apps.rooms.models import Room
+from apps.users.application.services.global_leaderboard_service import (
+    GlobalLeaderboardService, LeaderboardSlice, global_leaderboard_service,
+)
+from apps.users.infrastructure.redis_leaderboard_repository import RedisLeaderboardRepository
+from apps.users.models import GameHistory, User
+
+
+def make_entry(user_id, points, wins=0, nickname=None, correct=0, questions=0):
+    return {
+        'user_id': user_id,
+        'nickname': nickname or f"player{user_id}",
+        'total_points': points,
+        'total_wins': wins,
+        'total_games': 1,
+        'correct_answers': correct,
+        'total_questions': questions,
+    }
+
+
+@pytest.fixture
+def repository(fake_redis):
+    return RedisLeaderboardRepository(client_factory=lambda: fake_redis)
+
+
+@pytest.fixture
+def service(repository):
+    service = GlobalLeaderboardService()
+    service.repository = repository
+    return service
+
+
+def test_get_range_orders_by_points_then_wins_with_shared_ranks(repository):
+    repository.replace_all([
+        make_entry(1, 50),
+        make_entry(2, 100, wins=1),
+        make_entry(3, 100, wins=5),
+        make_entry(4, 10),
+    ])
+
+    rows = repository.get_range(0, 4)
+
+    assert [row['id'] for row in rows] == [3, 2, 1, 4]
+    # Равные очки - общее место, следующее место считается по позиции
+    assert [row['rank'] for row in rows] == [1, 1, 3, 4]
+    assert rows[0]['nickname'] == "player3"
+
+    # Страница из середины: место первой строки - по ZCOUNT
+    assert [(row['id'], row['rank']) for row in repository.get_range(1, 3)] == [(2, 1), (1, 3)]
+
+    assert repository.get_rank(1) == 3
+    assert repository.get_rank(2) == 1
+    assert repository.get_rank(99) is None
+
+
+def test_replace_all_drops_players_missing_from_rebuild(repository, fake_redis):
+    repository.replace_all([make_entry(1, 50), make_entry(2, 40)])
+    repository.replace_all([make_entry(2, 60)])
+
+    assert repository.count() == 1
+    assert repository.get_rank(1) is None
+    assert not fake_redis.exists(repository.REBUILD_KEY)
+
+    repository.replace_all([])
+    assert repository.exists() is False
+
+
+def test_leaderboard_slice_respects_limit(service):
+    service.repository.replace_all([
+        make_entry(user_id, points=user_id * 10, correct=1, questions=4)
+        for user_id in range(1, 6)
+    ])
+
+    leaderboard = service.get_slice(limit=3)
+
+    assert isinstance(leaderboard, LeaderboardSlice)
+    assert len(leaderboard) == 3
+    assert [row['id'] for row in leaderboard[0:10]] == [5, 4, 3]
+    assert leaderboard[1]['id'] == 4
+    assert leaderboard[0]['avg_accuracy'] == 25.0
+
+
+@pytest.mark.django_db
+def test_get_slice_schedules_rebuild_when_not_built(service, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(service, 'schedule_rebuild', lambda: scheduled.append(True))
+
+    assert service.get_slice() is None
+    assert scheduled == [True]
+
+
+@pytest.mark.django_db
+def test_rebuild_and_refresh_from_database(service, user):
+    room = Room.objects.create(name="LB Room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="LB Quiz", status=Quiz.Status.PUBLISHED)
+
+    leader = baker.make(User, nickname="leader", total_points=300, total_wins=2)
+    second = baker.make(User, nickname="second", total_points=200)
+    baker.make(User, nickname="no_games", total_points=999)
+    for player in (leader, second):
+        GameHistory.objects.create(
+            user=player, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+            final_points=player.total_points, correct_answers=1, total_questions=2,
+        )
+
+    assert service.rebuild() == 2
+    assert service.get_rank(leader) == 1
+    assert service.get_rank(second) == 2
+
+    User.objects.filter(id=second.id).update(total_points=400)
+    assert service.refresh_users([second.id]) == 1
+
+    second.refresh_from_db()
+    assert service.get_rank(second) == 1
+    assert [row['nickname'] for row in service.get_slice()[0:2]] == ["second", "leader"]
+
+
+@pytest.mark.django_db
+def test_rename_and_deactivation_refresh_leaderboard(repository, user, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(global_leaderboard_service, 'repository', repository)
+    room = Room.objects.create(name="LB Room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="LB Quiz", status=Quiz.Status.PUBLISHED)
+    GameHistory.objects.create(
+        user=user, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+        final_points=10, correct_answers=1, total_questions=1,
+    )
+    global_leaderboard_service.rebuild()
+
+    user.nickname = "renamed"
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save(update_fields=["nickname"])
+    assert repository.get_range(0, 1)[0]['nickname'] == "renamed"
+
+    # Поля, не влияющие на рейтинг, не трогают Redis
+    with django_capture_on_commit_callbacks() as callbacks:
+        user.save(update_fields=["last_login"])
+    assert callbacks == []
+
+    user.is_active = False
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save(update_fields=["is_active"])
+    assert repository.get_rank(user.id) is None
+    assert repository.count() == 0
+
+
+@pytest.mark.django_db
+def test_get_rank_falls_back_to_database_without_redis(user):
+    service = GlobalLeaderboardService()
+    service.repository = RedisLeaderboardRepository(client_factory=lambda: None)
+    baker.make(User, nickname="richer", total_points=user.total_points + 10)
+
+    assert service.get_slice() is None
+    assert service.get_rank(user) == 2
@@ -2,7 +2,7 @@ import pytest
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
-from apps.users.models import GameHistory
+from apps.users.models import GameHistory, QuizLeaderboardEntry, UserStatsSnapshot
 from apps.rooms.models import Room
 from apps.game.models import GameSession
 from apps.questions.models import Quiz
@@ -147,6 +147,101 @@ def test_global_leaderboard_returns_active_users_with_games_sorted_by_points(aut
     assert nicknames_limit == ["user_bravo", "user_alpha"]
 
 
+@pytest.mark.django_db
+def test_global_leaderboard_query_count_independent_of_page_size(api, user, django_assert_max_num_queries):
+    """
+    Без Redis рейтинг собирается из БД: игры, точность и место -
+    аннотациями, а не запросами на каждую строку.
+    """
+    room = Room.objects.create(name="LB Room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="LB Quiz", status=Quiz.Status.PUBLISHED)
+
+    for i in range(15):
+        player = User.objects.create_user(
+            email=f"lbq{i}@example.com",
+            password="12345test",
+            nickname=f"lbq_{i}",
+        )
+        player.total_points = i * 10
+        player.save(update_fields=["total_points"])
+        session = GameSession.objects.create(room=room, quiz=quiz)
+        GameHistory.objects.create(
+            user=player, session=session, room=room, quiz=quiz,
+            final_points=i * 10, correct_answers=i % 5, total_questions=5,
+        )
+
+    # Общее место у игроков с равными очками
+    User.objects.filter(nickname="lbq_13").update(total_points=140)
+
+    with django_assert_max_num_queries(2):
+        res = api.get("/api/leaderboard/global/")
+
+    assert res.status_code == 200
+    data = _get_paginated_data(res)
+    assert len(data) == 15
+    assert [item["rank"] for item in data[:3]] == [1, 1, 3]
+    assert data[0]["total_games"] == 1
+    assert data[0]["avg_accuracy"] == 60.0  # lbq_13: 3 из 5
+
+
+@pytest.mark.django_db
+def test_global_leaderboard_keyset_pagination(api, user):
+    """?pagination=cursor: рейтинг по индексу (-total_points, -id) страницами без OFFSET, места сохраняются."""
+    room = Room.objects.create(name="Keyset LB Room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="Keyset LB Quiz", status=Quiz.Status.PUBLISHED)
+    for i, points in enumerate((30, 20, 20)):
+        player = User.objects.create_user(email=f"klb{i}@example.com", password="12345test", nickname=f"klb_{i}")
+        User.objects.filter(id=player.id).update(total_points=points)
+        GameHistory.objects.create(
+            user=player, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+            final_points=points,
+        )
+
+    first = api.get("/api/leaderboard/global/", {"pagination": "cursor", "page_size": 2})
+    second = api.get(first.data["next"])
+
+    rows = first.data["results"] + second.data["results"]
+    # При равных очках - более новый игрок выше (-id, как в индексе)
+    assert [(row["nickname"], row["rank"]) for row in rows] == [("klb_0", 1), ("klb_2", 2), ("klb_1", 2)]
+    assert second.data["next"] is None
+
+    by_nickname = api.get("/api/leaderboard/global/", {"pagination": "cursor", "ordering": "nickname", "page_size": 2})
+    rows = by_nickname.data["results"] + api.get(by_nickname.data["next"]).data["results"]
+    assert [row["nickname"] for row in rows][:3] == ["klb_0", "klb_1", "klb_2"]
+
+
+@pytest.mark.django_db
+def test_user_stats_rank_in_long_tail_comes_from_score_histogram(api, settings, django_assert_max_num_queries):
+    """
+    За пределами топ-N место и процентиль считаются по гистограмме очков
+    (без COUNT по игрокам), в топ-N место точное.
+    """
+    from apps.users.application.services.score_histogram_service import score_histogram_service
+
+    settings.LEADERBOARD_EXACT_RANK_TOP_N = 2
+    players = []
+    for i, points in enumerate((500, 400, 130, 120, 110, 20, 10, 0)):
+        player = User.objects.create_user(email=f"hist{i}@example.com", password="12345test", nickname=f"hist_{i}")
+        User.objects.filter(id=player.id).update(total_points=points)
+        players.append(player)
+
+    histogram = score_histogram_service.refresh(bucket_size=100)
+    assert histogram.total == User.objects.filter(is_active=True).count()
+
+    # Корзина 100-199: трое, очки 120 - примерно посередине
+    UserStatsSnapshot.recalculate(players[3].id)
+    with django_assert_max_num_queries(1):
+        res = api.get(f"/api/leaderboard/user/{players[3].id}/")
+    assert res.data["global_rank_is_approximate"] is True
+    # Точное место 4; оценка - в пределах своей корзины (выше неё двое, в ней трое)
+    rank = res.data["global_rank"]
+    assert rank == histogram.rank(120) and 2 < rank <= 5
+    assert res.data["global_top_percent"] == round(rank / histogram.total * 100, 1)
+
+    res = api.get(f"/api/leaderboard/user/{players[1].id}/")
+    assert res.data["global_rank_is_approximate"] is False
+    assert res.data["global_rank"] == 2
+
 # --------------------- QUIZ LEADERBOARD ---------------------
 
 
@@ -248,6 +343,79 @@ def test_quiz_leaderboard_returns_best_scores_and_avg_accuracy(auth_client, user
     assert second["avg_accuracy"] == 70.0  # (7+7)/2/10 * 100
 
 
+
+@pytest.mark.django_db
+def test_quiz_leaderboard_entry_follows_game_history(api, user, django_assert_max_num_queries):
+    """
+    Агрегат QuizLeaderboardEntry обновляется при создании и удалении
+    записей истории, рейтинг викторины читается из него без GROUP BY.
+    """
+    room = Room.objects.create(name="QLB Room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="QLB Quiz", status=Quiz.Status.PUBLISHED)
+
+    histories = [
+        GameHistory.objects.create(
+            user=user, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+            final_points=points, correct_answers=correct, total_questions=10,
+        )
+        for points, correct in ((50, 5), (80, 8))
+    ]
+
+    entry = QuizLeaderboardEntry.objects.get(quiz=quiz, user=user)
+    assert (entry.best_score, entry.games_played, entry.avg_accuracy) == (80, 2, 65.0)
+
+    histories[1].delete()
+    entry.refresh_from_db()
+    assert (entry.best_score, entry.games_played, entry.avg_accuracy) == (50, 1, 50.0)
+
+    with django_assert_max_num_queries(2):
+        res = api.get(f"/api/leaderboard/quiz/{quiz.id}/")
+    assert res.data["leaderboard"][0]["best_score"] == 50
+
+    histories[0].delete()
+    assert not QuizLeaderboardEntry.objects.filter(quiz=quiz).exists()
+
+
+# --------------------- PERIOD LEADERBOARD ---------------------
+
+
+@pytest.mark.django_db
+def test_period_leaderboard_counts_only_games_in_period(api, user):
+    """
+    /api/leaderboard/period/<period>/:
+    - очки суммируются за игры периода, старые игры не учитываются
+    - при равных очках место общее
+    """
+    room = Room.objects.create(name="Period Room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="Period Quiz", status=Quiz.Status.PUBLISHED)
+    players = [
+        User.objects.create_user(email=f"period{i}@example.com", password="12345test", nickname=f"period_{i}")
+        for i in range(3)
+    ]
+
+    now = timezone.now()
+    games = [
+        (players[0], 30, now),
+        (players[0], 20, now),
+        (players[1], 50, now),
+        (players[2], 500, now - timezone.timedelta(days=40)),
+    ]
+    for player, points, played_at in games:
+        GameHistory.objects.create(
+            user=player, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+            final_points=points, played_at=played_at,
+        )
+
+    res = api.get("/api/leaderboard/period/week/")
+    assert res.status_code == 200
+    assert res.data["period"] == "week"
+    assert [(row["nickname"], row["points"], row["rank"]) for row in res.data["leaderboard"]] == [
+        ("period_0", 50, 1),
+        ("period_1", 50, 1),
+    ]
+
+    assert api.get("/api/leaderboard/period/year/").status_code == 404
+
 # --------------------- ROOM LEADERBOARD ---------------------
 
 
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.game.models import GameSession
+from apps.questions.models import Quiz
+from apps.rooms.models import Room
+from apps.users.application.services.period_leaderboard_service import PeriodLeaderboardService
+from apps.users.infrastructure.redis_period_leaderboard_repository import RedisPeriodLeaderboardRepository
+from apps.users.models import GameHistory, User
+
+
+DAY = date(2026, 10, 19)
+
+
+@pytest.fixture
+def repository(fake_redis):
+    return RedisPeriodLeaderboardRepository(client_factory=lambda: fake_redis)
+
+
+def day_scores(fake_redis, repository, day):
+    members = fake_redis.zrevrange(repository._get_day_key(day), 0, -1, withscores=True)
+    return {int(member): int(score) for member, score in members}
+
+
+def test_points_added_during_rebuild_are_kept(repository, fake_redis):
+    """
+    Очки, записанные после чтения БД, но до замены корзины,
+    не затираются пересобранными данными.
+    """
+    repository.add_points(DAY, user_id=1, points=3, retention_days=30)
+
+    repository.begin_rebuild([DAY])
+    # Игра завершилась, пока пересборка читала БД
+    repository.add_points(DAY, user_id=2, points=5, retention_days=30)
+    repository.replace_days({DAY: {1: 10}}, retention_days=30)
+
+    assert day_scores(fake_redis, repository, DAY) == {1: 10, 2: 5}
+    assert not fake_redis.exists(repository.REBUILDING_KEY)
+    assert not fake_redis.exists(repository._get_day_key(DAY) + repository.DELTA_SUFFIX)
+
+    # Пересборка закончилась - дельта больше не пишется
+    repository.add_points(DAY, user_id=2, points=1, retention_days=30)
+    assert not fake_redis.exists(repository._get_day_key(DAY) + repository.DELTA_SUFFIX)
+    assert day_scores(fake_redis, repository, DAY) == {1: 10, 2: 6}
+
+
+def test_replace_days_removes_empty_days_and_expires_built_flag(repository, fake_redis):
+    previous_day = DAY - timedelta(days=1)
+    repository.add_points(previous_day, user_id=1, points=7, retention_days=30)
+
+    repository.begin_rebuild([previous_day, DAY])
+    assert repository.replace_days({previous_day: {}, DAY: {1: 4, 2: 9}}, retention_days=30) == 2
+
+    assert not fake_redis.exists(repository._get_day_key(previous_day))
+    assert 0 < fake_redis.ttl(repository._get_day_key(DAY)) <= 30 * repository.DAY_SECONDS
+    assert repository.is_built() is True
+    assert 0 < fake_redis.ttl(repository.BUILT_KEY) <= 30 * repository.DAY_SECONDS
+
+
+def test_get_top_sums_days(repository):
+    repository.add_points(DAY - timedelta(days=1), user_id=1, points=10, retention_days=30)
+    repository.add_points(DAY, user_id=1, points=5, retention_days=30)
+    repository.add_points(DAY, user_id=2, points=12, retention_days=30)
+
+    assert repository.get_top('week', [DAY - timedelta(days=1), DAY], limit=10, cache_ttl=60) == [(1, 15), (2, 12)]
+    assert repository.get_top('day', [DAY], limit=1, cache_ttl=60) == [(2, 12)]
+
+
+@pytest.mark.django_db
+def test_service_rebuild_reads_game_history(repository, user):
+    service = PeriodLeaderboardService()
+    service.repository = repository
+
+    room = Room.objects.create(name="Period Room", host=user, status=Room.Status.FINISHED)
+    quiz = Quiz.objects.create(author=user, title="Period Quiz", status=Quiz.Status.PUBLISHED)
+    other = User.objects.create_user(email="period@example.com", password="12345test", nickname="period_other")
+    for player, points in ((user, 30), (other, 40)):
+        GameHistory.objects.create(
+            user=player, session=GameSession.objects.create(room=room, quiz=quiz), room=room, quiz=quiz,
+            final_points=points, correct_answers=1, total_questions=1,
+        )
+
+    assert service.rebuild(days=1) == 2
+
+    rows = service.get_leaderboard(service.DAY, limit=10)
+    assert [(row['nickname'], row['points'], row['rank']) for row in rows] == [
+        ("period_other", 40, 1),
+        (user.nickname, 30, 2),
+    ]
+    assert repository.get_top('day', [timezone.localdate()], limit=10, cache_ttl=60) == [
+        (other.id, 40), (user.id, 30)
+    ]
@@ -18,6 +18,7 @@ from django.shortcuts import get_object_or_404
 from .application.services.register_user_service import RegisterUserService, RegistrationException
 from .application.services.login_user_service import LoginUserService
 from apps.users.domain.services.authentication_service import AuthenticationException
+from apps.core.pagination import PageNumberOrKeysetPagination
 
 User = get_user_model()
 
@@ -231,6 +232,7 @@ class MyGameHistoryView(generics.ListAPIView):
     """История игр пользователя"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GameHistorySerializer
+    pagination_class = PageNumberOrKeysetPagination
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['played_at', 'final_points', 'accuracy']
     ordering = ['-played_at']
@@ -19,6 +19,26 @@ app.conf.beat_schedule = {
         'task': 'apps.game.tasks.notify_inactive_players',
         'schedule': crontab(minute='*/30'),  # Каждые 30 минут
     },
+    'relay-outbox-events': {
+        'task': 'apps.game.tasks.relay_outbox_events',
+        'schedule': crontab(),  # Каждую минуту
+    },
+    'purge-outbox-events': {
+        'task': 'apps.game.tasks.purge_outbox_events',
+        'schedule': crontab(minute=30, hour=3),  # Раз в сутки
+    },
+    'flush-quiz-views': {
+        'task': 'apps.questions.tasks.flush_quiz_views',
+        'schedule': crontab(),  # Каждую минуту
+    },
+    'validate-published-quizzes': {
+        'task': 'apps.questions.tasks.validate_published_quizzes',
+        'schedule': crontab(minute=0, hour=4),  # Раз в сутки
+    },
+    'refresh-score-histogram': {
+        'task': 'apps.users.tasks.refresh_score_histogram',
+        'schedule': crontab(minute='*/10'),  # Каждые 10 минут
+    },
 }
 
 app.conf.timezone = 'UTC'
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -92,6 +93,46 @@ REDIS_DB = int(os.getenv("REDIS_DB", 0))
 
 ASGI_APPLICATION = 'config.asgi.application'
 
+# Режим "актора комнаты": каждой игровой сессией владеет один ASGI-процесс
+GAME_ROOM_ACTOR_ENABLED = env_bool("GAME_ROOM_ACTOR_ENABLED", default=False)
+GAME_ROOM_ACTOR_LEASE_SECONDS = int(os.getenv("GAME_ROOM_ACTOR_LEASE_SECONDS", 30))
+
+# Хранить итоги завершённых игр также в GameSession.results_snapshot
+GAME_RESULTS_STORE_IN_DB = env_bool("GAME_RESULTS_STORE_IN_DB", default=True)
+
+# Исполнитель асинхронных обработчиков EventBus: sync | thread | celery
+GAME_EVENT_BUS_EXECUTOR = os.getenv("GAME_EVENT_BUS_EXECUTOR", "thread")
+GAME_EVENT_BUS_THREAD_WORKERS = int(os.getenv("GAME_EVENT_BUS_THREAD_WORKERS", 4))
+GAME_EVENT_BUS_QUEUE_SIZE = int(os.getenv("GAME_EVENT_BUS_QUEUE_SIZE", 1000))
+GAME_EVENT_BUS_MAX_RETRIES = int(os.getenv("GAME_EVENT_BUS_MAX_RETRIES", 3))
+GAME_EVENT_BUS_RETRY_BACKOFF = float(os.getenv("GAME_EVENT_BUS_RETRY_BACKOFF", 1.0))
+# Пакетные обработчики: окно накопления (0 - без буфера) и максимальный размер пачки
+GAME_EVENT_BUS_BATCH_WINDOW = float(os.getenv("GAME_EVENT_BUS_BATCH_WINDOW", 0.5))
+GAME_EVENT_BUS_BATCH_SIZE = int(os.getenv("GAME_EVENT_BUS_BATCH_SIZE", 500))
+
+# Outbox доменных событий: размер пачки relay, попытки до dead-letter, окно объединения запусков relay,
+# базовая пауза (с) перед повтором неудачной доставки (удваивается с каждой попыткой)
+GAME_EVENT_OUTBOX_BATCH_SIZE = int(os.getenv("GAME_EVENT_OUTBOX_BATCH_SIZE", 200))
+GAME_EVENT_OUTBOX_MAX_ATTEMPTS = int(os.getenv("GAME_EVENT_OUTBOX_MAX_ATTEMPTS", 5))
+GAME_EVENT_OUTBOX_RELAY_DELAY = int(os.getenv("GAME_EVENT_OUTBOX_RELAY_DELAY", 1))
+GAME_EVENT_OUTBOX_RETRY_BACKOFF = int(os.getenv("GAME_EVENT_OUTBOX_RETRY_BACKOFF", 5))
+
+# Метрики EventBus и порог медленного обработчика (мс)
+GAME_EVENT_BUS_METRICS_ENABLED = env_bool("GAME_EVENT_BUS_METRICS_ENABLED", default=False)
+GAME_EVENT_BUS_SLOW_HANDLER_MS = int(os.getenv("GAME_EVENT_BUS_SLOW_HANDLER_MS", 200))
+
+# Рейтинги за период: сколько дней хранить дневные корзины и TTL объединений (неделя, месяц)
+LEADERBOARD_PERIOD_RETENTION_DAYS = int(os.getenv("LEADERBOARD_PERIOD_RETENTION_DAYS", 40))
+LEADERBOARD_PERIOD_CACHE_TTL = int(os.getenv("LEADERBOARD_PERIOD_CACHE_TTL", 60))
+
+# Гистограмма очков: ширина корзины (в очках) и сколько первых мест считать точно
+LEADERBOARD_HISTOGRAM_BUCKET_SIZE = int(os.getenv("LEADERBOARD_HISTOGRAM_BUCKET_SIZE", 50))
+LEADERBOARD_EXACT_RANK_TOP_N = int(os.getenv("LEADERBOARD_EXACT_RANK_TOP_N", 1000))
+
+# Кэш публичного каталога: сколько секунд ответ свежий и сколько ещё можно отдавать устаревший, пока он пересобирается
+CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", 60))
+CATALOG_CACHE_STALE_TTL = int(os.getenv("CATALOG_CACHE_STALE_TTL", 300))
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
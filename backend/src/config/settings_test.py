@@ -7,8 +7,19 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
 CELERY_BROKER_URL = "memory://"
 CELERY_RESULT_BACKEND = "cache+memory://"
+
+GAME_EVENT_BUS_EXECUTOR = "sync"
+GAME_EVENT_BUS_RETRY_BACKOFF = 0
+GAME_EVENT_BUS_BATCH_WINDOW = 0
+GAME_EVENT_OUTBOX_RELAY_DELAY = 0
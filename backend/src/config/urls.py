@@ -12,13 +12,16 @@ from apps.users.views import (
     PasswordResetRequestView, PasswordResetConfirmView, PasswordResetTokenListView
 )
 from apps.users.leaderboard_views import (
-    GlobalLeaderboardView, QuizLeaderboardView, RoomLeaderboardView, UserStatsDetailView
+    GlobalLeaderboardView, QuizLeaderboardView, PeriodLeaderboardView, RoomLeaderboardView, UserStatsDetailView
 )
 from apps.rooms.views import MyRoomsListView, RoomCreateView, RoomDetailView, RoomJoinView, RoomLeaveView, RoomFindView
 from apps.questions.views import (
     MyQuestionsListCreateView,
+    MyQuestionsImportView,
     MyQuestionDetailView,
     MyQuizzesListCreateView,
+    MyQuizzesExportView,
+    MyQuizzesImportView,
     MyQuizDetailView,
     PublicQuizzesListView,
     PublicQuizDetailView,
@@ -78,10 +81,13 @@ urlpatterns = [
 
     # Questions
     path("api/questions/", MyQuestionsListCreateView.as_view(), name="my-questions"),
+    path("api/questions/import/", MyQuestionsImportView.as_view(), name="my-questions-import"),
     path("api/questions/<int:pk>/", MyQuestionDetailView.as_view(), name="my-question-detail"),
 
     # Quizzes (Мои)
     path("api/quizzes/mine/", MyQuizzesListCreateView.as_view(), name="my-quizzes"),
+    path("api/quizzes/mine/export/", MyQuizzesExportView.as_view(), name="my-quizzes-export"),
+    path("api/quizzes/mine/import/", MyQuizzesImportView.as_view(), name="my-quizzes-import"),
     path("api/quizzes/mine/<int:pk>/", MyQuizDetailView.as_view(), name="my-quiz-detail"),
 
     # Quizzes (Публичные - каталог)
@@ -121,9 +127,13 @@ urlpatterns = [
     # История игр
     path("api/game/sessions/my/", game_views.GameSessionListView.as_view(), name="my-game-sessions"),
 
+    # Метрики EventBus (администраторы)
+    path("api/game/event-bus/metrics/", game_views.event_bus_metrics_view, name="game-event-bus-metrics"),
+
     # Leaderboard (Таблица лидеров)
     path("api/leaderboard/global/", GlobalLeaderboardView.as_view(), name="global-leaderboard"),
     path("api/leaderboard/quiz/<int:quiz_id>/", QuizLeaderboardView.as_view(), name="quiz-leaderboard"),
+    path("api/leaderboard/period/<str:period>/", PeriodLeaderboardView.as_view(), name="period-leaderboard"),
     path("api/leaderboard/room/<int:room_id>/", RoomLeaderboardView.as_view(), name="room-leaderboard"),
     path("api/leaderboard/user/<int:user_id>/", UserStatsDetailView.as_view(), name="user-stats-detail"),
 ]
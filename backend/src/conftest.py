@@ -34,3 +34,18 @@ def auth_client(api, user):
     api.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
     return api
 
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis для репозиториев с client_factory (sorted set, hash, Lua)."""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis()